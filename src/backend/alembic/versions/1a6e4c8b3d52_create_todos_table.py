@@ -0,0 +1,51 @@
+"""create todos table
+
+Revision ID: 1a6e4c8b3d52
+Revises: b7c02ec16501
+Create Date: 2026-10-18 08:41:17.205913
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '1a6e4c8b3d52'
+down_revision: Union[str, None] = 'b7c02ec16501'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # b7c02ec16501 leaves no todos table behind, unless the database was built
+    # by the app on startup and stamped at b7c02ec16501; that table is kept.
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table('todos'):
+        return
+    op.create_table('todos',
+    sa.Column('id', sa.UUID(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.VARCHAR(length=255), autoincrement=False, nullable=False),
+    sa.Column('description', sa.TEXT(), autoincrement=False, nullable=True),
+    sa.Column('status', sa.VARCHAR(length=20), server_default=sa.text("'pending'::character varying"), autoincrement=False, nullable=False),
+    sa.Column('priority', sa.INTEGER(), server_default=sa.text('0'), autoincrement=False, nullable=False),
+    sa.Column('due_date', postgresql.TIMESTAMP(timezone=True), autoincrement=False, nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), autoincrement=False, nullable=True),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), autoincrement=False, nullable=True),
+    sa.PrimaryKeyConstraint('id', name='todos_pkey')
+    )
+    op.create_index('ix_todos_title', 'todos', ['title'], unique=False)
+    op.create_index('ix_todos_status', 'todos', ['status'], unique=False)
+    op.create_index('ix_todos_priority', 'todos', ['priority'], unique=False)
+    op.create_index('ix_todos_id', 'todos', ['id'], unique=False)
+    op.create_index('ix_todos_due_date', 'todos', ['due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_due_date', table_name='todos')
+    op.drop_index('ix_todos_id', table_name='todos')
+    op.drop_index('ix_todos_priority', table_name='todos')
+    op.drop_index('ix_todos_status', table_name='todos')
+    op.drop_index('ix_todos_title', table_name='todos')
+    op.drop_table('todos')
@@ -0,0 +1,37 @@
+"""add created_at id keyset index
+
+Revision ID: 3f9a1c2d7e41
+Revises: 1a6e4c8b3d52
+Create Date: 2026-10-18 09:12:04.318527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7e41'
+down_revision: Union[str, None] = '1a6e4c8b3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination compares (created_at, id) row values, which never match NULL.
+    op.execute("UPDATE todos SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('todos', 'created_at',
+               existing_type=postgresql.TIMESTAMP(timezone=True),
+               nullable=False,
+               existing_server_default=sa.text('now()'))
+    op.create_index('ix_todos_created_at_id', 'todos', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_created_at_id', table_name='todos')
+    op.alter_column('todos', 'created_at',
+               existing_type=postgresql.TIMESTAMP(timezone=True),
+               nullable=True,
+               existing_server_default=sa.text('now()'))
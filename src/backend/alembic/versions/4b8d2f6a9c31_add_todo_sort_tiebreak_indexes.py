@@ -0,0 +1,36 @@
+"""add todo sort tiebreak indexes
+
+Revision ID: 4b8d2f6a9c31
+Revises: c6f1a8d4b2e9
+Create Date: 2026-10-18 21:26:48.730519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d2f6a9c31'
+down_revision: Union[str, None] = 'c6f1a8d4b2e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sorts on priority and due_date end in created_at and id. The due_date
+    # indexes keep NULLs last in both directions, as the sort does, and the
+    # ascending one also serves due date filters, so the partial index goes.
+    op.create_index('ix_todos_priority_created_at_id', 'todos', ['priority', 'created_at', 'id'], unique=False)
+    op.create_index('ix_todos_due_date_created_at_id', 'todos', ['due_date', 'created_at', 'id'], unique=False)
+    op.create_index('ix_todos_due_date_desc_created_at_id', 'todos', [sa.text('due_date DESC NULLS LAST'), sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.drop_index('ix_todos_due_date_not_null', table_name='todos', postgresql_where=sa.text('due_date IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.create_index('ix_todos_due_date_not_null', 'todos', ['due_date'], unique=False, postgresql_where=sa.text('due_date IS NOT NULL'))
+    op.drop_index('ix_todos_due_date_desc_created_at_id', table_name='todos')
+    op.drop_index('ix_todos_due_date_created_at_id', table_name='todos')
+    op.drop_index('ix_todos_priority_created_at_id', table_name='todos')
@@ -0,0 +1,35 @@
+"""make todo updated_at not null
+
+Revision ID: 5a7d3e9c1f28
+Revises: d21f6a8b5c07
+Create Date: 2026-10-18 16:21:45.110294
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d3e9c1f28'
+down_revision: Union[str, None] = 'd21f6a8b5c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # updated_at is the version checked by ETag / If-Match, so every row needs one.
+    op.execute("UPDATE todos SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column('todos', 'updated_at',
+               existing_type=postgresql.TIMESTAMP(timezone=True),
+               nullable=False,
+               existing_server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    op.alter_column('todos', 'updated_at',
+               existing_type=postgresql.TIMESTAMP(timezone=True),
+               nullable=True,
+               existing_server_default=sa.text('now()'))
@@ -0,0 +1,125 @@
+"""apply net todo stats deltas
+
+Revision ID: 7c2e5a9d4f16
+Revises: 4b8d2f6a9c31
+Create Date: 2026-10-18 22:04:51.617302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d4f16'
+down_revision: Union[str, None] = '4b8d2f6a9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# An update pairs each old row with its new row and upserts only the groups
+# whose count changes. Edits that leave status, priority and due date alone,
+# such as a new title, write no counter row, so they take no lock on the few
+# rows every writer shares.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT d.status, d.priority, sum(d.delta)
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (
+            VALUES (o.status, o.priority, -1), (n.status, n.priority, 1)
+        ) AS d (status, priority, delta)
+        WHERE (o.status, o.priority) IS DISTINCT FROM (n.status, n.priority)
+        GROUP BY d.status, d.priority HAVING sum(d.delta) <> 0
+        ORDER BY d.status, d.priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT d.due_day, sum(d.delta)
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (
+            VALUES
+                (CASE WHEN o.status <> 'completed' THEN (o.due_date AT TIME ZONE 'UTC')::date END, -1),
+                (CASE WHEN n.status <> 'completed' THEN (n.due_date AT TIME ZONE 'UTC')::date END, 1)
+        ) AS d (due_day, delta)
+        WHERE d.due_day IS NOT NULL
+            AND (o.status = 'completed', o.due_date) IS DISTINCT FROM (n.status = 'completed', n.due_date)
+        GROUP BY d.due_day HAVING sum(d.delta) <> 0
+        ORDER BY d.due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, -count(*) FROM old_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, -count(*) FROM old_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, count(*) FROM new_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, count(*) FROM new_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+PREVIOUS_APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, -count(*) FROM old_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, -count(*) FROM old_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, count(*) FROM new_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, count(*) FROM new_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+
+def upgrade() -> None:
+    op.execute(APPLY_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_APPLY_FUNCTION)
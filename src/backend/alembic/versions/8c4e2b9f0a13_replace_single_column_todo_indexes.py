@@ -0,0 +1,40 @@
+"""replace single column todo indexes
+
+Revision ID: 8c4e2b9f0a13
+Revises: 3f9a1c2d7e41
+Create Date: 2026-10-18 11:40:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2b9f0a13'
+down_revision: Union[str, None] = '3f9a1c2d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ix_todos_id duplicates the primary key index.
+    op.drop_index('ix_todos_id', table_name='todos')
+    op.drop_index('ix_todos_status', table_name='todos')
+    op.drop_index('ix_todos_priority', table_name='todos')
+    op.drop_index('ix_todos_due_date', table_name='todos')
+    op.create_index('ix_todos_status_priority', 'todos', ['status', 'priority'], unique=False)
+    op.create_index('ix_todos_status_due_date', 'todos', ['status', 'due_date'], unique=False)
+    op.create_index('ix_todos_due_date_not_null', 'todos', ['due_date'], unique=False, postgresql_where=sa.text('due_date IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_due_date_not_null', table_name='todos', postgresql_where=sa.text('due_date IS NOT NULL'))
+    op.drop_index('ix_todos_status_due_date', table_name='todos')
+    op.drop_index('ix_todos_status_priority', table_name='todos')
+    op.create_index('ix_todos_due_date', 'todos', ['due_date'], unique=False)
+    op.create_index('ix_todos_priority', 'todos', ['priority'], unique=False)
+    op.create_index('ix_todos_status', 'todos', ['status'], unique=False)
+    op.create_index('ix_todos_id', 'todos', ['id'], unique=False)
@@ -0,0 +1,104 @@
+"""add todo stats summary tables
+
+Revision ID: 9e3b7c5d2a64
+Revises: 5a7d3e9c1f28
+Create Date: 2026-10-18 17:21:36.402918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b7c5d2a64'
+down_revision: Union[str, None] = '5a7d3e9c1f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, -count(*) FROM old_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, -count(*) FROM old_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO todo_status_counts AS c (status, priority, count)
+        SELECT status, priority, count(*) FROM new_rows
+        GROUP BY status, priority ORDER BY status, priority
+        ON CONFLICT (status, priority) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+        INSERT INTO todo_open_due_counts AS c (due_day, count)
+        SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, count(*) FROM new_rows
+        WHERE due_date IS NOT NULL AND status <> 'completed'
+        GROUP BY due_day ORDER BY due_day
+        ON CONFLICT (due_day) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.create_table('todo_status_counts',
+    sa.Column('status', postgresql.VARCHAR(length=20), nullable=False),
+    sa.Column('priority', postgresql.INTEGER(), nullable=False),
+    sa.Column('count', postgresql.BIGINT(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('status', 'priority')
+    )
+    op.create_table('todo_open_due_counts',
+    sa.Column('due_day', postgresql.DATE(), nullable=False),
+    sa.Column('count', postgresql.BIGINT(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('due_day')
+    )
+    op.execute(APPLY_FUNCTION)
+    # Writes wait until the counters are backfilled and the triggers exist,
+    # so no change is counted twice or missed.
+    op.execute("LOCK TABLE todos IN SHARE MODE")
+    op.execute(
+        "INSERT INTO todo_status_counts (status, priority, count) "
+        "SELECT status, priority, count(*) FROM todos GROUP BY status, priority"
+    )
+    op.execute(
+        "INSERT INTO todo_open_due_counts (due_day, count) "
+        "SELECT (due_date AT TIME ZONE 'UTC')::date AS due_day, count(*) FROM todos "
+        "WHERE due_date IS NOT NULL AND status <> 'completed' GROUP BY due_day"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_stats_insert AFTER INSERT ON todos "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION todo_stats_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_stats_update AFTER UPDATE ON todos "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION todo_stats_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION todo_stats_apply()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER todo_stats_delete ON todos")
+    op.execute("DROP TRIGGER todo_stats_update ON todos")
+    op.execute("DROP TRIGGER todo_stats_insert ON todos")
+    op.execute("DROP FUNCTION todo_stats_apply()")
+    op.drop_table('todo_open_due_counts')
+    op.drop_table('todo_status_counts')
@@ -20,13 +20,15 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    # Drops the table the app used to create on startup. IF EXISTS lets an
+    # empty database pass through; 1a6e4c8b3d52 creates the table again.
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index('ix_todos_due_date', table_name='todos')
-    op.drop_index('ix_todos_id', table_name='todos')
-    op.drop_index('ix_todos_priority', table_name='todos')
-    op.drop_index('ix_todos_status', table_name='todos')
-    op.drop_index('ix_todos_title', table_name='todos')
-    op.drop_table('todos')
+    op.drop_index('ix_todos_due_date', table_name='todos', if_exists=True)
+    op.drop_index('ix_todos_id', table_name='todos', if_exists=True)
+    op.drop_index('ix_todos_priority', table_name='todos', if_exists=True)
+    op.drop_index('ix_todos_status', table_name='todos', if_exists=True)
+    op.drop_index('ix_todos_title', table_name='todos', if_exists=True)
+    op.drop_table('todos', if_exists=True)
     # ### end Alembic commands ###
 
 
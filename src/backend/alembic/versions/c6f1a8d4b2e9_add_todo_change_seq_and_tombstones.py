@@ -0,0 +1,68 @@
+"""add todo change seq and tombstones
+
+Revision ID: c6f1a8d4b2e9
+Revises: 9e3b7c5d2a64
+Create Date: 2026-10-18 19:02:13.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a8d4b2e9'
+down_revision: Union[str, None] = '9e3b7c5d2a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHANGE_SEQ = "CAST(CAST(pg_current_xact_id() AS text) AS bigint)"
+
+RECORD_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION todo_tombstones_record() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO todo_tombstones (id, change_seq, deleted_at)
+    SELECT id, {CHANGE_SEQ}, now() FROM old_rows
+    ON CONFLICT (id) DO UPDATE
+    SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # Existing rows get the id of this migration's transaction, so the first
+    # delta sync after it returns them all once.
+    op.add_column('todos', sa.Column(
+        'change_seq', postgresql.BIGINT(), server_default=sa.text(CHANGE_SEQ), nullable=False
+    ))
+    op.create_index('ix_todos_change_seq_id', 'todos', ['change_seq', 'id'], unique=False)
+    op.create_table('todo_tombstones',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('change_seq', postgresql.BIGINT(), nullable=False),
+    sa.Column('deleted_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_todo_tombstones_change_seq_id', 'todo_tombstones', ['change_seq', 'id'], unique=False)
+    op.create_index('ix_todo_tombstones_deleted_at', 'todo_tombstones', ['deleted_at'], unique=False)
+    op.execute(RECORD_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER todo_tombstones_delete AFTER DELETE ON todos "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION todo_tombstones_record()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER todo_tombstones_delete ON todos")
+    op.execute("DROP FUNCTION todo_tombstones_record()")
+    op.drop_index('ix_todo_tombstones_deleted_at', table_name='todo_tombstones')
+    op.drop_index('ix_todo_tombstones_change_seq_id', table_name='todo_tombstones')
+    op.drop_table('todo_tombstones')
+    op.drop_index('ix_todos_change_seq_id', table_name='todos')
+    op.drop_column('todos', 'change_seq')
@@ -0,0 +1,38 @@
+"""add todo search vector
+
+Revision ID: d21f6a8b5c07
+Revises: 8c4e2b9f0a13
+Create Date: 2026-10-18 14:03:27.551862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd21f6a8b5c07'
+down_revision: Union[str, None] = '8c4e2b9f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('todos', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_todos_search_vector', 'todos', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_search_vector', table_name='todos', postgresql_using='gin')
+    op.drop_column('todos', 'search_vector')
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from ..database import async_engine, replica_router
+from ..schemas.pool import PoolStats
+from ..schemas.replica import ReplicaStatus
+
+router = APIRouter()
+
+
+@router.get("/db-pool", response_model=PoolStats)
+async def read_pool_stats():
+    """Retrieves the state and wait counters of the database connection pool."""
+    return async_engine.pool.stats()
+
+
+@router.get("/replicas", response_model=list[ReplicaStatus])
+async def read_replica_status():
+    """Retrieves the replication lag of the read replicas and whether they serve reads."""
+    return replica_router.status()
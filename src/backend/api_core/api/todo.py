@@ -1,14 +1,55 @@
+import asyncio
+from datetime import timedelta
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import (
+    APIRouter, Body, Depends, Header, Query, Request, Response, WebSocket, status
+)
+from fastapi.responses import StreamingResponse
 
-from ..deps.todo import get_todo_service
+from ..database import read_only
+from ..deps.todo import (
+    get_todo_service,
+    get_todo_filter,
+    get_todo_sort,
+    get_todo_fields,
+    get_todo_cache,
+    todo_service_scope,
+)
 from ..services.todo import TodoService
-from ..schemas.todo import TodoCreate, TodoRead, TodoUpdate
+from ..config import settings
+from ..schemas.cache import CacheStats
+from ..utils.cache import CacheBackend
+from ..utils.changes import CLOSED, change_feed, sse_frame, websocket_frame
+from ..utils.etag import etag_matches, list_etag, todo_etag
+from ..utils.export import json_array
+from ..schemas.todo import (
+    TodoCreate,
+    TodoRead,
+    TodoPartialRead,
+    TodoStats,
+    TodoCountMode,
+    TodoUpdate,
+    TodoFilter,
+    ExportFormat,
+    TodoImportResult,
+    TodoSearchHit,
+    TodoSortKey,
+    TodoBulkCreateResult,
+    TodoBulkWriteResult,
+    TodoSyncResult,
+    TodoBatchGet,
+    TodoBatchGetResult,
+)
 
 router = APIRouter()
 
 
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
 @router.post("/", response_model=TodoRead, status_code=status.HTTP_201_CREATED)
 async def create_todo(
     todo_create: TodoCreate, todo_service: TodoService = Depends(get_todo_service)
@@ -17,37 +58,388 @@ async def create_todo(
     return await todo_service.create_todo(todo_create)
 
 
-@router.get("/", response_model=list[TodoRead])
+@router.post(
+    "/bulk",
+    response_model=TodoBulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_todos(
+    items: list[dict[str, Any]] = Body(
+        description="Todo items matching the TodoCreate schema"
+    ),
+    chunk_size: int = Query(default=settings.BULK_INSERT_CHUNK_SIZE, ge=1, le=5000),
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Creates many todo items in a single transaction.
+
+    Invalid items are skipped and reported by their position in the request body.
+    """
+    return await todo_service.create_todos(items, chunk_size)
+
+
+@router.get(
+    "/",
+    response_model=list[TodoPartialRead],
+    responses={304: {"description": "The page has not changed since If-None-Match"}},
+)
 async def read_todos(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    todo_filter: TodoFilter = Depends(get_todo_filter),
+    sort: tuple[TodoSortKey, ...] = Depends(get_todo_sort),
+    fields: tuple[str, ...] = Depends(get_todo_fields),
+    count: TodoCountMode | None = Query(
+        default=None,
+        description="Return the number of matching items in the X-Total-Count header",
+    ),
+    if_none_match: str | None = Header(default=None),
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Retreives all todo items matching the filters.
+
+    The cursor for the next page, if any, is returned in the X-Next-Cursor header.
+    A cursor is only valid with the sort it was issued for.
+
+    Only the requested fields are selected, and rows are written to JSON
+    directly instead of being validated into TodoRead first.
+
+    The ETag is derived from the ids and versions of the items on the page,
+    so it costs no query beyond the page itself. An unchanged page is
+    answered with 304 without being serialized.
+    """
+    variant = "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+    )
+    rows, next_cursor = await todo_service.read_todos(
+        skip, limit, cursor, todo_filter, sort, fields
+    )
+    total = None
+    if count is not None:
+        total = await todo_service.count_todos_total(todo_filter, count)
+    await todo_service.release()
+
+    etag = list_etag(((row.id, row.updated_at) for row in rows), variant, next_cursor, total)
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return Response(
+        json_array(rows, fields), media_type="application/json", headers=headers
+    )
+
+
+@router.patch("/", response_model=TodoBulkWriteResult)
+async def update_todos(
+    todo_update: TodoUpdate,
+    todo_filter: TodoFilter = Depends(get_todo_filter),
+    dry_run: bool = False,
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Updates every todo item matching the filters in one statement."""
+    return await todo_service.update_todos(todo_filter, todo_update, dry_run)
+
+
+@router.delete("/", response_model=TodoBulkWriteResult)
+async def delete_todos(
+    todo_filter: TodoFilter = Depends(get_todo_filter),
+    dry_run: bool = False,
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Deletes every todo item matching the filters in one statement."""
+    return await todo_service.delete_todos(todo_filter, dry_run)
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}
+    },
+)
+async def export_todos(
+    format: ExportFormat = ExportFormat.NDJSON,
+    todo_filter: TodoFilter = Depends(get_todo_filter),
+):
+    """Streams all todo items matching the filters as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and sent one batch at a time.
+    A slow client pauses the cursor instead of growing the server's buffers.
+    """
+    async def content():
+        async with todo_service_scope() as todo_service:
+            async for chunk in todo_service.export_todos(
+                format, todo_filter, settings.EXPORT_BATCH_SIZE
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format.value}"'},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TodoImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_todos(
+    request: Request,
+    format: ExportFormat = ExportFormat.NDJSON,
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Imports todo items from an NDJSON or CSV request body.
+
+    The body is parsed as it arrives and written in COPY batches. Rejected
+    records are reported by line number; the rest are imported.
+    """
+    return await todo_service.import_todos(
+        request.stream(),
+        format,
+        settings.IMPORT_BATCH_SIZE,
+        settings.IMPORT_MAX_REPORTED_REJECTIONS,
+        settings.IMPORT_MAX_LINE_BYTES,
+    )
+
+
+@router.post(
+    "/batch-get", response_model=TodoBatchGetResult, dependencies=[Depends(read_only)]
+)
+async def read_todos_by_ids(
+    batch_get: TodoBatchGet,
     todo_service: TodoService = Depends(get_todo_service),
 ):
-    """Retreives all todo items."""
-    return await todo_service.read_todos(skip, limit)
+    """Retrieves many todo items by ID in a single query.
 
+    Ids without a todo item are listed in not_found rather than failing the request.
+    """
+    result = await todo_service.read_todos_by_ids(batch_get.ids)
+    await todo_service.release()
+    return result
 
-@router.get("/{todo_id}", response_model=TodoRead)
+
+@router.get("/search", response_model=list[TodoSearchHit])
+async def search_todos(
+    q: str = Query(
+        min_length=1,
+        max_length=256,
+        description="Search words; supports quoted phrases, OR and -exclusions",
+    ),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Searches todo items by title and description, best match first."""
+    hits = await todo_service.search_todos(q, skip, limit)
+    await todo_service.release()
+    return hits
+
+
+@router.get("/stats", response_model=TodoStats)
+async def read_todo_stats(
+    count: TodoCountMode = Query(
+        default=TodoCountMode.EXACT,
+        description="Sum the total from the counters, or estimate it from planner statistics",
+    ),
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Retrieves the counts of todo items by status, by priority and overdue.
+
+    The counts are read from summary tables that triggers keep up to date,
+    so the cost does not grow with the number of todo items.
+    """
+    stats = await todo_service.read_todo_stats(count)
+    await todo_service.release()
+    return stats
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+async def read_cache_stats(cache: CacheBackend | None = Depends(get_todo_cache)):
+    """Retrieves the hit and miss counters of the todo read cache."""
+    if cache is None:
+        return CacheStats(backend="none", hits=0, misses=0, entries=0, generation=0)
+    return await cache.stats()
+
+
+@router.get("/sync", response_model=TodoSyncResult)
+async def sync_todos(
+    since: str | None = Query(
+        default=None, description="next_token of the previous sync; omit for a full sync"
+    ),
+    limit: int = Query(default=1000, ge=1, le=5000),
+    todo_service: TodoService = Depends(get_todo_service),
+):
+    """Retrieves the todo items changed and deleted since the previous sync.
+
+    Changes are read from an index in the order they were written, so a sync
+    costs as much as the number of changes since the token. A token older
+    than the tombstone retention window is rejected with 410 Gone, and the
+    client has to sync again from scratch.
+    """
+    result = await todo_service.sync_todos(
+        since, limit, timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    )
+    await todo_service.release()
+    return result
+
+
+@router.get(
+    "/changes",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_todo_changes(
+    after: str | None = Query(
+        default=None, description="Resume after this event id; Last-Event-ID takes precedence"
+    ),
+    last_event_id: str | None = Header(default=None),
+):
+    """Streams an event for every write to todo items as Server-Sent Events.
+
+    Each `change` event carries a TodoChangeEvent. Reconnecting with the id of
+    the last event received replays the events missed in between. A `reset`
+    event means events were missed that cannot be replayed, so the client
+    should reload the items it shows. The stream ends if the client falls too
+    far behind; reconnecting resumes it.
+    """
+    async def content():
+        subscription = change_feed.subscribe(last_event_id or after)
+        try:
+            while True:
+                message = await subscription.get(settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+                if message is None:
+                    # A comment line keeps proxies from closing an idle stream.
+                    yield b": keepalive\n\n"
+                elif message is CLOSED:
+                    break
+                else:
+                    yield sse_frame(message)
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        content(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/changes/ws")
+async def todo_changes_websocket(websocket: WebSocket, after: str | None = None):
+    """Sends the events of /changes over a WebSocket.
+
+    Each text message is a JSON object with the event name and its id and
+    data. The socket is closed with code 1013 when the client falls too far
+    behind; reconnecting with after set to the last event id resumes it.
+    """
+    await websocket.accept()
+    subscription = change_feed.subscribe(after)
+
+    async def wait_for_disconnect():
+        # Messages from the client are ignored; receiving only notices it leaving.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        while True:
+            next_message = asyncio.ensure_future(subscription.get())
+            await asyncio.wait({next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_message.cancel()
+                break
+            message = next_message.result()
+            if message is CLOSED:
+                await websocket.close(code=1013)
+                break
+            await websocket.send_text(websocket_frame(message))
+    finally:
+        disconnected.cancel()
+        change_feed.unsubscribe(subscription)
+
+
+@router.get(
+    "/{todo_id}",
+    response_model=TodoRead,
+    responses={304: {"description": "The todo item has not changed since If-None-Match"}},
+)
 async def read_todo(
-    todo_id: UUID, todo_service: TodoService = Depends(get_todo_service)
+    todo_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    todo_service: TodoService = Depends(get_todo_service),
 ):
-    """Retrieves a specific todo item by ID."""
-    return await todo_service.read_todo(todo_id)
+    """Retrieves a specific todo item by ID.
+
+    With If-None-Match only the item's version is read; a match returns 304.
+    """
+    if if_none_match is not None:
+        etag = await todo_service.read_todo_etag(todo_id)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+    todo = await todo_service.read_todo(todo_id)
+    await todo_service.release()
+    response.headers["ETag"] = todo_etag(todo.id, todo.updated_at)
+    return todo
 
 
-@router.put("/{todo_id}", response_model=TodoRead)
+@router.put(
+    "/{todo_id}",
+    response_model=TodoRead,
+    responses={412: {"description": "The todo item has changed since If-Match"}},
+)
 async def update_todo(
     todo_id: UUID,
     todo_update: TodoUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
     todo_service: TodoService = Depends(get_todo_service),
 ):
-    """Updates a specific todo item."""
-    return await todo_service.update_todo(todo_id, todo_update)
+    """Updates a specific todo item.
 
+    With If-Match the update only applies while the item still has that ETag.
+    """
+    todo = await todo_service.update_todo(todo_id, todo_update, if_match)
+    response.headers["ETag"] = todo_etag(todo.id, todo.updated_at)
+    return todo
 
-@router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+
+@router.delete(
+    "/{todo_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={412: {"description": "The todo item has changed since If-Match"}},
+)
 async def delete_todo(
-    todo_id: UUID, todo_service: TodoService = Depends(get_todo_service)
+    todo_id: UUID,
+    if_match: str | None = Header(default=None),
+    todo_service: TodoService = Depends(get_todo_service),
 ):
-    """Deletes a specific todo item."""
-    await todo_service.delete_todo(todo_id)
+    """Deletes a specific todo item.
+
+    With If-Match the delete only applies while the item still has that ETag.
+    """
+    await todo_service.delete_todo(todo_id, if_match)
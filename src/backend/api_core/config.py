@@ -3,10 +3,44 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     ENV: str
-    POSTGRES_USER: str
-    POSTGRES_PASSWORD: str
-    POSTGRES_DB: str
+    POSTGRES_USER: str = ""
+    POSTGRES_PASSWORD: str = ""
+    POSTGRES_DB: str = ""
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_POOL_WARMUP_SIZE: int = 2
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_REJECTIONS: int = 1000
+    IMPORT_MAX_LINE_BYTES: int = 65536
+    CHANGE_FEED_HISTORY_SIZE: int = 1000
+    CHANGE_FEED_BUFFER_SIZE: int = 100
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0
+    SYNC_TOMBSTONE_RETENTION_DAYS: float = 30.0
+    SYNC_TOMBSTONE_COMPACTION_INTERVAL_SECONDS: float = 3600.0
+    SINGLE_FLIGHT_MAX_WAIT_SECONDS: float = 1.0
+    CACHE_BACKEND: str = "memory"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: float = 30.0
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_FORMAT: str = "json"
     model_config = SettingsConfigDict(
         env_file="None",
         env_file_encoding="utf-8",
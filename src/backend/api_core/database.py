@@ -1,37 +1,345 @@
-from sqlmodel import create_engine, SQLModel
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy.exc import SQLAlchemyError
+import asyncio
+import pathlib
+import time
+from functools import partial
+from sqlmodel import SQLModel
+from typing import AsyncGenerator, Awaitable, Callable
+from alembic.script import ScriptDirectory
+from fastapi import Request
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from .config import settings
 from .utils.custom_logger import CustomLogger
+from .utils.pool import InstrumentedAsyncQueuePool
+from .utils.metrics import instrument_engine, registry, Counter, Gauge
+from .utils.replicas import ReplicaRouter
 from .exceptions.custom import DatabaseException
 
 logger = CustomLogger(__name__).logger
+session_logger = CustomLogger(f"{__name__}.session").logger
 
-async_engine = AsyncEngine(create_engine(url=settings.DATABASE_URL, echo=True))
+# Requests with other methods write, and are always served by the primary,
+# unless their route depends on read_only.
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Key in the request state set by read_only.
+READ_ONLY_STATE = "read_only"
+
+# Set on responses to writes; see ReadYourWritesMiddleware.
+LAST_WRITE_COOKIE = "last_write"
+
+ALEMBIC_DIRECTORY = pathlib.Path(__file__).resolve().parent.parent / "alembic"
+SCHEMA_VERSION_QUERY = text("SELECT version_num FROM alembic_version")
+
+# The revision of a database the app built on startup, before migrations.
+CREATE_ALL_REVISION = "b7c02ec16501"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database is not at the Alembic revision the code was written for."""
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets reads run while a write is in progress, and with it
+    # synchronous=NORMAL only syncs at checkpoints instead of every commit.
+    # Writers wait for the lock up to the pool timeout rather than failing.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_POOL_TIMEOUT * 1000)}")
+    cursor.close()
+
+
+def _pool_pre_ping() -> bool:
+    # A ping costs a round trip on every checkout. Recycling already replaces
+    # connections before servers and proxies drop them as idle, so it is
+    # only on by default when connections are never recycled.
+    if settings.DB_POOL_PRE_PING is not None:
+        return settings.DB_POOL_PRE_PING
+    return settings.DB_POOL_RECYCLE < 0
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if make_url(url).get_backend_name() == "postgresql":
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    engine = create_async_engine(
+        url=url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=_pool_pre_ping(),
+        connect_args=connect_args,
+    )
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(engine)
+    return engine
+
+
+async_engine = _create_engine(settings.DATABASE_URL)
+registry.register(Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    collect=lambda: async_engine.pool.checkedout(),
+))
+registry.register(Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool size; negative while the pool is filling up.",
+    collect=lambda: async_engine.pool.overflow(),
+))
+registry.register(Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool.",
+    collect=lambda: async_engine.pool.checkouts,
+))
+registry.register(Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after the pool timeout.",
+    collect=lambda: async_engine.pool.timeouts,
+))
+registry.register(Counter(
+    "db_pool_wait_seconds_total",
+    "Time checkouts spent waiting for an idle connection or a free slot.",
+    collect=lambda: async_engine.pool.wait_seconds_total,
+))
+registry.register(Gauge(
+    "db_pool_wait_seconds_max",
+    "Longest single wait for an idle connection or a free slot.",
+    collect=lambda: async_engine.pool.wait_seconds_max,
+))
+registry.register(Counter(
+    "db_pool_connects_total",
+    "Connections opened, including replacements of recycled ones.",
+    collect=lambda: async_engine.pool.connects,
+))
+registry.register(Counter(
+    "db_pool_connect_seconds_total",
+    "Time spent opening connections.",
+    collect=lambda: async_engine.pool.connect_seconds_total,
+))
+
+
+async def _schema_revisions(conn: AsyncConnection) -> set[str]:
+    """Reads the Alembic revisions the database is at, or none before the first migration."""
+    try:
+        return set(await conn.scalars(SCHEMA_VERSION_QUERY))
+    except ProgrammingError:
+        return set()
+
+
+async def _has_todos_table() -> bool:
+    """Tells whether the todos table exists, e.g. because the app created it on startup."""
+    try:
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("todos"))
+    except SQLAlchemyError as e:
+        raise DatabaseException(detail=str(e))
 
 
 async def init_db() -> None:
+    """
+    Makes sure the database has the schema the code expects.
+
+    Postgres is migrated with Alembic, so startup only checks, with one query,
+    that it is at the head revision, and refuses to start otherwise rather
+    than serve requests against an old schema. A database with a todos table
+    but no revision was built by the app on startup before migrations, and
+    must be stamped at the first revision before upgrading; upgrading it
+    directly would drop the table. SQLite has no migrations; its
+    schema is created if it does not exist yet.
+
+    Raises:
+        SchemaOutOfDateError: If Postgres is not at the head revision.
+        DatabaseException: If the database cannot be reached.
+    """
     try:
         async with async_engine.begin() as conn:
-            await conn.run_sync(SQLModel.metadata.create_all)
-        logger.info("Database initialized successfully.")
+            if conn.dialect.name == "sqlite":
+                await conn.run_sync(SQLModel.metadata.create_all)
+                logger.info("Database initialized successfully.")
+                return
+            revisions = await _schema_revisions(conn)
     except SQLAlchemyError as e:
         raise DatabaseException(detail=str(e))
 
+    heads = set(ScriptDirectory(str(ALEMBIC_DIRECTORY)).get_heads())
+    if revisions != heads:
+        command = "alembic upgrade head"
+        if not revisions and await _has_todos_table():
+            command = f"alembic stamp {CREATE_ALL_REVISION}` and then `{command}"
+        raise SchemaOutOfDateError(
+            f"Database schema is at revision {', '.join(sorted(revisions)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}; run `{command}`"
+        )
+    logger.info("Database schema is at revision %s.", ", ".join(sorted(heads)))
+
+
+async def warm_up_pool(
+    engine: AsyncEngine, size: int, prepare: Callable[["UnitOfWork"], Awaitable[None]]
+) -> None:
+    """
+    Opens connections of an engine's pool before the first requests need them.
+
+    prepare runs once on each connection, with a unit of work bound to it, so
+    the statements it executes are compiled once and prepared on every
+    connection. The connections then go back to the pool.
+
+    Args:
+        engine (AsyncEngine): The engine whose pool to fill.
+        size (int): The number of connections to open, at most the pool size.
+        prepare (Callable): Runs the statements to prepare.
+    """
+    size = min(size, engine.pool.size())
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+    connections = [result for result in results if isinstance(result, AsyncConnection)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(*(
+            _prepare_connection(connection, prepare) for connection in connections
+        ))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def _prepare_connection(
+    connection: AsyncConnection, prepare: Callable[["UnitOfWork"], Awaitable[None]]
+) -> None:
+    unit_of_work = UnitOfWork(
+        session_factory=partial(AsyncSession, bind=connection, expire_on_commit=False)
+    )
+    try:
+        await prepare(unit_of_work)
+    finally:
+        await unit_of_work.close()
+
+
+async def close_db() -> None:
+    """Closes every connection of the primary pool; replica_router.stop() closes the replica pools."""
+    await async_engine.dispose()
+
 
 async_session = sessionmaker(
     bind=async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+replica_router = ReplicaRouter(
+    [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
+class UnitOfWork:
+    """
+    A request-scoped database session that is only opened when first used.
+
+    Requests served from the cache, or rejected before any query runs, never
+    create a session. Route handlers call release() once after their last
+    query, which ends the transactions and hands the connections back to the
+    pool before the response is serialized, so a request checks out each
+    connection only once however many statements it runs.
+
+    Given a read_session_factory, reads that may be served by a replica use
+    read_session instead, unless the primary session is already open, so a
+    request never sees a replica that is behind its own writes.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        read_session_factory: Callable[[], AsyncSession] | None = None,
+    ):
+        self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._read_session_factory = read_session_factory
+        self._read_session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """The session, created on first access."""
+        if self._session is None:
+            self._session = self._session_factory()
+            session_logger.debug("Database session created successfully.")
+        return self._session
+
+    @property
+    def read_session(self) -> AsyncSession:
+        """A replica session for reads, or the primary session if there is no replica to read from."""
+        if self._session is not None or self._read_session_factory is None:
+            return self.session
+        if self._read_session is None:
+            self._read_session = self._read_session_factory()
+            session_logger.debug("Replica session created successfully.")
+        return self._read_session
+
+    @property
+    def reads_primary(self) -> bool:
+        """Whether read_session is the primary session."""
+        return self._session is not None or self._read_session_factory is None
+
+    async def release(self) -> None:
+        """Ends the current transactions, if any, returning their connections to the pool."""
+        for session in (self._session, self._read_session):
+            if session is not None and session.in_transaction():
+                await session.commit()
+
+    async def close(self) -> None:
+        """Closes the sessions that were ever opened."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._read_session is not None:
+            await self._read_session.close()
+            self._read_session = None
+
+
+def _wrote_recently(request: Request) -> bool:
+    """Whether the client's last write is recent enough that a replica may not have it yet."""
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+def read_only(request: Request) -> None:
+    """
+    Route dependency marking a request that only reads, although its method is
+    not safe, e.g. a POST that carries its arguments in the body.
+
+    Such a request may be served by a replica and does not count as a write for
+    ReadYourWritesMiddleware. List it before other dependencies of the route.
+    """
+    setattr(request.state, READ_ONLY_STATE, True)
+
+
+def is_read_only(request: Request) -> bool:
+    """Whether a request only reads, by its method or through read_only."""
+    return request.method in SAFE_METHODS or getattr(request.state, READ_ONLY_STATE, False)
+
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_unit_of_work(request: Request) -> AsyncGenerator[UnitOfWork, None]:
+    read_session_factory = None
+    if is_read_only(request) and not _wrote_recently(request):
+        read_session_factory = replica_router.read_session_factory()
+    unit_of_work = UnitOfWork(read_session_factory=read_session_factory)
     try:
-        async with async_session() as session:
-            logger.info("Database session created successfully.")
-            yield session
+        yield unit_of_work
     except SQLAlchemyError as e:
         raise DatabaseException(detail=str(e))
+    finally:
+        await unit_of_work.close()
@@ -1,18 +1,94 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator
+from fastapi import Depends, Query
 
-from ..database import get_db_session
+from ..database import UnitOfWork, get_unit_of_work
 from ..repos.todo import TodoRepository
+from ..repos.cached_todo import CachedTodoRepository
 from ..services.todo import TodoService
+from ..models.todo import TodoStatus
+from ..schemas.todo import TodoFilter, TodoSortKey, TODO_SORT_FIELDS, TODO_READ_FIELDS
+from ..utils.cache import CacheBackend, todo_cache
+from ..utils.sorting import parse_sort
+from ..utils.fields import parse_fields
+
+
+def get_todo_cache() -> CacheBackend | None:
+    return todo_cache
 
 
 def get_todo_repository(
-    db_session: AsyncSession = Depends(get_db_session),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    cache: CacheBackend | None = Depends(get_todo_cache),
 ) -> TodoRepository:
-    return TodoRepository(db_session)
+    if cache is None:
+        return TodoRepository(unit_of_work)
+    return CachedTodoRepository(unit_of_work, cache)
 
 
 def get_todo_service(
     todo_repository: TodoRepository = Depends(get_todo_repository),
 ) -> TodoService:
-    return TodoService(todo_repository)
\ No newline at end of file
+    return TodoService(todo_repository)
+
+
+@asynccontextmanager
+async def todo_service_scope() -> AsyncIterator[TodoService]:
+    """
+    Provides a TodoService with its own session, outside of request dependencies.
+
+    Dependencies with yield are closed before a StreamingResponse sends its body,
+    so streaming endpoints open their session here, inside the body iterator.
+    """
+    unit_of_work = UnitOfWork()
+    try:
+        yield TodoService(TodoRepository(unit_of_work))
+    finally:
+        await unit_of_work.close()
+
+
+def get_todo_filter(
+    status: TodoStatus | None = None,
+    priority_min: int | None = Query(default=None, ge=0, le=5),
+    priority_max: int | None = Query(default=None, ge=0, le=5),
+    due_before: datetime | None = Query(
+        default=None, description="Only items due strictly before this time"
+    ),
+    due_after: datetime | None = Query(
+        default=None, description="Only items due strictly after this time"
+    ),
+) -> TodoFilter:
+    return TodoFilter(
+        status=status,
+        priority_min=priority_min,
+        priority_max=priority_max,
+        due_before=due_before,
+        due_after=due_after,
+    )
+
+
+def get_todo_sort(
+    sort: str | None = Query(
+        default=None,
+        description=(
+            "Comma separated fields to sort by, prefix with '-' for descending. "
+            f"Allowed fields: {', '.join(TODO_SORT_FIELDS)}"
+        ),
+        examples=["-priority,due_date"],
+    ),
+) -> tuple[TodoSortKey, ...]:
+    return parse_sort(sort)
+
+
+def get_todo_fields(
+    fields: str | None = Query(
+        default=None,
+        description=(
+            "Comma separated fields to include in each item; all fields by default. "
+            f"Allowed fields: {', '.join(TODO_READ_FIELDS)}"
+        ),
+        examples=["id,title,status"],
+    ),
+) -> tuple[str, ...]:
+    return parse_fields(fields)
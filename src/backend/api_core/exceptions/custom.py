@@ -19,6 +19,89 @@ class TodoNotFoundException(NotFoundException):
             error_code="todo_not_found"
         )
 
+class BadRequestException(TodoException):
+    """Base class for all malformed client input errors"""
+    def __init__(self, detail: str, error_code: str):
+        super().__init__(
+            detail=detail,
+            error_code=error_code,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+class InvalidCursorException(BadRequestException):
+    """Pagination cursor could not be decoded"""
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(
+            detail=detail,
+            error_code="invalid_cursor"
+        )
+
+class InvalidSortException(BadRequestException):
+    """Sort expression names a field that cannot be sorted on"""
+    def __init__(self, detail: str = "Invalid sort expression"):
+        super().__init__(
+            detail=detail,
+            error_code="invalid_sort"
+        )
+
+class InvalidFieldsException(BadRequestException):
+    """Sparse fieldset names a field that todo items do not have"""
+    def __init__(self, detail: str = "Invalid fields"):
+        super().__init__(
+            detail=detail,
+            error_code="invalid_fields"
+        )
+
+class InvalidImportException(BadRequestException):
+    """Uploaded import file cannot be read at all"""
+    def __init__(self, detail: str = "Invalid import file"):
+        super().__init__(
+            detail=detail,
+            error_code="invalid_import"
+        )
+
+class FilterRequiredException(BadRequestException):
+    """Bulk operation was requested without any filter"""
+    def __init__(self, detail: str = "At least one filter is required for bulk operations"):
+        super().__init__(
+            detail=detail,
+            error_code="filter_required"
+        )
+
+class EmptyUpdateException(BadRequestException):
+    """Update request did not set any field"""
+    def __init__(self, detail: str = "No fields to update"):
+        super().__init__(
+            detail=detail,
+            error_code="empty_update"
+        )
+
+class InvalidSyncTokenException(BadRequestException):
+    """Sync token could not be decoded"""
+    def __init__(self, detail: str = "Invalid sync token"):
+        super().__init__(
+            detail=detail,
+            error_code="invalid_sync_token"
+        )
+
+class SyncTokenExpiredException(TodoException):
+    """Sync token is older than the tombstones that are kept to answer it"""
+    def __init__(self, detail: str = "Sync token has expired; sync again without since"):
+        super().__init__(
+            detail=detail,
+            error_code="sync_token_expired",
+            status_code=status.HTTP_410_GONE
+        )
+
+class PreconditionFailedException(TodoException):
+    """Todo item changed since the version the client sent in If-Match"""
+    def __init__(self, detail: str = "Todo item has been modified"):
+        super().__init__(
+            detail=detail,
+            error_code="precondition_failed",
+            status_code=status.HTTP_412_PRECONDITION_FAILED
+        )
+
 class DatabaseException(TodoException):
     """Database operation error"""
     def __init__(self, detail: str = "Database operation failed"):
@@ -25,9 +25,11 @@ async def create_error_response(
             error_response["traceback"] = traceback.format_exc()
         
         logger.info(
-            f"Error occurred: {error_response['detail']} "
-            f"at endpoint: {error_response['path']} "
-            f"with method: {error_response['method']}"
+            "Error occurred: %s at endpoint: %s with method: %s",
+            exc.detail,
+            request.url.path,
+            request.method,
+            extra={"error_code": exc.error_code},
         )
         
         return error_response
@@ -1,25 +1,79 @@
+from datetime import timedelta
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
-from .database import init_db
+from .config import settings
+from .database import (
+    UnitOfWork, async_engine, close_db, init_db, replica_router, warm_up_pool
+)
+from .deps.todo import todo_service_scope
+from .repos.todo import TodoRepository
+from .services.todo import TodoService
 from .middleware import register_middleware
 from .api.todo import router as todo_router
+from .api.system import router as system_router
+from .api.metrics import router as metrics_router
+from .utils.changes import change_feed
 from .utils.custom_logger import CustomLogger
+from .utils.periodic import PeriodicTask
+from .utils.single_flight import SingleFlight
+from .utils.startup import startup_timer
 from .exceptions.handler import add_exception_handlers
 
 from contextlib import asynccontextmanager
 
 logger = CustomLogger(__name__).logger
 
+
+async def compact_tombstones() -> None:
+    async with todo_service_scope() as todo_service:
+        await todo_service.compact_tombstones(
+            timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        )
+
+
+tombstone_compaction = PeriodicTask(
+    "Tombstone compaction",
+    compact_tombstones,
+    settings.SYNC_TOMBSTONE_COMPACTION_INTERVAL_SECONDS,
+)
+
+
+async def prepare_statements(unit_of_work: UnitOfWork) -> None:
+    # Each connection must run the reads itself, so none of them are coalesced.
+    todo_service = TodoService(
+        TodoRepository(unit_of_work), reads=SingleFlight("warm_up", max_wait=0)
+    )
+    await todo_service.warm_up()
+
+
+async def warm_up_db() -> None:
+    # Only speeds up the first requests, so a failure does not stop startup.
+    try:
+        await warm_up_pool(async_engine, settings.DB_POOL_WARMUP_SIZE, prepare_statements)
+    except Exception as e:
+        logger.warning("Could not warm up the connection pool: %s", e)
+
+
 @asynccontextmanager
 async def life_span(app: FastAPI):
     logger.info("Server is starting...")
+    startup_timer.start()
     try:
         await init_db()
+        await warm_up_db()
+        replica_router.start()
+        change_feed.start()
+        tombstone_compaction.start()
+        startup_timer.ready()
         yield
     except Exception as e:
-        logger.error(f"Error during server startup: {e}")
+        logger.error("Error during server startup: %s", e)
         raise
     finally:
+        await tombstone_compaction.stop()
+        await change_feed.stop()
+        await replica_router.stop()
+        await close_db()
         logger.info("Server has been stopped.")
 
 def create_app() -> FastAPI:
@@ -44,6 +98,12 @@ def create_app() -> FastAPI:
     app.include_router(
         todo_router, prefix=f"{version_prefix}/todos", tags=["todos"]
     )
+
+    app.include_router(
+        system_router, prefix=f"{version_prefix}/system", tags=["system"]
+    )
+
+    app.include_router(metrics_router)
     
     return app
 
@@ -1,42 +1,245 @@
+import logging
 import time
 from fastapi import FastAPI
-from fastapi.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .config import settings
+from .database import SAFE_METHODS, LAST_WRITE_COOKIE, READ_ONLY_STATE
 from .utils.custom_logger import CustomLogger
-logger = CustomLogger(__name__).logger
+from .utils.metrics import http_request_duration, http_requests_in_flight, UNMATCHED_ROUTE
+from .utils.startup import startup_timer
+from .utils.etag import encoded_etag, names_encoded_etag
+from .utils.compression import (
+    available_encodings,
+    negotiate_encoding,
+    compress,
+    stream_compressor,
+)
+access_logger = CustomLogger("api_core.access").logger
+
+
+class RequestLoggingMiddleware:
+    """
+    Records the duration of every HTTP request and writes the access log.
+
+    Written as plain ASGI rather than with @app.middleware("http"), which
+    runs the rest of the app in a separate task and copies the response body
+    through a memory stream. Here the only per-request work is wrapping send
+    to see the status code and the end of the body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-def register_middleware(app: FastAPI):
-    
-    @app.middleware("http")
-    async def custom_logging(request: Request, call_next):
         start_time = time.perf_counter()
-        
-        response = await call_next(request)
-        
-        client_ip = request.client.host
-        client_port = request.client.port
-        method = request.method
-        path = request.url.path
-        status_code = response.status_code
-        
-        if status_code < 400:
-            processing_time = time.perf_counter() - start_time
-            message = f"Client: {client_ip}:{client_port} | Method {method} | Path: {path} | Status: {status_code} | Time: completed after {processing_time:.5f}s"
-            logger.info(message)
-            
-        return response
-    
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            duration = time.perf_counter() - start_time
+            # The router stores the matched route in the shared scope; its
+            # template keeps the label set bounded however many ids are requested.
+            route = scope.get("route")
+            http_request_duration.observe(
+                (scope["method"], route.path if route else UNMATCHED_ROUTE, status_code),
+                duration,
+            )
+            if status_code < 400:
+                startup_timer.request_succeeded()
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info(
+                    "%s %s %s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    extra={
+                        "client": lambda: "{}:{}".format(*scope["client"]) if scope.get("client") else None,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration": duration,
+                    },
+                )
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with gzip or zstd, as negotiated by Accept-Encoding.
+
+    Bodies sent in one piece are only compressed from minimum_size bytes up,
+    since below that the saved bytes cost more CPU time than they save on the
+    wire. Streamed bodies are compressed chunk by chunk and flushed after
+    each one, so clients can keep decoding while the stream is open.
+
+    A compressed body gets its own ETag, with the coding appended, and a 304
+    keeps that tag when the client's If-None-Match names it.
+    """
+
+    # Event streams are read line by line as they arrive and must not be buffered.
+    EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels or {}
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        level = self.levels.get(encoding, 6)
+        start_message: Message | None = None
+        compressor = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress.
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                initial_message, start_message = start_message, None
+                skip = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(self.EXCLUDED_MEDIA_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                )
+                if skip:
+                    if (
+                        initial_message["status"] == 304
+                        and "etag" in headers
+                        and names_encoded_etag(
+                            request_headers.get("if-none-match", ""), headers["etag"], encoding
+                        )
+                    ):
+                        headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                    await send(initial_message)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                if more_body:
+                    del headers["Content-Length"]
+                    compressor = stream_compressor(encoding, level)
+                    message["body"] = compressor.compress(body)
+                else:
+                    message["body"] = compress(encoding, body, level)
+                    headers["Content-Length"] = str(len(message["body"]))
+                await send(initial_message)
+                await send(message)
+                return
+
+            if compressor is not None:
+                data = compressor.compress(body) if body else b""
+                if not more_body:
+                    data += compressor.finish()
+                message["body"] = data
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks the clients that just wrote, so their reads stay on the primary for a while.
+
+    Successful responses to writes set a cookie with the time of the write;
+    get_unit_of_work skips the replicas while it is younger than window
+    seconds, by which time they have normally replayed the write.
+    """
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+                and not scope.get("state", {}).get(READ_ONLY_STATE, False)
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={max(1, round(self.window))}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def register_middleware(app: FastAPI):
+
+    if settings.DATABASE_REPLICA_URLS:
+        app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        levels={
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+
+    app.add_middleware(RequestLoggingMiddleware)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_methods=["*"],
         allow_headers=["*"],
         allow_credentials=True,
+        expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
     )
-    
+
     app.add_middleware(
         TrustedHostMiddleware,
         allowed_hosts=["localhost", "127.0.0.1", "0.0.0.0", "calm-goshawk-pleasantly.ngrok-free.app", "hissing-aurel-nes4-babcd08e.koyeb.app"]
-    )
\ No newline at end of file
+    )
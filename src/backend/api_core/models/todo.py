@@ -3,7 +3,11 @@ from datetime import datetime
 from enum import Enum
 from sqlmodel import SQLModel, Field, Column
 from sqlalchemy.dialects import postgresql as pg
-from sqlalchemy import func
+from sqlalchemy import func, text, BigInteger, Computed, Index, Integer, String, Text, Uuid
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+from .types import UTCDateTime, current_change_seq, initial_change_seq
 
 class TodoStatus(str, Enum):
     """
@@ -14,40 +18,100 @@ class TodoStatus(str, Enum):
     COMPLETED = "completed"
 
 
+SEARCH_LANGUAGE = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(description, '')), 'B')"
+)
+
+
+class _SearchVectorExpression(ColumnElement):
+    """The generation expression of search_vector; other backends store NULL and search with LIKE."""
+    inherit_cache = True
+
+
+@compiles(_SearchVectorExpression)
+def _compile_search_vector_expression(element, compiler, **kw):
+    return "NULL"
+
+
+@compiles(_SearchVectorExpression, "postgresql")
+def _compile_search_vector_expression_postgresql(element, compiler, **kw):
+    return SEARCH_VECTOR_EXPRESSION
+
+
 class Todo(SQLModel, table=True):
     """
     Represents a todo item in the database.
     """
     __tablename__ = "todos"
+    __table_args__ = (
+        # Stable keyset for cursor pagination over the list endpoint.
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        # Composite indexes for the list endpoint's filters and sorts. A sort
+        # on priority or due_date is broken by created_at and id; the due_date
+        # indexes hold NULLs where the sort puts them, last in either direction.
+        Index("ix_todos_status_priority", "status", "priority"),
+        Index("ix_todos_status_due_date", "status", "due_date"),
+        Index("ix_todos_priority_created_at_id", "priority", "created_at", "id"),
+        Index("ix_todos_due_date_created_at_id", "due_date", "created_at", "id"),
+        # SQLite cannot place NULLs in an index; it sorts them on the fly.
+        Index(
+            "ix_todos_due_date_desc_created_at_id",
+            text("due_date DESC NULLS LAST"),
+            text("created_at DESC"),
+            text("id DESC"),
+        ).ddl_if(dialect="postgresql"),
+        # Full-text search document, maintained by Postgres on every write.
+        Column(
+            "search_vector",
+            pg.TSVECTOR().with_variant(Text(), "sqlite"),
+            Computed(_SearchVectorExpression(), persisted=True),
+        ),
+        Index(
+            "ix_todos_search_vector", "search_vector", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        # Position of the latest write, for delta sync to read changes in order.
+        Column(
+            "change_seq",
+            BigInteger,
+            server_default=initial_change_seq(),
+            onupdate=current_change_seq(),
+            nullable=False,
+        ),
+        Index("ix_todos_change_seq_id", "change_seq", "id"),
+    )
+    # Only queried by the search and sync endpoints; never loaded into Todo instances.
+    __mapper_args__ = {"exclude_properties": ["search_vector", "change_seq"]}
 
     id: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, default=uuid4, index=True),
+        sa_column=Column(Uuid, primary_key=True, default=uuid4),
     )
     title: str = Field(
-        sa_column=Column(pg.VARCHAR(255), nullable=False, index=True),
+        sa_column=Column(String(255), nullable=False, index=True),
         max_length=255,
         min_length=1,
     )
     description: str | None = Field(
-        sa_column=Column(pg.TEXT, default=None),
+        sa_column=Column(Text, default=None),
         max_length=5000,
     )
     status: TodoStatus = Field(
-        sa_column=Column(pg.VARCHAR(20), server_default=TodoStatus.PENDING.value, nullable=False, index=True),
+        sa_column=Column(String(20), server_default=TodoStatus.PENDING.value, nullable=False),
         description="Current status of the todo item (pending, in_progress, completed)"
     )
     priority: int = Field(
-        sa_column=Column(pg.INTEGER, server_default="0", nullable=False, index=True),
+        sa_column=Column(Integer, server_default="0", nullable=False),
         ge=0,
         le=5,
         description="Priority of the todo item (0: None, 1-5: higher values indicate higher priority)"
     )
     due_date: datetime | None = Field(
-        sa_column=Column(pg.TIMESTAMP(timezone=True), default=None, index=True),
+        sa_column=Column(UTCDateTime, default=None),
     )
     created_at: datetime = Field(
-        sa_column=Column(pg.TIMESTAMP(timezone=True), server_default=func.now()),
+        sa_column=Column(UTCDateTime, server_default=func.now(), nullable=False),
     )
     updated_at: datetime = Field(
-        sa_column=Column(pg.TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()),
+        sa_column=Column(UTCDateTime, server_default=func.now(), onupdate=func.now(), nullable=False),
     )
\ No newline at end of file
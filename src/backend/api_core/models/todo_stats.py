@@ -0,0 +1,90 @@
+from datetime import date
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DDL, BigInteger, Date, Integer, String, event
+
+
+class TodoStatusCount(SQLModel, table=True):
+    """
+    Represents the number of todo items with a given status and priority.
+
+    Maintained by the todo_stats triggers on every write to todos, so the
+    totals by status and priority are read from at most 18 rows.
+    """
+    __tablename__ = "todo_status_counts"
+
+    status: str = Field(sa_column=Column(String(20), primary_key=True))
+    priority: int = Field(sa_column=Column(Integer, primary_key=True))
+    count: int = Field(sa_column=Column(BigInteger, nullable=False, server_default="0"))
+
+
+class TodoOpenDueCount(SQLModel, table=True):
+    """
+    Represents the number of todo items that are not completed and due on a given UTC day.
+
+    Overdue items are the ones due on an earlier day, plus the ones due
+    earlier today, so counting them never scans todos beyond today.
+    """
+    __tablename__ = "todo_open_due_counts"
+
+    due_day: date = Field(sa_column=Column(Date, primary_key=True))
+    count: int = Field(sa_column=Column(BigInteger, nullable=False, server_default="0"))
+
+
+# On Postgres, migration 9e3b7c5d2a64 creates statement-level triggers that
+# read all changed rows from transition tables. SQLite has none, so its
+# triggers apply each row on its own. Updates that leave status, priority
+# and due date alone skip them.
+# The SELECT ... WHERE form is needed for an upsert to accept a condition.
+SQLITE_TODO_STATS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_insert AFTER INSERT ON todos
+    BEGIN
+        INSERT INTO todo_status_counts (status, priority, count)
+        VALUES (NEW.status, NEW.priority, 1)
+        ON CONFLICT (status, priority) DO UPDATE SET count = count + 1;
+
+        INSERT INTO todo_open_due_counts (due_day, count)
+        SELECT date(NEW.due_date), 1 WHERE NEW.due_date IS NOT NULL AND NEW.status <> 'completed'
+        ON CONFLICT (due_day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_update AFTER UPDATE OF status, priority, due_date ON todos
+    WHEN OLD.status IS NOT NEW.status
+        OR OLD.priority IS NOT NEW.priority
+        OR OLD.due_date IS NOT NEW.due_date
+    BEGIN
+        UPDATE todo_status_counts SET count = count - 1
+        WHERE status = OLD.status AND priority = OLD.priority;
+
+        UPDATE todo_open_due_counts SET count = count - 1
+        WHERE due_day = date(OLD.due_date) AND OLD.status <> 'completed';
+
+        INSERT INTO todo_status_counts (status, priority, count)
+        VALUES (NEW.status, NEW.priority, 1)
+        ON CONFLICT (status, priority) DO UPDATE SET count = count + 1;
+
+        INSERT INTO todo_open_due_counts (due_day, count)
+        SELECT date(NEW.due_date), 1 WHERE NEW.due_date IS NOT NULL AND NEW.status <> 'completed'
+        ON CONFLICT (due_day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_delete AFTER DELETE ON todos
+    BEGIN
+        UPDATE todo_status_counts SET count = count - 1
+        WHERE status = OLD.status AND priority = OLD.priority;
+
+        UPDATE todo_open_due_counts SET count = count - 1
+        WHERE due_day = date(OLD.due_date) AND OLD.status <> 'completed';
+    END
+    """,
+)
+
+# create_all, which init_db uses for SQLite, knows nothing of triggers.
+for statement in SQLITE_TODO_STATS_TRIGGERS:
+    event.listen(
+        SQLModel.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
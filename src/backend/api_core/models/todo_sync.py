@@ -0,0 +1,70 @@
+from uuid import UUID
+from datetime import datetime
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DDL, BigInteger, Index, Uuid, event, func
+
+from .types import UTCDateTime, SQLITE_CHANGE_SEQ
+
+
+class TodoTombstone(SQLModel, table=True):
+    """
+    Represents a deleted todo item, so that delta sync can report the delete.
+
+    Written by the todo_tombstones trigger on every delete from todos, and
+    removed again once it is older than the sync retention window.
+    """
+    __tablename__ = "todo_tombstones"
+    __table_args__ = (
+        Index("ix_todo_tombstones_change_seq_id", "change_seq", "id"),
+        Index("ix_todo_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id: UUID = Field(sa_column=Column(Uuid, primary_key=True))
+    change_seq: int = Field(sa_column=Column(BigInteger, nullable=False))
+    deleted_at: datetime = Field(
+        sa_column=Column(UTCDateTime, server_default=func.now(), nullable=False),
+    )
+
+
+# On Postgres, migration c6f1a8d4b2e9 numbers writes by transaction id and
+# records tombstones with a statement-level trigger. SQLite numbers writes
+# from a single counter row. Each statement reads the counter, and every row
+# it writes moves it on, so the next statement reads a higher value.
+SQLITE_TODO_SYNC_STATEMENTS = (
+    "CREATE TABLE IF NOT EXISTS todo_change_counter (value INTEGER NOT NULL)",
+    """
+    INSERT INTO todo_change_counter (value)
+    SELECT 1 WHERE NOT EXISTS (SELECT * FROM todo_change_counter)
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todo_change_seq_insert AFTER INSERT ON todos
+    BEGIN
+        UPDATE todos SET change_seq = {SQLITE_CHANGE_SEQ} WHERE rowid = NEW.rowid;
+        UPDATE todo_change_counter SET value = value + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_change_seq_update AFTER UPDATE ON todos
+    BEGIN
+        UPDATE todo_change_counter SET value = value + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todo_tombstones_delete AFTER DELETE ON todos
+    BEGIN
+        INSERT INTO todo_tombstones (id, change_seq, deleted_at)
+        VALUES (OLD.id, {SQLITE_CHANGE_SEQ}, strftime('%Y-%m-%d %H:%M:%f000', 'now'))
+        ON CONFLICT (id) DO UPDATE
+        SET change_seq = excluded.change_seq, deleted_at = excluded.deleted_at;
+        UPDATE todo_change_counter SET value = value + 1;
+    END
+    """,
+)
+
+# DDL %-formats its statement, so the percent signs of strftime are doubled.
+for statement in SQLITE_TODO_SYNC_STATEMENTS:
+    event.listen(
+        SQLModel.metadata,
+        "after_create",
+        DDL(statement.replace("%", "%%")).execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, TypeDecorator
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement, now
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    A timezone-aware timestamp on every backend.
+
+    Postgres stores TIMESTAMP WITH TIME ZONE and returns aware datetimes.
+    SQLite has no timestamp type, so values are converted to UTC and stored
+    as naive text, which sorts in time order, and read back as UTC.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    @property
+    def python_type(self) -> type:
+        return datetime
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is not None and dialect.name == "sqlite":
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
+@compiles(now, "sqlite")
+def _compile_sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has whole seconds, too coarse for updated_at to
+    # tell two writes apart. This matches the text SQLAlchemy stores for a
+    # bound datetime, so stored and bound timestamps compare as equal text.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+# The position of a write in the order that delta sync replays changes in.
+# On Postgres it is the id of the writing transaction; every transaction with
+# a lower id has finished once a snapshot's xmin has passed it, even if ids
+# commit out of order. SQLite runs one write at a time, and numbers writes
+# from a counter that its todo_change_seq triggers advance after each row.
+POSTGRES_CHANGE_SEQ = "CAST(CAST(pg_current_xact_id() AS text) AS bigint)"
+SQLITE_CHANGE_SEQ = "(SELECT value FROM todo_change_counter)"
+
+
+class current_change_seq(FunctionElement):
+    """The change sequence value of the current write."""
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_change_seq, "postgresql")
+def _compile_postgresql_change_seq(element, compiler, **kw):
+    return POSTGRES_CHANGE_SEQ
+
+
+@compiles(current_change_seq, "sqlite")
+def _compile_sqlite_change_seq(element, compiler, **kw):
+    return SQLITE_CHANGE_SEQ
+
+
+class initial_change_seq(current_change_seq):
+    """The column default of change_seq."""
+    inherit_cache = True
+
+
+@compiles(initial_change_seq, "sqlite")
+def _compile_sqlite_initial_change_seq(element, compiler, **kw):
+    # A SQLite default cannot hold a subquery; the insert trigger sets it.
+    return "0"
@@ -0,0 +1,153 @@
+from typing import Any, Sequence
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import Row
+
+from .todo import TodoRepository
+from ..database import UnitOfWork
+from ..models.todo import Todo
+from ..schemas.todo import (
+    TodoCreate,
+    TodoRead,
+    TodoUpdate,
+    TodoFilter,
+    TodoSortKey,
+    DEFAULT_TODO_SORT,
+    TODO_READ_FIELDS,
+)
+from ..utils.cache import CacheBackend
+
+
+class CachedTodoRepository(TodoRepository):
+    """
+    A TodoRepository that serves reads through a cache backend.
+
+    Reads are stored as TodoRead snapshots or immutable Core rows, so that no
+    ORM instance is shared between sessions. Every write that changes rows bumps the cache's write
+    generation, which invalidates all cached reads; a write that matched nothing leaves the
+    cache warm. Reads a replica served are cached apart from
+    reads of the primary, so a request that must see its own writes is never
+    answered with a replica's older rows.
+    """
+
+    def __init__(self, unit_of_work: UnitOfWork, cache: CacheBackend):
+        super().__init__(unit_of_work)
+        self.cache = cache
+
+    def _source(self) -> str:
+        """The part of a cache key naming the database the read goes to."""
+        return "primary" if self.unit_of_work.reads_primary else "replica"
+
+    async def read_todos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        todo_filter: TodoFilter | None = None,
+        sort: tuple[TodoSortKey, ...] = DEFAULT_TODO_SORT,
+        after: list[Any] | None = None,
+        columns: tuple[str, ...] = TODO_READ_FIELDS,
+    ) -> Sequence[Row]:
+        # Read the generation before querying, so a write that lands in between
+        # leaves this result under a generation that is already stale.
+        generation = await self.cache.get_generation()
+        filter_key = todo_filter.model_dump_json(exclude_none=True) if todo_filter else ""
+        key = (
+            f"todos:{generation}:{self._source()}:{skip}:{limit}:{filter_key}:"
+            f"{sort}:{after}:{columns}"
+        )
+        rows = await self.cache.get(key)
+        if rows is None:
+            rows = await super().read_todos(skip, limit, todo_filter, sort, after, columns)
+            await self.cache.set(key, rows)
+
+        return rows
+
+    async def read_todo(self, todo_id: UUID) -> TodoRead | None:
+        generation = await self.cache.get_generation()
+        key = f"todo:{generation}:{self._source()}:{todo_id}"
+        todo = await self.cache.get(key)
+        if todo is None:
+            row = await super().read_todo(todo_id)
+            if row is None:
+                return None
+            todo = TodoRead.model_validate(row)
+            await self.cache.set(key, todo)
+
+        return todo
+
+    async def read_todos_by_ids(self, todo_ids: list[UUID]) -> Sequence[TodoRead]:
+        # Shares its entries with read_todo, and only queries the ids it misses.
+        generation = await self.cache.get_generation()
+        todos = []
+        missing = []
+        for todo_id in todo_ids:
+            todo = await self.cache.get(f"todo:{generation}:{self._source()}:{todo_id}")
+            if todo is None:
+                missing.append(todo_id)
+            else:
+                todos.append(todo)
+        if missing:
+            for row in await super().read_todos_by_ids(missing):
+                todo = TodoRead.model_validate(row)
+                await self.cache.set(f"todo:{generation}:{self._source()}:{todo.id}", todo)
+                todos.append(todo)
+
+        return todos
+
+    async def read_todo_version(self, todo_id: UUID) -> datetime | None:
+        generation = await self.cache.get_generation()
+        todo = await self.cache.get(f"todo:{generation}:{self._source()}:{todo_id}")
+        if todo is not None:
+            return todo.updated_at
+
+        return await super().read_todo_version(todo_id)
+
+    async def create_todo(self, todo_create: TodoCreate) -> Todo:
+        todo = await super().create_todo(todo_create)
+        await self.cache.bump_generation()
+        return todo
+
+    async def create_todos(
+        self, todo_creates: list[TodoCreate], chunk_size: int = 1000
+    ) -> list[UUID]:
+        todo_ids = await super().create_todos(todo_creates, chunk_size)
+        if todo_ids:
+            await self.cache.bump_generation()
+        return todo_ids
+
+    async def copy_todos(self, todo_creates: list[TodoCreate]) -> int:
+        created = await super().copy_todos(todo_creates)
+        if created:
+            await self.cache.bump_generation()
+        return created
+
+    async def update_todo(
+        self,
+        todo_id: UUID,
+        todo_update: TodoUpdate,
+        expected_versions: list[datetime] | None = None,
+    ) -> Todo | None:
+        todo = await super().update_todo(todo_id, todo_update, expected_versions)
+        if todo is not None:
+            await self.cache.bump_generation()
+        return todo
+
+    async def update_todos(self, todo_filter: TodoFilter, todo_update: TodoUpdate) -> int:
+        affected = await super().update_todos(todo_filter, todo_update)
+        if affected:
+            await self.cache.bump_generation()
+        return affected
+
+    async def delete_todo(
+        self, todo_id: UUID, expected_versions: list[datetime] | None = None
+    ) -> bool:
+        deleted = await super().delete_todo(todo_id, expected_versions)
+        if deleted:
+            await self.cache.bump_generation()
+        return deleted
+
+    async def delete_todos(self, todo_filter: TodoFilter) -> int:
+        affected = await super().delete_todos(todo_filter)
+        if affected:
+            await self.cache.bump_generation()
+        return affected
@@ -0,0 +1,267 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+import orjson
+from sqlalchemy import (
+    BigInteger, Date, Float, Select, Text, Uuid, and_, any_, bindparam, case, cast, false, func,
+    insert, literal, literal_column, not_, or_, text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, ColumnElement, Executable
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import settings
+from ..models.todo import Todo, SEARCH_LANGUAGE
+from ..models.types import SQLITE_CHANGE_SEQ
+from ..utils.changes import CHANGE_CHANNEL, change_feed
+
+
+COPY_COLUMNS = ("id", "title", "description", "priority", "due_date")
+SEARCH_HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2"
+NOTIFY_STATEMENT = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class TodoStorage(ABC):
+    """
+    The database-specific parts of TodoRepository.
+
+    Everything else the repository does is portable SQL. What one backend
+    does natively, such as full-text search or COPY, another does with the
+    closest equivalent it has, so callers see the same results on both.
+    """
+
+    # Errors the driver raises outside of SQLAlchemy, e.g. from COPY.
+    driver_errors: tuple[type[Exception], ...] = ()
+
+    @abstractmethod
+    async def copy_todos(
+        self, session: AsyncSession, records: list[dict[str, Any]], changes: list[str]
+    ) -> None:
+        """Inserts a batch of rows with the fastest bulk load of the backend, committed as by commit()."""
+
+    @abstractmethod
+    def search_statement(self, query: str, skip: int, limit: int) -> Select:
+        """Returns a select of (todo, rank, title_highlight, description_highlight), best match first."""
+
+    @abstractmethod
+    async def estimate_rows(self, session: AsyncSession, query: Select) -> int:
+        """Returns the number of rows a query would return, estimated if that is cheaper."""
+
+    @abstractmethod
+    async def commit(self, session: AsyncSession, changes: list[str]) -> None:
+        """Commits a write, publishing its change feed events if and only if it commits."""
+
+    @abstractmethod
+    def sync_horizon(self) -> ColumnElement:
+        """The lowest change_seq a write that is not yet visible can still get."""
+
+    @abstractmethod
+    def id_in(self, todo_ids: list[UUID]) -> ColumnElement:
+        """A condition matching the todo items whose id is one of todo_ids."""
+
+    @abstractmethod
+    def today(self) -> ColumnElement:
+        """The current UTC date."""
+
+    @abstractmethod
+    def start_of_today(self) -> ColumnElement:
+        """Midnight UTC of the current day, comparable with timestamp columns."""
+
+
+class PostgresTodoStorage(TodoStorage):
+    driver_errors = (asyncpg.PostgresError,)
+
+    async def copy_todos(
+        self, session: AsyncSession, records: list[dict[str, Any]], changes: list[str]
+    ) -> None:
+        # COPY skips statement parsing and per-row parameter binding. It goes
+        # through the driver on the session's connection, in the session's
+        # transaction: the notifications are sent first, which begins that
+        # transaction on the server if no statement has yet, and the COPY
+        # commits with them, however much the session ran before it.
+        await session.execute(NOTIFY_STATEMENT, {"channel": CHANGE_CHANNEL, "payloads": changes})
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Todo.__tablename__,
+            records=[tuple(record[column] for column in COPY_COLUMNS) for record in records],
+            columns=COPY_COLUMNS,
+        )
+        await session.commit()
+
+    def search_statement(self, query: str, skip: int, limit: int) -> Select:
+        # Matches come from the GIN index on search_vector, and highlights are
+        # only computed for the rows of the requested page.
+        ts_query = func.websearch_to_tsquery(SEARCH_LANGUAGE, query)
+        search_vector = Todo.__table__.c.search_vector
+        rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+        matches = (
+            select(Todo.id, rank)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Todo.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        return (
+            select(
+                Todo,
+                matches.c.rank,
+                func.ts_headline(SEARCH_LANGUAGE, Todo.title, ts_query, SEARCH_HIGHLIGHT_OPTIONS),
+                func.ts_headline(
+                    SEARCH_LANGUAGE, Todo.description, ts_query, SEARCH_HIGHLIGHT_OPTIONS
+                ),
+            )
+            .join(matches, matches.c.id == Todo.id)
+            .order_by(matches.c.rank.desc(), Todo.id)
+        )
+
+    async def estimate_rows(self, session: AsyncSession, query: Select) -> int:
+        # The planner's row estimate, which is only as current as the table's last ANALYZE.
+        result = await session.execute(_Explain(query))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def commit(self, session: AsyncSession, changes: list[str]) -> None:
+        # Notifications are sent in the write's own transaction, so every
+        # listening worker gets them, in order, exactly when it commits.
+        if changes:
+            await session.execute(
+                NOTIFY_STATEMENT, {"channel": CHANGE_CHANNEL, "payloads": changes}
+            )
+        await session.commit()
+
+    def sync_horizon(self) -> ColumnElement:
+        # Transactions below the snapshot's xmin have all committed or aborted.
+        return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+    def id_in(self, todo_ids: list[UUID]) -> ColumnElement:
+        # One array parameter keeps a single prepared statement for any number
+        # of ids, where IN would render one parameter per id.
+        return Todo.id == any_(bindparam("todo_ids", todo_ids, type_=ARRAY(Uuid)))
+
+    def today(self) -> ColumnElement:
+        return func.timezone("UTC", func.now()).cast(Date)
+
+    def start_of_today(self) -> ColumnElement:
+        return func.date_trunc("day", func.now(), "UTC")
+
+
+# Terms of a web-style search query: quoted phrases or single words, either
+# of them prefixed with '-' to exclude it.
+_SEARCH_TERM = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SqliteTodoStorage(TodoStorage):
+    async def copy_todos(
+        self, session: AsyncSession, records: list[dict[str, Any]], changes: list[str]
+    ) -> None:
+        # One prepared INSERT executed for every row, in a single transaction.
+        await session.execute(insert(Todo), records)
+        await self.commit(session, changes)
+
+    def search_statement(self, query: str, skip: int, limit: int) -> Select:
+        # Without a text search index, each term is a case-insensitive
+        # substring match. Title matches rank above description matches, and
+        # the highlights are the unmarked fields.
+        included, excluded = [], []
+        for match in _SEARCH_TERM.finditer(query):
+            negated = match.group(1) or match.group(3)
+            term = match.group(2) if match.group(2) is not None else match.group(4)
+            if not term.strip() or term.lower() == "or":
+                continue
+            (excluded if negated else included).append(_like_pattern(term))
+
+        def matches(pattern: str):
+            return (
+                Todo.title.like(pattern, escape="\\"),
+                func.coalesce(Todo.description, "").like(pattern, escape="\\"),
+            )
+
+        conditions = [or_(*matches(pattern)) for pattern in included]
+        conditions += [not_(or_(*matches(pattern))) for pattern in excluded]
+        rank = sum(
+            (
+                case((in_title, 2.0), else_=0.0) + case((in_description, 1.0), else_=0.0)
+                for in_title, in_description in map(matches, included)
+            ),
+            literal(0.0, Float),
+        ).label("rank")
+        return (
+            select(Todo, rank, Todo.title, Todo.description)
+            .where(and_(*conditions) if included else false())
+            .order_by(rank.desc(), Todo.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+    async def estimate_rows(self, session: AsyncSession, query: Select) -> int:
+        # SQLite keeps no row estimates to read, so this counts.
+        result = await session.execute(select(func.count()).select_from(query.subquery()))
+        return result.scalar_one()
+
+    async def commit(self, session: AsyncSession, changes: list[str]) -> None:
+        # No other process can be notified, so only this worker's subscribers
+        # hear of it, once the write has committed.
+        await session.commit()
+        for payload in changes:
+            change_feed.dispatch(payload)
+
+    def sync_horizon(self) -> ColumnElement:
+        # Writes are serialized, and every one moves the counter past the values it used.
+        return literal_column(SQLITE_CHANGE_SEQ)
+
+    def id_in(self, todo_ids: list[UUID]) -> ColumnElement:
+        return Todo.id.in_(todo_ids)
+
+    def today(self) -> ColumnElement:
+        return func.date("now")
+
+    def start_of_today(self) -> ColumnElement:
+        return func.strftime("%Y-%m-%d 00:00:00.000000", "now")
+
+
+def create_todo_storage(database_url: str) -> TodoStorage:
+    """
+    Builds the storage for the backend of a database URL.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    backend = make_url(database_url).get_backend_name()
+    if backend == "postgresql":
+        return PostgresTodoStorage()
+    if backend == "sqlite":
+        return SqliteTodoStorage()
+    raise ValueError(f"Unsupported database backend: {backend}")
+
+
+todo_storage = create_todo_storage(settings.DATABASE_URL)
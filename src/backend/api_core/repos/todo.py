@@ -1,16 +1,174 @@
-from uuid import UUID
+from typing import Any, AsyncIterator, Sequence
+from uuid import UUID, uuid4
+from datetime import datetime
+from sqlalchemy import (
+    BigInteger, Row, Uuid, and_, cast, delete, func, insert, literal, not_, or_, tuple_, union_all
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import select, update
 
-from ..models.todo import Todo
-from ..schemas.todo import TodoCreate, TodoUpdate
-from ..exceptions.custom import DatabaseException
+from ..database import UnitOfWork
+from ..models.todo import Todo, TodoStatus
+from ..models.todo_stats import TodoStatusCount, TodoOpenDueCount
+from ..models.todo_sync import TodoTombstone
+from ..schemas.change import TodoChangeOperation
+from ..schemas.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoFilter,
+    TodoSortKey,
+    DEFAULT_TODO_SORT,
+    TODO_READ_FIELDS,
+)
+from ..exceptions.custom import DatabaseException, InvalidCursorException
+from ..utils.changes import encode_changes
+from ..utils.sorting import tiebreak_fields
+from .storage import TodoStorage, todo_storage
+
+
+def _filter_clauses(todo_filter: TodoFilter) -> list:
+    """Translates a TodoFilter into SQL WHERE clauses."""
+    clauses = []
+    if todo_filter.status is not None:
+        clauses.append(Todo.status == todo_filter.status)
+    if todo_filter.priority_min is not None:
+        clauses.append(Todo.priority >= todo_filter.priority_min)
+    if todo_filter.priority_max is not None:
+        clauses.append(Todo.priority <= todo_filter.priority_max)
+    if todo_filter.due_before is not None:
+        clauses.append(Todo.due_date < todo_filter.due_before)
+    if todo_filter.due_after is not None:
+        clauses.append(Todo.due_date > todo_filter.due_after)
+    return clauses
+
+
+def _stats_filter_clauses(todo_filter: TodoFilter) -> list:
+    """Translates the status and priority conditions of a TodoFilter for todo_status_counts."""
+    clauses = []
+    if todo_filter.status is not None:
+        clauses.append(TodoStatusCount.status == todo_filter.status)
+    if todo_filter.priority_min is not None:
+        clauses.append(TodoStatusCount.priority >= todo_filter.priority_min)
+    if todo_filter.priority_max is not None:
+        clauses.append(TodoStatusCount.priority <= todo_filter.priority_max)
+    return clauses
+
+
+def _version_clause(expected_versions: list[datetime]):
+    """Matches rows whose updated_at is one of the expected versions."""
+    return Todo.updated_at.in_(expected_versions)
+
+
+def _sort_columns(sort: tuple[TodoSortKey, ...]) -> list[tuple[Any, bool]]:
+    """Resolves sort keys to (column, descending) pairs, followed by the tiebreak columns."""
+    columns = [(Todo.__table__.c[key.field], key.descending) for key in sort]
+    columns.extend(
+        (Todo.__table__.c[field], sort[-1].descending) for field in tiebreak_fields(sort)
+    )
+    return columns
+
+
+def _order_by_clauses(sort: tuple[TodoSortKey, ...], source=Todo.__table__) -> list:
+    """Builds ORDER BY clauses over the columns of source that always place NULLs last."""
+    clauses = []
+    for column, descending in _sort_columns(sort):
+        clause = source.c[column.name].desc() if descending else source.c[column.name].asc()
+        if column.nullable:
+            clause = clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def _row_after(columns: list[tuple[Any, bool]], values: list[Any]):
+    """Compares the columns, all sorted in the same direction, with values as one row value."""
+    row = tuple_(*(column for column, _ in columns))
+    return row < tuple_(*values) if columns[0][1] else row > tuple_(*values)
+
+
+def _coerce_cursor_value(column, value: Any) -> Any:
+    """
+    Converts a JSON value from a cursor back to the column's Python type.
+
+    Raises:
+        TypeError: If the value cannot be of the column's type.
+        ValueError: If a string does not parse as the column's type.
+    """
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (datetime, UUID):
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a string for {column.name}")
+        return datetime.fromisoformat(value) if python_type is datetime else UUID(value)
+    if type(value) is not python_type:
+        raise TypeError(f"Expected {python_type.__name__} for {column.name}")
+    return value
+
+
+def _after_clauses(sort: tuple[TodoSortKey, ...], values: list[Any]) -> list:
+    """
+    Builds WHERE clauses that together select the rows after a keyset position.
+
+    No row matches more than one clause, and each clause is meant to be a
+    single range of an index on the sort columns. When every sort column is
+    NOT NULL and sorted in the same direction this is one row-value
+    comparison. A nullable first key, such as due_date, adds a second clause
+    for the rows where it is NULL, which sort last; an OR of the two could
+    only filter the index from its start. Other sorts expand into one OR of
+    prefix matches, treating NULLs as sorting last.
+    """
+    columns = _sort_columns(sort)
+    if len(values) != len(columns):
+        raise InvalidCursorException()
+    try:
+        values = [
+            _coerce_cursor_value(column, value)
+            for (column, _), value in zip(columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise InvalidCursorException()
+
+    directions = {descending for _, descending in columns}
+    nullable = [index for index, (column, _) in enumerate(columns) if column.nullable]
+    if len(directions) == 1 and not nullable:
+        return [_row_after(columns, values)]
+    if len(directions) == 1 and nullable == [0]:
+        first = columns[0][0]
+        if values[0] is None:
+            return [and_(first.is_(None), _row_after(columns[1:], values[1:]))]
+        # The row value is never true for a NULL first key.
+        return [_row_after(columns, values), first.is_(None)]
+
+    clauses = []
+    prefix = []
+    for (column, descending), value in zip(columns, values):
+        if value is not None:
+            after = column < value if descending else column > value
+            if column.nullable:
+                after = or_(after, column.is_(None))
+            clauses.append(and_(*prefix, after))
+            prefix.append(column == value)
+        else:
+            # Nothing sorts after NULL within this column.
+            prefix.append(column.is_(None))
+    return [or_(*clauses)]
 
 
 class TodoRepository:
-    def __init__(self, db_session: AsyncSession):
-        self.db_session = db_session
+    def __init__(self, unit_of_work: UnitOfWork, storage: TodoStorage = todo_storage):
+        self.unit_of_work = unit_of_work
+        self.storage = storage
+
+    @property
+    def db_session(self) -> AsyncSession:
+        """The unit of work's session, opened on first use."""
+        return self.unit_of_work.session
+
+    @property
+    def read_session(self) -> AsyncSession:
+        """The session for reads that a replica may serve."""
+        return self.unit_of_work.read_session
 
     async def create_todo(self, todo_create: TodoCreate) -> Todo:
         """
@@ -20,42 +178,247 @@ class TodoRepository:
             todo_create (TodoCreate): The schema containing the data for the new todo item.
 
         Returns:
-            Todo: The newly created todo item.
+            Todo: The newly created todo item, including its server-generated fields.
 
         Raises:
             SQLAlchemyError: If there is an error during database operations.
         """
         try:
-            todo = Todo(**todo_create.model_dump())
-            self.db_session.add(todo)
-            await self.db_session.commit()
-            
+            query = (
+                insert(Todo)
+                .values(id=uuid4(), **todo_create.model_dump())
+                .returning(Todo)
+            )
+
+            result = await self.db_session.execute(query)
+            todo = result.scalar_one()
+            await self.storage.commit(
+                self.db_session, encode_changes(TodoChangeOperation.CREATED, ids=[todo.id])
+            )
+
             return todo
         except SQLAlchemyError as e:
             await self.db_session.rollback()
             raise DatabaseException(detail=str(e))
 
 
-    async def read_todos(self, skip: int = 0, limit: int = 100) -> list[Todo] | list[None]:
+    async def create_todos(
+        self, todo_creates: list[TodoCreate], chunk_size: int = 1000
+    ) -> list[UUID]:
+        """
+        Creates many todo items in a single transaction.
+
+        Each chunk is written with one multi-row INSERT, so at most chunk_size rows
+        of parameters are held by the driver at a time.
+
+        Args:
+            todo_creates (list[TodoCreate]): The validated todo items to create.
+            chunk_size (int): The maximum number of rows per INSERT statement.
+
+        Returns:
+            list[UUID]: The ids of the created todo items, in input order.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            todo_ids = []
+            for start in range(0, len(todo_creates), chunk_size):
+                rows = [
+                    {"id": uuid4(), **todo_create.model_dump()}
+                    for todo_create in todo_creates[start:start + chunk_size]
+                ]
+                await self.db_session.execute(insert(Todo).values(rows))
+                todo_ids.extend(row["id"] for row in rows)
+            await self.storage.commit(
+                self.db_session, encode_changes(TodoChangeOperation.CREATED, ids=todo_ids)
+            )
+
+            return todo_ids
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            raise DatabaseException(detail=str(e))
+
+
+    async def copy_todos(self, todo_creates: list[TodoCreate]) -> int:
         """
-        Reads all todo items in the database.
+        Creates a batch of todo items with the storage's bulk load, committed on its own.
+
+        On Postgres this is a single COPY, which skips statement parsing and
+        per-row parameter binding, so large imports are limited by the
+        database rather than by the driver.
+
+        Args:
+            todo_creates (list[TodoCreate]): The validated todo items to create.
+
+        Returns:
+            int: The number of created todo items.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            records = [
+                {
+                    "id": uuid4(),
+                    "title": todo_create.title,
+                    "description": todo_create.description,
+                    "priority": todo_create.priority,
+                    "due_date": todo_create.due_date,
+                }
+                for todo_create in todo_creates
+            ]
+            await self.storage.copy_todos(
+                self.db_session,
+                records,
+                encode_changes(TodoChangeOperation.CREATED, count=len(records)),
+            )
+
+            return len(records)
+        except (SQLAlchemyError, *self.storage.driver_errors) as e:
+            await self.db_session.rollback()
+            raise DatabaseException(detail=str(e))
+
+
+    async def read_todos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        todo_filter: TodoFilter | None = None,
+        sort: tuple[TodoSortKey, ...] = DEFAULT_TODO_SORT,
+        after: list[Any] | None = None,
+        columns: tuple[str, ...] = TODO_READ_FIELDS,
+    ) -> Sequence[Row]:
+        """
+        Reads all todo items in the database matching a filter, in a stable order.
+
+        Only the requested columns are selected, and rows are returned as plain
+        Core rows rather than Todo instances, so no ORM state is built per row.
 
         Args:
             skip (int): The value for how many todo items to skip before reading.
             limit (int): The value for how many todo item to display.
+            todo_filter (TodoFilter | None): The conditions the todo items must match.
+            sort (tuple[TodoSortKey, ...]): The sort keys; created_at and id are
+                appended as tiebreakers, see tiebreak_fields.
+            after (list[Any] | None): The sort key and tiebreak values to continue after.
+                When given, rows are located through the index instead of being
+                skipped, so every page costs the same.
+            columns (tuple[str, ...]): The columns to select, in order.
 
         Returns:
-            Todo: A list of all avaiable todo items or an empty list.
+            Sequence[Row]: The matching rows or an empty list.
 
         Raises:
             SQLAlchemyError: If there is an error during database operations.
+            InvalidCursorException: If after does not match the sort keys.
         """
         try:
-            query = select(Todo).offset(skip).limit(limit)
-            result = await self.db_session.execute(query)
-            todos = result.scalars().all()
+            clauses = _filter_clauses(todo_filter) if todo_filter is not None else []
+            ranges = _after_clauses(sort, after) if after is not None else []
+            if len(ranges) > 1:
+                # Each range is read in index order up to the limit, and the
+                # page is merged from the first rows of each.
+                selected = columns + tuple(
+                    column.name for column, _ in _sort_columns(sort)
+                    if column.name not in columns
+                )
+                branches = [
+                    select(
+                        select(*(Todo.__table__.c[column] for column in selected))
+                        .where(*clauses, after_range)
+                        .order_by(*_order_by_clauses(sort))
+                        .limit(limit)
+                        .subquery()
+                    )
+                    for after_range in ranges
+                ]
+                page = union_all(*branches).subquery()
+                query = (
+                    select(*(page.c[column] for column in columns))
+                    .order_by(*_order_by_clauses(sort, page))
+                    .limit(limit)
+                )
+            else:
+                query = (
+                    select(*(Todo.__table__.c[column] for column in columns))
+                    .where(*clauses, *ranges)
+                    .order_by(*_order_by_clauses(sort))
+                )
+                if not ranges:
+                    query = query.offset(skip)
+                query = query.limit(limit)
+            result = await self.read_session.execute(query)
+            rows = result.all()
             
-            return todos
+            return rows
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def stream_todos(
+        self, todo_filter: TodoFilter | None = None, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Streams todo items matching a filter through a server-side cursor.
+
+        Rows are returned as plain Core rows rather than Todo instances, and
+        only batch_size of them are fetched from the server at a time. The
+        session's transaction stays open until the stream is exhausted.
+
+        Args:
+            todo_filter (TodoFilter | None): The conditions the todo items must match.
+            batch_size (int): The number of rows fetched per round trip.
+
+        Yields:
+            Sequence[Row]: Batches of rows ordered by (created_at, id).
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = (
+                select(*Todo.__mapper__.columns)
+                .order_by(*_order_by_clauses(DEFAULT_TODO_SORT))
+                .execution_options(yield_per=batch_size)
+            )
+            if todo_filter is not None:
+                query = query.where(*_filter_clauses(todo_filter))
+            result = await self.db_session.stream(query)
+            async for partition in result.partitions():
+                yield partition
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def search_todos(
+        self, query: str, skip: int = 0, limit: int = 20
+    ) -> list[tuple[Todo, float, str, str | None]]:
+        """
+        Searches todo items by the words in their title and description.
+
+        Matches are ranked with title matches weighted above description
+        matches. On Postgres they are found through the GIN index on
+        search_vector and highlighted; other storages match substrings and
+        return the fields unmarked.
+
+        Args:
+            query (str): A web-style search query, e.g. 'groceries -milk "due friday"'.
+            skip (int): The value for how many matches to skip before reading.
+            limit (int): The value for how many matches to return.
+
+        Returns:
+            list: (todo, rank, title_highlight, description_highlight) tuples, best match first.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            page = self.storage.search_statement(query, skip, limit)
+            result = await self.db_session.execute(page)
+            hits = result.all()
+
+            return hits
         except SQLAlchemyError as e:
             raise DatabaseException(detail=str(e))
 
@@ -74,39 +437,98 @@ class TodoRepository:
             SQLAlchemyError: If there is an error during database operations.
         """
         try:
-            todo = await self.db_session.get(Todo, todo_id)
+            todo = await self.read_session.get(Todo, todo_id)
             
             return todo
         except SQLAlchemyError as e:
             raise DatabaseException(detail=str(e))
 
 
-    async def update_todo(self, todo_id: UUID, todo_update: TodoUpdate) -> Todo | None:
+    async def read_todos_by_ids(self, todo_ids: list[UUID]) -> Sequence[Todo]:
+        """
+        Reads the todo items with the given ids in a single query.
+
+        Args:
+            todo_ids (list[UUID]): The uuids of the todo items.
+
+        Returns:
+            Sequence[Todo]: The todo items found, in no particular order.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = select(Todo).where(self.storage.id_in(todo_ids))
+            result = await self.read_session.execute(query)
+            todos = result.scalars().all()
+
+            return todos
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def read_todo_version(self, todo_id: UUID) -> datetime | None:
+        """
+        Reads only the version of a todo item, without loading the rest of the row.
+
+        Args:
+            todo_id (UUID): The uuid for the todo item.
+
+        Returns:
+            datetime | None: The updated_at of the todo item, or None if it does not exist.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = select(Todo.updated_at).where(Todo.id == todo_id)
+            result = await self.read_session.execute(query)
+            updated_at = result.scalar_one_or_none()
+
+            return updated_at
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def update_todo(
+        self,
+        todo_id: UUID,
+        todo_update: TodoUpdate,
+        expected_versions: list[datetime] | None = None,
+    ) -> Todo | None:
         """
         Updates a todo item's one or more fields as specified.
 
         Args:
             todo_id (UUID): The uuid for the todo item.
             update_data (dict): The schema containing the fields that can be updated.
+            expected_versions (list[datetime] | None): If given, only update the
+                todo item while its updated_at is one of these values.
 
         Returns:
-            Todo: The specified todo item.
+            Todo: The specified todo item, or None if it does not exist or has changed.
 
         Raises:
             SQLAlchemyError: If there is an error during database operations.
         """
         try:
             update_data = todo_update.model_dump(exclude_unset=True)
+            query = update(Todo).where(Todo.id == todo_id)
+            if expected_versions is not None:
+                query = query.where(_version_clause(expected_versions))
             query = (
-                update(Todo)
-                .where(Todo.id == todo_id)
+                query
                 .values(**update_data)
                 .returning(Todo)
+                .execution_options(synchronize_session=False)
             )
 
             result = await self.db_session.execute(query)
             updated_todo = result.scalar_one_or_none()
-            await self.db_session.commit()
+            await self.storage.commit(
+                self.db_session,
+                encode_changes(TodoChangeOperation.UPDATED, ids=[todo_id]) if updated_todo else [],
+            )
 
             return updated_todo
         except SQLAlchemyError as e:
@@ -114,12 +536,16 @@ class TodoRepository:
             raise DatabaseException(detail=str(e))
 
 
-    async def delete_todo(self, todo_id: UUID) -> bool:
+    async def delete_todo(
+        self, todo_id: UUID, expected_versions: list[datetime] | None = None
+    ) -> bool:
         """
         Deletes a specified todo item in the database.
 
         Args:
             todo_id (UUID): The uuid for the todo item.
+            expected_versions (list[datetime] | None): If given, only delete the
+                todo item while its updated_at is one of these values.
 
         Returns:
             True, if the deletion was successful.
@@ -128,13 +554,313 @@ class TodoRepository:
             SQLAlchemyError: If there is an error during database operations.
         """
         try:
-            todo = await self.db_session.get(Todo, todo_id)
-            if not todo:
-                return False
-            await self.db_session.delete(todo)
+            query = delete(Todo).where(Todo.id == todo_id)
+            if expected_versions is not None:
+                query = query.where(_version_clause(expected_versions))
+            query = (
+                query
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
+            )
+
+            result = await self.db_session.execute(query)
+            deleted_id = result.scalar_one_or_none()
+            await self.storage.commit(
+                self.db_session,
+                encode_changes(TodoChangeOperation.DELETED, ids=[todo_id]) if deleted_id else [],
+            )
+
+            return deleted_id is not None
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            raise DatabaseException(detail=str(e))
+
+
+    async def count_todos(self, todo_filter: TodoFilter) -> int:
+        """
+        Counts the todo items matching a filter.
+
+        Args:
+            todo_filter (TodoFilter): The conditions the todo items must match.
+
+        Returns:
+            int: The number of matching todo items.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = (
+                select(func.count())
+                .select_from(Todo)
+                .where(*_filter_clauses(todo_filter))
+            )
+            result = await self.read_session.execute(query)
+            count = result.scalar_one()
+
+            return count
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def count_todos_from_stats(self, todo_filter: TodoFilter) -> int:
+        """
+        Counts the todo items matching a status and priority filter from the maintained counters.
+
+        Due date conditions of the filter are ignored; todo_status_counts has
+        no due dates.
+
+        Args:
+            todo_filter (TodoFilter): The conditions the todo items must match.
+
+        Returns:
+            int: The exact number of matching todo items.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = (
+                select(cast(func.coalesce(func.sum(TodoStatusCount.count), 0), BigInteger))
+                .where(*_stats_filter_clauses(todo_filter))
+            )
+            result = await self.read_session.execute(query)
+            count = result.scalar_one()
+
+            return count
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def estimate_todos(self, todo_filter: TodoFilter | None = None) -> int:
+        """
+        Estimates the number of todo items matching a filter from the query planner's statistics.
+
+        Args:
+            todo_filter (TodoFilter | None): The conditions the todo items must match.
+
+        Returns:
+            int: On Postgres the planner's row estimate, which is only as current
+            as the table's last ANALYZE; an exact count where there is no estimate.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = select(Todo.id)
+            if todo_filter is not None:
+                query = query.where(*_filter_clauses(todo_filter))
+            estimate = await self.storage.estimate_rows(self.read_session, query)
+
+            return estimate
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def read_todo_stats(self) -> tuple[Sequence[Row], int]:
+        """
+        Reads the maintained todo counters and the number of overdue todo items.
+
+        Items due on an earlier UTC day are summed from todo_open_due_counts;
+        only the items due earlier today are counted in todos itself.
+
+        Returns:
+            tuple[Sequence[Row], int]: The (status, priority, count) rows and the overdue count.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            counts = await self.db_session.execute(
+                select(TodoStatusCount.status, TodoStatusCount.priority, TodoStatusCount.count)
+            )
+            rows = counts.all()
+
+            today = self.storage.today()
+            overdue_days = (
+                select(func.coalesce(func.sum(TodoOpenDueCount.count), 0))
+                .where(TodoOpenDueCount.due_day < today)
+                .scalar_subquery()
+            )
+            overdue_today = (
+                select(func.count())
+                .select_from(Todo)
+                .where(
+                    Todo.due_date >= self.storage.start_of_today(),
+                    Todo.due_date < func.now(),
+                    Todo.status != TodoStatus.COMPLETED,
+                )
+                .scalar_subquery()
+            )
+            result = await self.db_session.execute(
+                select(cast(overdue_days + overdue_today, BigInteger))
+            )
+            overdue = result.scalar_one()
+
+            return rows, overdue
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def update_todos(self, todo_filter: TodoFilter, todo_update: TodoUpdate) -> int:
+        """
+        Updates every todo item matching a filter with a single UPDATE statement.
+
+        Args:
+            todo_filter (TodoFilter): The conditions the todo items must match.
+            todo_update (TodoUpdate): The schema containing the fields to set.
+
+        Returns:
+            int: The number of updated todo items.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            update_data = todo_update.model_dump(exclude_unset=True)
+            query = (
+                update(Todo)
+                .where(*_filter_clauses(todo_filter))
+                .values(**update_data)
+                .execution_options(synchronize_session=False)
+            )
+
+            result = await self.db_session.execute(query)
+            affected = result.rowcount
+            changes = encode_changes(
+                TodoChangeOperation.UPDATED, todo_filter=todo_filter, count=affected
+            ) if affected else []
+            await self.storage.commit(self.db_session, changes)
+
+            return affected
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            raise DatabaseException(detail=str(e))
+
+
+    async def delete_todos(self, todo_filter: TodoFilter) -> int:
+        """
+        Deletes every todo item matching a filter with a single DELETE statement.
+
+        Args:
+            todo_filter (TodoFilter): The conditions the todo items must match.
+
+        Returns:
+            int: The number of deleted todo items.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            query = (
+                delete(Todo)
+                .where(*_filter_clauses(todo_filter))
+                .execution_options(synchronize_session=False)
+            )
+
+            result = await self.db_session.execute(query)
+            affected = result.rowcount
+            changes = encode_changes(
+                TodoChangeOperation.DELETED, todo_filter=todo_filter, count=affected
+            ) if affected else []
+            await self.storage.commit(self.db_session, changes)
+
+            return affected
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            raise DatabaseException(detail=str(e))
+
+
+    async def read_changes(
+        self,
+        since: int | None,
+        after: tuple[int, UUID] | None,
+        limit: int,
+    ) -> tuple[int, list[tuple[int, UUID, Todo | None]]]:
+        """
+        Reads the todo items written, and the ids deleted, from a change position on.
+
+        Both todos and todo_tombstones are read along their (change_seq, id)
+        index, so the cost grows with the number of changes, not of rows.
+
+        Args:
+            since (int | None): The change_seq to read from, or None to read
+                every todo item and no deletes.
+            after (tuple[int, UUID] | None): Only read changes after this
+                (change_seq, id), to continue a previous page.
+            limit (int): The maximum number of changes to read.
+
+        Returns:
+            tuple[int, list[tuple[int, UUID, Todo | None]]]: The sync horizon,
+            read before the changes, and the (change_seq, id, todo) of each
+            change in change order, with todo None for a delete.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            result = await self.read_session.execute(select(self.storage.sync_horizon()))
+            horizon = result.scalar_one()
+
+            sources = [(Todo.__table__, False)]
+            if since is not None:
+                sources.append((TodoTombstone.__table__, True))
+            branches = []
+            for table, deleted in sources:
+                clauses = []
+                if since is not None:
+                    clauses.append(table.c.change_seq >= since)
+                if after is not None:
+                    clauses.append(
+                        tuple_(table.c.change_seq, table.c.id)
+                        > tuple_(*after, types=(BigInteger, Uuid))
+                    )
+                branch = (
+                    select(table.c.change_seq, table.c.id, literal(deleted).label("deleted"))
+                    .where(*clauses)
+                    .order_by(table.c.change_seq, table.c.id)
+                    .limit(limit)
+                    .subquery()
+                )
+                branches.append(select(branch))
+            changes = union_all(*branches).subquery()
+            query = (
+                select(changes.c.change_seq, changes.c.id, changes.c.deleted, Todo)
+                .outerjoin(Todo, and_(Todo.id == changes.c.id, not_(changes.c.deleted)))
+                .order_by(changes.c.change_seq, changes.c.id)
+                .limit(limit)
+            )
+            result = await self.read_session.execute(query)
+            rows = result.all()
+
+            return horizon, [
+                (change_seq, todo_id, None if deleted else todo)
+                for change_seq, todo_id, deleted, todo in rows
+            ]
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=str(e))
+
+
+    async def delete_tombstones(self, before: datetime) -> int:
+        """
+        Deletes the tombstones of todo items deleted before a point in time.
+
+        Args:
+            before (datetime): Tombstones older than this are deleted.
+
+        Returns:
+            int: The number of deleted tombstones.
+
+        Raises:
+            SQLAlchemyError: If there is an error during database operations.
+        """
+        try:
+            result = await self.db_session.execute(
+                delete(TodoTombstone).where(TodoTombstone.deleted_at < before)
+            )
             await self.db_session.commit()
-            
-            return True
+
+            return result.rowcount
         except SQLAlchemyError as e:
             await self.db_session.rollback()
             raise DatabaseException(detail=str(e))
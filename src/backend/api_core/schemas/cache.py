@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """Schema for reading the counters of a cache backend"""
+    backend: str
+    hits: int
+    misses: int
+    entries: int
+    generation: int = Field(
+        description="Write generation; bumped on every write to invalidate cached reads"
+    )
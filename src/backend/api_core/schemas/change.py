@@ -0,0 +1,31 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .todo import TodoFilter
+
+
+class TodoChangeOperation(str, Enum):
+    """
+    Represents the kinds of writes the change feed reports.
+    """
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class TodoChangeEvent(BaseModel):
+    """Schema for one event of the todo change feed"""
+    id: str = Field(description="Event id; pass it as Last-Event-ID or after to resume after this event")
+    operation: TodoChangeOperation
+    ids: list[UUID] | None = Field(
+        default=None,
+        description="The changed todo items; absent for bulk writes by filter and for imports",
+    )
+    filter: TodoFilter | None = Field(
+        default=None, description="The filter of a bulk update or delete"
+    )
+    count: int = Field(description="Number of todo items changed")
+    at: datetime = Field(description="When the change was published")
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStats(BaseModel):
+    """Schema for reading the state and counters of the database connection pool"""
+    size: int = Field(description="Configured number of persistent connections")
+    checked_in: int = Field(description="Idle connections in the pool")
+    checked_out: int = Field(description="Connections currently in use")
+    overflow: int = Field(description="Connections opened beyond size; negative while the pool is filling up")
+    checkouts: int = Field(description="Checkouts since the pool was created")
+    timeouts: int = Field(description="Checkouts that gave up after the pool timeout")
+    wait_seconds_total: float = Field(description="Total time spent waiting for an idle connection or a free slot")
+    wait_seconds_max: float = Field(description="Longest single wait for an idle connection or a free slot")
+    connects: int = Field(description="Connections opened, including replacements of recycled ones")
+    connect_seconds_total: float = Field(description="Total time spent opening connections")
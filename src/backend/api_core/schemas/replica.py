@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class ReplicaStatus(BaseModel):
+    """Schema for reading the replication lag of a read replica"""
+    host: str = Field(description="Host of the replica")
+    port: int | None = Field(description="Port of the replica")
+    lag_seconds: float | None = Field(description="Replication lag at the last check; null if the replica could not be reached")
+    serving_reads: bool = Field(description="Whether reads are routed to the replica, i.e. its lag is within REPLICA_MAX_LAG_SECONDS")
+    error: str | None = Field(description="Error of the last lag check, if it failed")
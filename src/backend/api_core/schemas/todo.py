@@ -1,6 +1,9 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from enum import Enum
+from typing import Any, NamedTuple
+from pydantic import BaseModel, Field, ConfigDict, create_model
+from pydantic.fields import FieldInfo
 from ..models.todo import TodoStatus
 
 
@@ -41,6 +44,39 @@ class TodoRead(TodoBase):
     updated_at: datetime
 
 
+TODO_READ_FIELDS = tuple(TodoRead.model_fields)
+
+
+def _omit_defaults(schema: dict[str, Any]) -> None:
+    for prop in schema.get("properties", {}).values():
+        prop.pop("default", None)
+
+
+# Same fields and constraints as TodoRead, none of them required: list
+# responses only carry the fields named in the `fields` query parameter.
+TodoPartialRead = create_model(
+    "TodoPartialRead",
+    __doc__="Schema for reading the requested fields of a todo item",
+    __config__=ConfigDict(json_schema_extra=_omit_defaults),
+    **{
+        name: (field.annotation, FieldInfo.merge_field_infos(field, default=None))
+        for name, field in TodoRead.model_fields.items()
+    },
+)
+
+
+class TodoSearchHit(TodoRead):
+    """
+    Schema for a full-text search result, with its rank and highlighted fields.
+    """
+    rank: float
+    title_highlight: str = Field(description="Title with matching words wrapped in <mark> tags")
+    description_highlight: str | None = Field(
+        default=None,
+        description="Fragments of the description with matching words wrapped in <mark> tags",
+    )
+
+
 class TodoUpdate(BaseModel):
     """Schema for updating a todo item"""
     model_config = ConfigDict(from_attributes=True)
@@ -57,6 +93,118 @@ class TodoUpdate(BaseModel):
     )
     priority: int | None = Field(
         default=None,
-        description="Priority of the todo item (0: None, 1-5: higher values indicate higher priority",
+        ge=0,
+        le=5,
+        description="Priority of the todo item (0: None, 1-5: higher values indicate higher priority)",
     )
     due_date: datetime | None = None
+
+
+class TodoBulkItemError(BaseModel):
+    """Validation errors for a single item of a bulk request"""
+    index: int = Field(description="Position of the rejected item in the request body")
+    errors: list[dict[str, Any]]
+
+
+class TodoBulkCreateResult(BaseModel):
+    """Schema for the outcome of a bulk create request"""
+    created_ids: list[UUID] = Field(
+        description="Ids of the created todo items, in request order"
+    )
+    errors: list[TodoBulkItemError] = Field(default_factory=list)
+
+
+class TodoImportRejection(BaseModel):
+    """Validation errors for a single record of an import file"""
+    line: int = Field(description="Line number the rejected record starts on")
+    errors: list[dict[str, Any]]
+
+
+class TodoImportResult(BaseModel):
+    """Schema for the outcome of an import request"""
+    imported: int
+    rejected_count: int
+    rejected: list[TodoImportRejection] = Field(
+        default_factory=list,
+        description="The first rejected records; see rejected_count for the total",
+    )
+
+
+class TodoFilter(BaseModel):
+    """Schema for selecting todo items by their fields"""
+    status: TodoStatus | None = None
+    priority_min: int | None = Field(default=None, ge=0, le=5)
+    priority_max: int | None = Field(default=None, ge=0, le=5)
+    due_before: datetime | None = None
+    due_after: datetime | None = None
+
+    def is_empty(self) -> bool:
+        """Returns True if no filter field is set."""
+        return not self.model_dump(exclude_none=True)
+
+
+class ExportFormat(str, Enum):
+    """
+    Represents the file formats todo items can be exported and imported as.
+    """
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TodoCountMode(str, Enum):
+    """
+    Represents how a total count of todo items is computed.
+    """
+    EXACT = "exact"
+    APPROXIMATE = "approximate"
+
+
+class TodoSortKey(NamedTuple):
+    """A single field of a list sort expression"""
+    field: str
+    descending: bool = False
+
+
+TODO_SORT_FIELDS = ("priority", "due_date", "created_at", "updated_at", "title", "status")
+DEFAULT_TODO_SORT = (TodoSortKey("created_at"),)
+
+
+class TodoBulkWriteResult(BaseModel):
+    """Schema for the outcome of a bulk update or delete request"""
+    affected: int = Field(
+        description="Number of todo items changed, or that would change on a dry run"
+    )
+    dry_run: bool = False
+
+
+class TodoStats(BaseModel):
+    """Schema for the aggregate counts of todo items"""
+    total: int = Field(description="Number of todo items, exact or estimated as requested")
+    count_mode: TodoCountMode
+    by_status: dict[TodoStatus, int]
+    by_priority: dict[int, int]
+    overdue: int = Field(description="Items that are not completed and past their due date")
+
+
+TODO_BATCH_GET_MAX_IDS = 1000
+
+
+class TodoBatchGet(BaseModel):
+    """Schema for the ids of a batch read"""
+    ids: list[UUID] = Field(min_length=1, max_length=TODO_BATCH_GET_MAX_IDS)
+
+
+class TodoBatchGetResult(BaseModel):
+    """Schema for the outcome of a batch read"""
+    items: list[TodoRead] = Field(description="The todo items found, in request order")
+    not_found: list[UUID] = Field(description="Requested ids with no todo item, in request order")
+
+
+class TodoSyncResult(BaseModel):
+    """Schema for one page of a delta sync"""
+    items: list[TodoRead] = Field(
+        description="Todo items created or updated since the token, in the order they were written"
+    )
+    deleted: list[UUID] = Field(description="Ids of todo items deleted since the token")
+    next_token: str = Field(description="Pass as since on the next sync")
+    has_more: bool = Field(description="Whether more changes are waiting; if so, sync again right away")
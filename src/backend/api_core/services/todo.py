@@ -1,15 +1,67 @@
+import csv
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Sequence
 from uuid import UUID
 
-from ..models.todo import Todo
+from pydantic import ValidationError
+from sqlalchemy import Row
+
+from ..models.todo import Todo, TodoStatus
 from ..repos.todo import TodoRepository
-from ..schemas.todo import TodoCreate, TodoUpdate
+from ..schemas.todo import (
+    TodoCreate,
+    TodoRead,
+    TodoUpdate,
+    TodoBulkCreateResult,
+    TodoBulkItemError,
+    TodoBulkWriteResult,
+    TodoFilter,
+    ExportFormat,
+    TodoImportRejection,
+    TodoImportResult,
+    TodoSearchHit,
+    TodoSortKey,
+    DEFAULT_TODO_SORT,
+    TODO_READ_FIELDS,
+    TodoCountMode,
+    TodoStats,
+    TodoSyncResult,
+    TodoBatchGetResult,
+)
 from ..utils.custom_logger import CustomLogger
-from ..exceptions.custom import TodoNotFoundException
+from ..utils.cursor import encode_cursor, decode_cursor
+from ..utils.sorting import format_sort, tiebreak_fields
+from ..utils.export import ndjson_lines, csv_lines
+from ..utils.ingest import iter_lines, iter_csv_records
+from ..utils.etag import todo_etag, parse_if_match
+from ..utils.sync_token import SyncToken, encode_sync_token, decode_sync_token
+from ..utils.single_flight import SingleFlight, todo_reads
+from ..exceptions.custom import (
+    TodoNotFoundException,
+    FilterRequiredException,
+    EmptyUpdateException,
+    InvalidImportException,
+    PreconditionFailedException,
+    SyncTokenExpiredException,
+)
+
+# Tombstones outlive the retention window by this much, for deletes whose
+# transaction started before a sync pass but committed after it.
+TOMBSTONE_GRACE = timedelta(hours=1)
 
 class TodoService:
-    def __init__(self, todo_repository: TodoRepository):
+    def __init__(self, todo_repository: TodoRepository, reads: SingleFlight = todo_reads):
         self.logger = CustomLogger(__name__).logger
         self.todo_repository = todo_repository
+        self.reads = reads
+
+    def _read_key(self, *parts: Any) -> tuple:
+        """Keys a coalesced read on its arguments and on whether a replica may serve it."""
+        return (self.todo_repository.unit_of_work.reads_primary, *parts)
+
+    async def release(self) -> None:
+        """Returns the request's connections to the pool; call it after the last query."""
+        await self.todo_repository.unit_of_work.release()
 
     async def create_todo(self, todo_create: TodoCreate) -> Todo:
         """Creates a new todo item.
@@ -21,28 +73,431 @@ class TodoService:
             The created todo item.
         """
         created_todo = await self.todo_repository.create_todo(todo_create)
-        self.logger.info(f"Todo item created with id: {created_todo.id}")
+        self.logger.info("Todo item created with id: %s", created_todo.id)
+        self.reads.forget()
         return created_todo
 
 
-    async def read_todos(self, skip: int = 0, limit: int = 100) -> list[Todo]:
-        """Retrieves a list of todo items.
+    async def create_todos(
+        self, items: list[dict[str, Any]], chunk_size: int
+    ) -> TodoBulkCreateResult:
+        """Creates many todo items at once.
+
+        Every item is validated before anything is written. Valid items are
+        inserted in one transaction, invalid ones are reported by position.
 
         Args:
-            skip: The number of items to skip.
+            items: Raw todo payloads to validate against TodoCreate.
+            chunk_size: The maximum number of rows per INSERT statement.
+
+        Returns:
+            The created ids and the per-item validation errors.
+        """
+        todo_creates = []
+        errors = []
+        for index, item in enumerate(items):
+            try:
+                todo_creates.append(TodoCreate.model_validate(item))
+            except ValidationError as e:
+                errors.append(
+                    TodoBulkItemError(
+                        index=index,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+
+        created_ids = []
+        if todo_creates:
+            created_ids = await self.todo_repository.create_todos(todo_creates, chunk_size)
+            self.reads.forget()
+        self.logger.info(
+            "Bulk created %d todo items, rejected %d", len(created_ids), len(errors)
+        )
+        return TodoBulkCreateResult(created_ids=created_ids, errors=errors)
+
+
+    async def read_todos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        todo_filter: TodoFilter | None = None,
+        sort: tuple[TodoSortKey, ...] = DEFAULT_TODO_SORT,
+        fields: tuple[str, ...] = TODO_READ_FIELDS,
+    ) -> tuple[Sequence[Row], str | None]:
+        """Retrieves a page of todo items as rows of the requested fields.
+
+        Identical reads that run at the same time share one query.
+
+        Args:
+            skip: The number of items to skip. Ignored when a cursor is given.
             limit: The maximum number of items to return.
+            cursor: An opaque cursor returned with a previous page.
+            todo_filter: The conditions the todo items must match.
+            sort: The sort keys to order the todo items by.
+            fields: The fields to return. They come first in each row, followed
+                by any sort and tiebreak fields needed for the next cursor, and
+                by id and updated_at, which the page's ETag is built from.
+
+        Returns:
+            A list of rows and the cursor for the next page, or None
+            if this is the last page.
+        """
+        sort_expression = format_sort(sort)
+        after = decode_cursor(cursor, sort_expression) if cursor else None
+        cursor_fields = [key.field for key in sort] + list(tiebreak_fields(sort))
+        columns = fields + tuple(
+            field for field in dict.fromkeys([*cursor_fields, "updated_at"]) if field not in fields
+        )
+        # Fetch one extra row to learn whether another page exists.
+        filter_key = todo_filter.model_dump_json(exclude_none=True) if todo_filter else ""
+        todos = await self.reads.do(
+            self._read_key("todos", skip, limit, filter_key, sort, after and tuple(after), columns),
+            lambda: self.todo_repository.read_todos(
+                skip, limit + 1, todo_filter, sort, after, columns
+            ),
+        )
+        next_cursor = None
+        if len(todos) > limit:
+            todos = todos[:limit]
+            last = todos[-1]
+            values = [getattr(last, field) for field in cursor_fields]
+            next_cursor = encode_cursor(sort_expression, values)
+        self.logger.info("Found %d todo items", len(todos))
+        return todos, next_cursor
+
+
+    async def export_todos(
+        self,
+        export_format: ExportFormat,
+        todo_filter: TodoFilter | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """Exports todo items as a stream of encoded chunks.
+
+        Each chunk holds one batch of rows, so memory use stays fixed however
+        many rows are exported. The next batch is only fetched once the caller
+        asks for the next chunk.
+
+        Args:
+            export_format: The file format to encode the rows as.
+            todo_filter: The conditions the todo items must match.
+            batch_size: The number of rows per chunk.
+
+        Yields:
+            The encoded rows, batch by batch.
+        """
+        header = [column.name for column in Todo.__mapper__.columns]
+        exported = 0
+        if export_format is ExportFormat.CSV:
+            yield csv_lines([], header)
+        async for rows in self.todo_repository.stream_todos(todo_filter, batch_size):
+            exported += len(rows)
+            if export_format is ExportFormat.CSV:
+                yield csv_lines(rows)
+            else:
+                yield ndjson_lines(rows)
+        self.logger.info("Exported %d todo items as %s", exported, export_format.value)
+
+
+    async def import_todos(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: ExportFormat,
+        batch_size: int = 5000,
+        max_reported_rejections: int = 1000,
+        max_line_bytes: int = 65536,
+    ) -> TodoImportResult:
+        """Imports todo items from a streamed NDJSON or CSV file.
+
+        Records are parsed and validated as they arrive and written with COPY
+        in batches of batch_size, so memory use does not grow with the file.
+        Each batch is committed on its own; rejected records are skipped,
+        including lines and CSV records longer than max_line_bytes.
+
+        Args:
+            chunks: The raw file content, chunk by chunk.
+            import_format: The format of the file. CSV files need a header row.
+            batch_size: The number of todo items per COPY.
+            max_reported_rejections: The number of rejected records to report in detail.
+            max_line_bytes: The longest NDJSON line or CSV record accepted.
+
+        Returns:
+            The number of imported and rejected records, with the first rejections.
+
+        Raises:
+            InvalidImportException: If the CSV header has no title column.
+        """
+        if import_format is ExportFormat.CSV:
+            records = self._parse_csv_records(chunks, max_line_bytes)
+        else:
+            records = self._parse_ndjson_records(chunks, max_line_bytes)
+
+        batch = []
+        imported = 0
+        rejected_count = 0
+        rejected = []
+        async for line, todo_create, errors in records:
+            if errors:
+                rejected_count += 1
+                if len(rejected) < max_reported_rejections:
+                    rejected.append(TodoImportRejection(line=line, errors=errors))
+                continue
+            batch.append(todo_create)
+            if len(batch) >= batch_size:
+                imported += await self._copy_todos(batch)
+                batch = []
+        if batch:
+            imported += await self._copy_todos(batch)
+
+        self.logger.info("Imported %d todo items, rejected %d", imported, rejected_count)
+        return TodoImportResult(
+            imported=imported, rejected_count=rejected_count, rejected=rejected
+        )
+
+
+    async def _copy_todos(self, todo_creates: list[TodoCreate]) -> int:
+        """Writes one import batch, which is published as a change without ids."""
+        copied = await self.todo_repository.copy_todos(todo_creates)
+        self.reads.forget()
+        return copied
+
+
+    @staticmethod
+    async def _parse_ndjson_records(
+        chunks: AsyncIterator[bytes], max_line_bytes: int
+    ) -> AsyncIterator[tuple[int, TodoCreate | None, list[dict[str, Any]]]]:
+        """Validates each non-blank line of an NDJSON stream against TodoCreate."""
+        async for line_number, line in iter_lines(chunks, max_line_bytes):
+            if line is None:
+                yield line_number, None, [{
+                    "type": "line_too_long",
+                    "msg": f"Line is longer than {max_line_bytes} bytes",
+                }]
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield line_number, TodoCreate.model_validate_json(line), []
+            except ValidationError as e:
+                yield line_number, None, e.errors(
+                    include_url=False, include_context=False, include_input=False
+                )
+
+
+    @staticmethod
+    async def _parse_csv_records(
+        chunks: AsyncIterator[bytes], max_record_bytes: int
+    ) -> AsyncIterator[tuple[int, TodoCreate | None, list[dict[str, Any]]]]:
+        """Validates each record of a CSV stream against TodoCreate, keyed by its header."""
+        header = None
+        async for line_number, record in iter_csv_records(chunks, max_record_bytes):
+            if record is None:
+                yield line_number, None, [{
+                    "type": "csv_record_too_long",
+                    "msg": f"Record is longer than {max_record_bytes} bytes",
+                }]
+                continue
+            if not record.strip():
+                continue
+            try:
+                fields = next(csv.reader([record.decode("utf-8")]))
+            except (UnicodeDecodeError, csv.Error) as e:
+                yield line_number, None, [{"type": "csv_invalid", "msg": str(e)}]
+                continue
+            if header is None:
+                header = [name.strip() for name in fields]
+                if "title" not in header:
+                    raise InvalidImportException(detail="CSV header must contain a title column")
+                continue
+            if len(fields) != len(header):
+                yield line_number, None, [{
+                    "type": "csv_field_count",
+                    "msg": f"Expected {len(header)} fields, got {len(fields)}",
+                }]
+                continue
+            # Empty cells fall back to the schema defaults.
+            data = {name: value for name, value in zip(header, fields) if value != ""}
+            try:
+                yield line_number, TodoCreate.model_validate(data), []
+            except ValidationError as e:
+                yield line_number, None, e.errors(
+                    include_url=False, include_context=False, include_input=False
+                )
+
+
+    async def read_todo_stats(
+        self, count_mode: TodoCountMode = TodoCountMode.EXACT
+    ) -> TodoStats:
+        """Retrieves the counts of todo items by status, by priority and overdue.
+
+        Args:
+            count_mode: Whether the total is summed from the counters or
+                estimated from planner statistics.
+
+        Returns:
+            The aggregate counts.
+        """
+        rows, overdue = await self.todo_repository.read_todo_stats()
+        by_status = {status: 0 for status in TodoStatus}
+        by_priority = {priority: 0 for priority in range(6)}
+        for status, priority, count in rows:
+            by_status[TodoStatus(status)] += count
+            by_priority[priority] = by_priority.get(priority, 0) + count
+        if count_mode == TodoCountMode.EXACT:
+            total = sum(by_status.values())
+        else:
+            total = await self.todo_repository.estimate_todos()
+        return TodoStats(
+            total=total,
+            count_mode=count_mode,
+            by_status=by_status,
+            by_priority=by_priority,
+            overdue=overdue,
+        )
+
+
+    async def count_todos_total(
+        self, todo_filter: TodoFilter, count_mode: TodoCountMode
+    ) -> int:
+        """Counts the todo items matching a filter for a list response.
+
+        Filters on status and priority alone are answered exactly from the
+        maintained counters whatever the mode. Due date filters are counted
+        with COUNT(*) in exact mode, or estimated by the query planner.
+
+        Args:
+            todo_filter: The conditions the todo items must match.
+            count_mode: How to count when the counters cannot answer.
+
+        Returns:
+            The number of matching todo items.
+        """
+        if todo_filter.due_before is None and todo_filter.due_after is None:
+            return await self.todo_repository.count_todos_from_stats(todo_filter)
+        if count_mode == TodoCountMode.EXACT:
+            return await self.todo_repository.count_todos(todo_filter)
+        return await self.todo_repository.estimate_todos(todo_filter)
+
+
+    async def search_todos(
+        self, query: str, skip: int = 0, limit: int = 20
+    ) -> list[TodoSearchHit]:
+        """Searches todo items by title and description.
+
+        Args:
+            query: The web-style search query.
+            skip: The number of matches to skip.
+            limit: The maximum number of matches to return.
+
+        Returns:
+            The matching todo items, best match first, with highlights.
+        """
+        rows = await self.todo_repository.search_todos(query, skip, limit)
+        hits = [
+            TodoSearchHit(
+                **{field: getattr(todo, field) for field in TodoRead.model_fields},
+                rank=rank,
+                title_highlight=title_highlight,
+                description_highlight=description_highlight,
+            )
+            for todo, rank, title_highlight, description_highlight in rows
+        ]
+        self.logger.info("Found %d todo items matching search", len(hits))
+        return hits
+
+
+    async def sync_todos(
+        self, since: str | None, limit: int, retention: timedelta
+    ) -> TodoSyncResult:
+        """Retrieves the todo items changed and deleted since a sync token.
+
+        Without a token every todo item is returned. Changes come in the order
+        they were written, limit at a time; has_more asks the client to call
+        again with next_token before the pass is complete.
+
+        Args:
+            since: The next_token of an earlier sync, or None for a full sync.
+            limit: The maximum number of changes to return.
+            retention: How long tombstones are kept, and so how long a token stays valid.
 
         Returns:
-            A list of todo items.
+            The changed items, the deleted ids and the token to continue from.
+
+        Raises:
+            InvalidSyncTokenException: If the token is malformed.
+            SyncTokenExpiredException: If deletes since the token may have been compacted.
         """
-        todos = await self.todo_repository.read_todos(skip, limit)
-        self.logger.info(f"Found {len(todos)} todo items")
-        return todos
+        now = datetime.now(timezone.utc)
+        if since is None:
+            token = SyncToken(since=None, horizon=None, after=None, started_at=now)
+        else:
+            token = decode_sync_token(since)
+            if token.started_at < now - retention:
+                raise SyncTokenExpiredException()
+
+        horizon, changes = await self.todo_repository.read_changes(
+            token.since, token.after, limit + 1
+        )
+        if token.horizon is None:
+            token = token._replace(horizon=horizon, started_at=now)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if has_more:
+            change_seq, todo_id, _ = changes[-1]
+            next_token = token._replace(after=(change_seq, todo_id))
+        else:
+            next_token = SyncToken(
+                since=token.horizon, horizon=None, after=None, started_at=token.started_at
+            )
+
+        items = [todo for _, _, todo in changes if todo is not None]
+        deleted = [todo_id for _, todo_id, todo in changes if todo is None]
+        self.logger.info(
+            "Synced %d changed and %d deleted todo items (more: %s)",
+            len(items), len(deleted), has_more,
+        )
+        return TodoSyncResult(
+            items=items,
+            deleted=deleted,
+            next_token=encode_sync_token(next_token),
+            has_more=has_more,
+        )
+
+
+    async def compact_tombstones(self, retention: timedelta) -> int:
+        """Deletes the tombstones no valid sync token can still need.
 
+        Args:
+            retention: How long tombstones are kept.
+
+        Returns:
+            The number of deleted tombstones.
+        """
+        before = datetime.now(timezone.utc) - retention - TOMBSTONE_GRACE
+        deleted = await self.todo_repository.delete_tombstones(before)
+        self.logger.info("Compacted %d tombstones deleted before %s", deleted, before.isoformat())
+        return deleted
+
+
+    async def warm_up(self) -> None:
+        """Runs the most frequent reads once, with the defaults of their routes.
+
+        Run at startup, so their statements are compiled, and prepared on the
+        connection, before the first request needs them.
+        """
+        await self.read_todos(todo_filter=TodoFilter())
+        await self.todo_repository.read_todo(UUID(int=0))
+        await self.todo_repository.read_todo_version(UUID(int=0))
 
-    async def read_todo(self, todo_id: UUID) -> Todo:
+
+    async def read_todo(self, todo_id: UUID) -> TodoRead:
         """Retrieves a specific todo item by ID.
 
+        Identical reads that run at the same time share one query. They share
+        a TodoRead snapshot of its result rather than the ORM object, which
+        belongs to the session of the request that ran it.
+
         Args:
             todo_id: The ID of the todo item to retrieve.
 
@@ -52,40 +507,178 @@ class TodoService:
         Raises:
             HTTPException: If the todo item is not found.
         """
-        todo = await self.todo_repository.read_todo(todo_id)
+        todo = await self.reads.do(self._read_key("todo", todo_id), lambda: self._read_todo(todo_id))
         if not todo:
             raise TodoNotFoundException()
-        self.logger.info(f"Todo item found with id: {todo_id}")
+        self.logger.info("Todo item found with id: %s", todo_id)
         return todo
 
 
-    async def update_todo(self, todo_id: UUID, todo_update: TodoUpdate) -> Todo:
+    async def _read_todo(self, todo_id: UUID) -> TodoRead | None:
+        todo = await self.todo_repository.read_todo(todo_id)
+        return None if todo is None else TodoRead.model_validate(todo)
+
+
+    async def read_todos_by_ids(self, todo_ids: list[UUID]) -> TodoBatchGetResult:
+        """Retrieves many todo items by ID with one query.
+
+        Args:
+            todo_ids: The IDs of the todo items; repeated IDs are read once.
+
+        Returns:
+            The todo items found and the IDs that were not, both in request order.
+        """
+        todo_ids = list(dict.fromkeys(todo_ids))
+        todos = {
+            todo.id: todo for todo in await self.todo_repository.read_todos_by_ids(todo_ids)
+        }
+        items = [todos[todo_id] for todo_id in todo_ids if todo_id in todos]
+        not_found = [todo_id for todo_id in todo_ids if todo_id not in todos]
+        self.logger.info("Found %d of %d todo items by id", len(items), len(todo_ids))
+        return TodoBatchGetResult(items=items, not_found=not_found)
+
+
+    async def read_todo_etag(self, todo_id: UUID) -> str:
+        """Retrieves the ETag of a todo item without loading the item itself.
+
+        Args:
+            todo_id: The ID of the todo item.
+
+        Returns:
+            The strong ETag of the current version.
+
+        Raises:
+            TodoNotFoundException: If the todo item is not found.
+        """
+        updated_at = await self.todo_repository.read_todo_version(todo_id)
+        if updated_at is None:
+            raise TodoNotFoundException()
+        return todo_etag(todo_id, updated_at)
+
+
+    async def _expected_versions(
+        self, todo_id: UUID, if_match: str | None
+    ) -> list[datetime] | None:
+        """Turns an If-Match header into the versions a conditional write accepts."""
+        if if_match is None:
+            return None
+        expected_versions = parse_if_match(if_match, todo_id)
+        if expected_versions == []:
+            await self._raise_write_conflict(todo_id)
+        return expected_versions
+
+
+    async def _raise_write_conflict(self, todo_id: UUID) -> None:
+        """Raises 404 if the todo item is gone, otherwise 412 for a stale If-Match."""
+        if await self.todo_repository.read_todo_version(todo_id) is None:
+            raise TodoNotFoundException()
+        raise PreconditionFailedException()
+
+
+    async def update_todo(
+        self, todo_id: UUID, todo_update: TodoUpdate, if_match: str | None = None
+    ) -> Todo:
         """Updates a specific todo item.
 
         Args:
             todo_id: The ID of the todo item to update.
             todo_update: The data to update the todo item with.
+            if_match: An If-Match header; the update only applies to a matching version.
 
         Returns:
             The updated todo item.
+
+        Raises:
+            TodoNotFoundException: If the todo item is not found.
+            PreconditionFailedException: If the todo item changed since the If-Match version.
         """
-        updated_todo = await self.todo_repository.update_todo(todo_id, todo_update)
+        expected_versions = await self._expected_versions(todo_id, if_match)
+        updated_todo = await self.todo_repository.update_todo(
+            todo_id, todo_update, expected_versions
+        )
         if not updated_todo:
+            if expected_versions is not None:
+                await self._raise_write_conflict(todo_id)
             raise TodoNotFoundException()
-        self.logger.info(f"Todo item updated with id: {updated_todo.id}")
+        self.logger.info("Todo item updated with id: %s", updated_todo.id)
+        self.reads.forget()
         return updated_todo
 
 
-    async def delete_todo(self, todo_id: UUID) -> None:
+    async def delete_todo(self, todo_id: UUID, if_match: str | None = None) -> None:
         """Deletes a specific todo item.
 
         Args:
             todo_id: The ID of the todo item to delete.
+            if_match: An If-Match header; the delete only applies to a matching version.
 
         Raises:
-            HTTPException: If the todo item is not found.
+            TodoNotFoundException: If the todo item is not found.
+            PreconditionFailedException: If the todo item changed since the If-Match version.
         """
-        delete_success = await self.todo_repository.delete_todo(todo_id)
+        expected_versions = await self._expected_versions(todo_id, if_match)
+        delete_success = await self.todo_repository.delete_todo(todo_id, expected_versions)
         if not delete_success:
+            if expected_versions is not None:
+                await self._raise_write_conflict(todo_id)
             raise TodoNotFoundException()
-        self.logger.info(f"Todo item deleted with id: {todo_id}")
+        self.logger.info("Todo item deleted with id: %s", todo_id)
+        self.reads.forget()
+
+
+    async def update_todos(
+        self, todo_filter: TodoFilter, todo_update: TodoUpdate, dry_run: bool = False
+    ) -> TodoBulkWriteResult:
+        """Updates every todo item matching a filter.
+
+        Args:
+            todo_filter: The conditions the todo items must match.
+            todo_update: The data to update the todo items with.
+            dry_run: If True, only count the todo items that would change.
+
+        Returns:
+            The number of affected todo items.
+
+        Raises:
+            FilterRequiredException: If the filter is empty.
+            EmptyUpdateException: If the update does not set any field.
+        """
+        if todo_filter.is_empty():
+            raise FilterRequiredException()
+        if not todo_update.model_fields_set:
+            raise EmptyUpdateException()
+        if dry_run:
+            affected = await self.todo_repository.count_todos(todo_filter)
+        else:
+            affected = await self.todo_repository.update_todos(todo_filter, todo_update)
+            if affected:
+                self.reads.forget()
+        self.logger.info("Bulk update affected %d todo items (dry run: %s)", affected, dry_run)
+        return TodoBulkWriteResult(affected=affected, dry_run=dry_run)
+
+
+    async def delete_todos(
+        self, todo_filter: TodoFilter, dry_run: bool = False
+    ) -> TodoBulkWriteResult:
+        """Deletes every todo item matching a filter.
+
+        Args:
+            todo_filter: The conditions the todo items must match.
+            dry_run: If True, only count the todo items that would be deleted.
+
+        Returns:
+            The number of affected todo items.
+
+        Raises:
+            FilterRequiredException: If the filter is empty.
+        """
+        if todo_filter.is_empty():
+            raise FilterRequiredException()
+        if dry_run:
+            affected = await self.todo_repository.count_todos(todo_filter)
+        else:
+            affected = await self.todo_repository.delete_todos(todo_filter)
+            if affected:
+                self.reads.forget()
+        self.logger.info("Bulk delete affected %d todo items (dry run: %s)", affected, dry_run)
+        return TodoBulkWriteResult(affected=affected, dry_run=dry_run)
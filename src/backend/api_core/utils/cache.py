@@ -0,0 +1,121 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from ..config import settings
+from ..schemas.cache import CacheStats
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the read cache used by CachedTodoRepository.
+
+    Cached reads are keyed on the current write generation, so bumping the
+    generation invalidates every entry at once without tracking which keys a
+    write affects. A shared backend only has to share entries and the counter.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Returns the cached value for key, or None on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Stores value under key."""
+
+    @abstractmethod
+    async def get_generation(self) -> int:
+        """Returns the current write generation."""
+
+    @abstractmethod
+    async def bump_generation(self) -> int:
+        """Invalidates all cached reads and returns the new write generation."""
+
+    @abstractmethod
+    async def stats(self) -> CacheStats:
+        """Returns the hit and miss counters of the backend."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    A bounded, process-local LRU cache whose entries expire after a TTL.
+
+    Each worker process holds its own copy, so a write is only seen immediately
+    by the worker that made it; other workers serve stale reads for at most
+    ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Args:
+            max_entries (int): The number of entries kept before evicting the least recently used.
+            ttl_seconds (float): How long an entry stays valid after it is stored.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_generation(self) -> int:
+        return self._generation
+
+    async def bump_generation(self) -> int:
+        self._generation += 1
+        # Entries from older generations can never be read again.
+        self._entries.clear()
+        return self._generation
+
+    async def stats(self) -> CacheStats:
+        return CacheStats(
+            backend="memory",
+            hits=self._hits,
+            misses=self._misses,
+            entries=len(self._entries),
+            generation=self._generation,
+        )
+
+
+def create_cache_backend() -> CacheBackend | None:
+    """
+    Builds the cache backend selected by settings.CACHE_BACKEND.
+
+    Returns:
+        CacheBackend | None: The backend, or None if caching is disabled.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    if settings.CACHE_BACKEND == "none":
+        return None
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+        )
+    raise ValueError(f"Unknown cache backend: {settings.CACHE_BACKEND}")
+
+
+todo_cache = create_cache_backend()
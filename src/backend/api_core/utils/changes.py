@@ -0,0 +1,251 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import NamedTuple
+from uuid import UUID, uuid4
+
+import asyncpg
+import orjson
+from sqlalchemy.engine import make_url
+
+from .custom_logger import CustomLogger
+from .metrics import registry, Counter, Gauge
+from ..config import settings
+from ..schemas.change import TodoChangeEvent, TodoChangeOperation
+from ..schemas.todo import TodoFilter
+
+logger = CustomLogger(__name__).logger
+
+CHANGE_CHANNEL = "todo_changes"
+# NOTIFY payloads are limited to 8000 bytes; this many ids stay well below it.
+MAX_IDS_PER_EVENT = 100
+MAX_RECONNECT_DELAY = 30.0
+
+
+class ChangeMessage(NamedTuple):
+    """An event as it is sent to subscribers; data is the JSON of a TodoChangeEvent."""
+    event: str
+    id: str
+    data: str
+
+
+# Ends a subscription whose buffer overflowed, or all of them at shutdown.
+CLOSED = ChangeMessage("closed", "", "")
+
+
+def encode_changes(
+    operation: TodoChangeOperation,
+    ids: list[UUID] | None = None,
+    todo_filter: TodoFilter | None = None,
+    count: int | None = None,
+) -> list[str]:
+    """
+    Encodes a write as change events, one per MAX_IDS_PER_EVENT changed ids.
+
+    Returns:
+        list[str]: The JSON of each event, ready to publish.
+    """
+    at = datetime.now(timezone.utc)
+    if ids is None:
+        event = TodoChangeEvent(
+            id=uuid4().hex, operation=operation, filter=todo_filter, count=count or 0, at=at
+        )
+        return [event.model_dump_json(exclude_none=True)]
+    return [
+        TodoChangeEvent(
+            id=uuid4().hex, operation=operation, ids=chunk, count=len(chunk), at=at
+        ).model_dump_json(exclude_none=True)
+        for chunk in (
+            ids[start:start + MAX_IDS_PER_EVENT] for start in range(0, len(ids), MAX_IDS_PER_EVENT)
+        )
+    ]
+
+
+def sse_frame(message: ChangeMessage) -> bytes:
+    """Formats a message as a Server-Sent Events frame."""
+    return f"id: {message.id}\nevent: {message.event}\ndata: {message.data}\n\n".encode()
+
+
+def websocket_frame(message: ChangeMessage) -> str:
+    """Formats a message as the JSON text of a WebSocket message, embedding its data as is."""
+    return orjson.dumps(
+        {"event": message.event, "id": message.id, "data": orjson.Fragment(message.data)}
+    ).decode()
+
+
+class ChangeSubscription:
+    """
+    The messages waiting for one subscriber.
+
+    Replayed history is kept apart from the live buffer, so catching up never
+    overflows it. When a slow subscriber lets buffer_size live messages pile
+    up, the subscription is closed instead of growing; the client reconnects
+    with the id of the last event it got and catches up from history.
+    """
+
+    def __init__(self, buffer_size: int, replay: list[ChangeMessage]):
+        self.buffer_size = buffer_size
+        self.replay = deque(replay)
+        # One slot more than the buffer, kept free for CLOSED.
+        self._queue: asyncio.Queue[ChangeMessage] = asyncio.Queue(buffer_size + 1)
+        self.closed = False
+
+    def put(self, message: ChangeMessage) -> bool:
+        """Queues a message; returns False if the subscription is or got closed."""
+        if self.closed:
+            return False
+        if self._queue.qsize() >= self.buffer_size:
+            self.close()
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._queue.put_nowait(CLOSED)
+
+    async def get(self, timeout: float | None = None) -> ChangeMessage | None:
+        """Returns the next message, or None if none arrived within timeout."""
+        if self.replay:
+            return self.replay.popleft()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """
+    Fans change events out to every subscriber of this worker.
+
+    On Postgres, events are published with NOTIFY and every worker receives
+    them over one LISTEN connection of its own, so a subscriber sees the
+    writes of all workers, in commit order. SQLite has no NOTIFY; events are
+    dispatched in-process, which covers the writes of this worker only.
+
+    The last history_size events are kept to resume from. A client that
+    resumes from an event no longer in history gets a reset message, and has
+    to reload what it shows.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        history_size: int,
+        buffer_size: int,
+        keepalive_interval: float,
+    ):
+        url = make_url(database_url)
+        self.listens = url.get_backend_name() == "postgresql"
+        self.dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.history: deque[ChangeMessage] = deque(maxlen=history_size)
+        self.buffer_size = buffer_size
+        self.keepalive_interval = keepalive_interval
+        self.subscriptions: set[ChangeSubscription] = set()
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, after: str | None = None) -> ChangeSubscription:
+        """Subscribes to the events published from now on, and to those after an event id if given."""
+        replay = []
+        if after:
+            replay = self._history_after(after)
+            if replay is None:
+                latest = self.history[-1].id if self.history else ""
+                replay = [ChangeMessage("reset", latest, "{}")]
+        subscription = ChangeSubscription(self.buffer_size, replay)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def _history_after(self, event_id: str) -> list[ChangeMessage] | None:
+        """Returns the events after event_id, or None if it is not in history."""
+        for position in range(len(self.history) - 1, -1, -1):
+            if self.history[position].id == event_id:
+                return list(self.history)[position + 1:]
+        return None
+
+    def dispatch(self, payload: str) -> None:
+        """Hands a published event to every subscriber."""
+        message = ChangeMessage("change", orjson.loads(payload)["id"], payload)
+        self.history.append(message)
+        self._broadcast(message)
+
+    def reset(self) -> None:
+        """Tells every subscriber that events may have been missed, and forgets the history."""
+        self.history.clear()
+        self._broadcast(ChangeMessage("reset", "", "{}"))
+
+    def _broadcast(self, message: ChangeMessage) -> None:
+        for subscription in list(self.subscriptions):
+            if not subscription.put(message):
+                self.subscriptions.discard(subscription)
+                change_feed_overflows.inc()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        listened = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except Exception as e:
+                logger.warning("Change feed could not connect, retrying in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            delay = 1.0
+            try:
+                await connection.add_listener(CHANGE_CHANNEL, self._on_notification)
+                if listened:
+                    # Anything published while the connection was down is lost.
+                    self.reset()
+                listened = True
+                while True:
+                    await asyncio.sleep(self.keepalive_interval)
+                    await asyncio.wait_for(connection.execute("SELECT 1"), self.keepalive_interval)
+            except Exception as e:
+                logger.warning("Change feed connection lost: %s", e)
+            finally:
+                connection.terminate()
+
+    def start(self) -> None:
+        """Starts listening for the events of all workers, on Postgres."""
+        if self.listens and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stops listening and ends every subscription."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in self.subscriptions:
+            subscription.close()
+        self.subscriptions.clear()
+
+
+change_feed = ChangeFeed(
+    settings.DATABASE_URL,
+    history_size=settings.CHANGE_FEED_HISTORY_SIZE,
+    buffer_size=settings.CHANGE_FEED_BUFFER_SIZE,
+    keepalive_interval=settings.CHANGE_FEED_HEARTBEAT_SECONDS,
+)
+
+registry.register(Gauge(
+    "change_feed_subscribers",
+    "Clients currently subscribed to the todo change feed.",
+    collect=lambda: len(change_feed.subscriptions),
+))
+
+change_feed_overflows = registry.register(Counter(
+    "change_feed_overflows_total",
+    "Change feed subscriptions closed because the client fell too far behind.",
+))
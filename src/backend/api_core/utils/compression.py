@@ -0,0 +1,98 @@
+import zlib
+from typing import Protocol
+
+try:
+    import zstandard
+except ImportError:  # zstd is offered only when the package is installed
+    zstandard = None
+
+# Every content coding the server can produce, most preferred first.
+CONTENT_CODINGS = ("zstd", "gzip")
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk and flushes it, so the client can decode it right away."""
+
+    def finish(self) -> bytes:
+        """Returns the end of the compressed stream."""
+
+
+class GzipStreamCompressor:
+    def __init__(self, level: int):
+        # wbits=31 writes the gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdStreamCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Returns the supported content codings, most preferred first."""
+    return CONTENT_CODINGS if zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """
+    Picks the content coding for a response from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): The raw Accept-Encoding header.
+        available (tuple[str, ...]): The supported codings, most preferred first.
+
+    Returns:
+        str | None: The coding with the highest q-value, ties going to the
+        server's preference, or None if the client accepts none of them.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(encoding: str, data: bytes, level: int) -> bytes:
+    """Compresses a complete body with the given content coding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def stream_compressor(encoding: str, level: int) -> StreamCompressor:
+    """Returns a compressor for a body that is sent in several chunks."""
+    if encoding == "zstd":
+        return ZstdStreamCompressor(level)
+    return GzipStreamCompressor(level)
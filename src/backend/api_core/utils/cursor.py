@@ -0,0 +1,54 @@
+import base64
+import binascii
+from typing import Any
+
+import orjson
+
+from ..exceptions.custom import InvalidCursorException
+from .export import json_default
+
+
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    """
+    Encodes the keyset position of a todo item into an opaque cursor.
+
+    Args:
+        sort (str): The canonical sort expression the page was read with.
+        values (list[Any]): The sort key values of the last item on the page.
+
+    Returns:
+        str: A url-safe cursor string.
+    """
+    payload = orjson.dumps({"s": sort, "v": values}, default=json_default)
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> list[Any]:
+    """
+    Decodes an opaque cursor back into its keyset position.
+
+    Values are returned as JSON scalars, so the position can be part of a
+    hashable key; converting them back to column types is left to the
+    repository.
+
+    Args:
+        cursor (str): A cursor previously produced by encode_cursor.
+        sort (str): The canonical sort expression of the current request.
+
+    Returns:
+        list[Any]: The sort key values to continue after.
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or was issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        cursor_sort, values = payload["s"], payload["v"]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise InvalidCursorException()
+    if cursor_sort != sort or not isinstance(values, list):
+        raise InvalidCursorException(detail="Cursor does not match the requested sort")
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        raise InvalidCursorException()
+    return values
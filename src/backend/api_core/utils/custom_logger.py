@@ -1,70 +1,161 @@
 import logging
 import logging.handlers
 import queue
+import random
 import atexit
+import traceback
+from datetime import datetime, timezone
+
+import orjson
+
+from ..config import settings
+from .metrics import registry, Counter
+
+log_records_dropped = registry.register(Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full.",
+))
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, with its extra fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Lets through only a random fraction of the records of a logger."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler that never blocks the caller.
+
+    When the queue is full the record is dropped and counted in
+    log_records_dropped_total, so a burst of logging under peak load costs
+    log lines instead of request latency.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs only for records that passed the level and sampling checks, so
+        # this is where lazy fields are resolved and the message is rendered.
+        # Formatting to JSON is left to the listener thread.
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and callable(value):
+                record.__dict__[key] = value()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """A QueueListener whose stop() waits for room in a full queue instead of raising."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
 
 class CustomLogger:
     """
-    A custom logger class that prevents propagation and uses a single stream handler.
+    A custom logger class that prevents propagation and writes through a shared queue.
+
+    Every logger name is configured once with its own level and optional
+    sampling rate from the settings, and all of them hand their records to a
+    single background listener that writes them to stderr.
 
-    This class helps avoid duplicate log messages and maintains a consistent logging format.
+    Messages take %-style arguments and structured fields through `extra`;
+    neither is formatted unless the record is emitted. A field whose value is
+    a zero-argument callable is only called then.
     """
-    _instance = None
-    _initialized = False
     _queue = None
     _listener = None
-    
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    _handler = None
+    _configured: set[str] = set()
 
-    def __init__(self, name: str, level: int = logging.INFO):
+    def __init__(self, name: str, level: int | str | None = None):
         """
         Initializes the logger with a name and optional logging level.
 
         Args:
             name (str): The name of the logger instance.
-            level (int, optional): The logging level. Defaults to logging.INFO.
+            level (int | str, optional): The logging level. Defaults to the level
+                configured for the name in LOG_LEVELS, or LOG_LEVEL.
         """
-        if self._initialized:
-            return
-        
-        self._initialized = True
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(level)
-        
+        if name in CustomLogger._configured:
+            return
+        CustomLogger._configured.add(name)
+
+        self.logger.setLevel(level or settings.LOG_LEVELS.get(name, settings.LOG_LEVEL))
         self.logger.propagate = False
-        
-        # Create a queue to hold log messages
+        sample_rate = settings.LOG_SAMPLE_RATES.get(name)
+        if sample_rate is not None:
+            self.logger.addFilter(SamplingFilter(sample_rate))
+
         if CustomLogger._queue is None:
-            CustomLogger._queue = queue.Queue(maxsize=1000)
-        
-            # Create a QueueHandler
-            queue_handler = logging.handlers.QueueHandler(CustomLogger._queue)
-            self.logger.addHandler(queue_handler)
-            
-            # Create a StreamHandler for output
-            stream_handler = logging.StreamHandler()
-            formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(module)s - %(message)s")
-            stream_handler.setFormatter(formatter)
-        
-            # Create and start queue listener
-            CustomLogger._listener = logging.handlers.QueueListener(
-                CustomLogger._queue, 
-                stream_handler,
-                respect_handler_level=True
-                )
-            CustomLogger._listener.start()
-            
-            atexit.register(self.shutdown)
+            CustomLogger._start_listener()
+        self.logger.addHandler(CustomLogger._handler)
+
+    @classmethod
+    def _start_listener(cls):
+        cls._queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        cls._handler = DroppingQueueHandler(cls._queue)
+
+        stream_handler = logging.StreamHandler()
+        if settings.LOG_FORMAT == "json":
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter(
+                "%(asctime)s - %(levelname)s - %(name)s - %(module)s - %(message)s"
+            ))
+
+        cls._listener = DrainingQueueListener(
+            cls._queue,
+            stream_handler,
+            respect_handler_level=True
+            )
+        cls._listener.start()
+
+        atexit.register(cls.shutdown)
 
     def __getattr__(self, name):
         """
         Forwards all logging methods (debug, info, warning, etc.) to the internal logger.
         """
         return getattr(self.logger, name)
-    
+
     @classmethod
     def shutdown(cls):
         """
@@ -73,5 +164,3 @@ class CustomLogger:
         if cls._listener is not None:
             cls._listener.stop()
             cls._listener = None
-            cls._queue = None
-            cls._initialized = False
\ No newline at end of file
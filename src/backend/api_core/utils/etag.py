@@ -0,0 +1,136 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from uuid import UUID
+
+from .compression import CONTENT_CODINGS
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime | None) -> int:
+    return 0 if value is None else (value - EPOCH) // MICROSECOND
+
+
+def todo_etag(todo_id: UUID, updated_at: datetime) -> str:
+    """
+    Builds the strong ETag of a single todo item.
+
+    The tag carries the exact updated_at value, so an If-Match header can be
+    turned back into a version check in the UPDATE/DELETE statement itself.
+
+    Args:
+        todo_id (UUID): The uuid for the todo item.
+        updated_at (datetime): The last modification time of the todo item.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'"{todo_id.hex}.{_to_micros(updated_at)}"'
+
+
+def list_etag(
+    versions: Iterable[tuple[UUID, datetime]],
+    variant: str,
+    next_cursor: str | None = None,
+    total: int | None = None,
+) -> str:
+    """
+    Builds the strong ETag of a list page from the items on it.
+
+    Every write to an item moves its updated_at, and every create or delete
+    that reaches the page changes its ids or its next cursor, so the tag
+    costs no query beyond reading the page itself.
+
+    Args:
+        versions (Iterable[tuple[UUID, datetime]]): The id and updated_at of each item, in page order.
+        variant (str): The normalized query parameters the page was requested with.
+        next_cursor (str | None): The cursor of the next page, if any.
+        total (int | None): The X-Total-Count sent with the page, if requested.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(f"{variant}:{next_cursor}:{total}".encode())
+    for todo_id, updated_at in versions:
+        digest.update(f":{todo_id}.{_to_micros(updated_at)}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Derives the ETag of a body sent compressed with a content coding.
+
+    The compressed bytes are a representation of their own, so their tag
+    must differ from the uncompressed one; the coding is appended inside the
+    quotes, e.g. "abc" becomes "abc-gzip".
+
+    Args:
+        etag (str): The quoted ETag of the uncompressed body, strong or weak.
+        encoding (str): The content coding of the body.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _split_tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _identity_tag(tag: str) -> str:
+    """Strips the content coding encoded_etag added, if any, from a quoted tag."""
+    for encoding in CONTENT_CODINGS:
+        if tag.endswith(f'-{encoding}"'):
+            return f'{tag[:-len(encoding) - 2]}"'
+    return tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag, as RFC 9110 requires.
+
+    Tags of the compressed body match too, since the client holds the same
+    content whichever coding it was sent with.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        _identity_tag(tag.removeprefix("W/")) == etag for tag in _split_tags(if_none_match)
+    )
+
+
+def names_encoded_etag(if_none_match: str, etag: str, encoding: str) -> bool:
+    """Tells whether an If-None-Match header lists the tag of the body compressed with encoding."""
+    encoded = encoded_etag(etag, encoding)
+    return any(tag.removeprefix("W/") == encoded for tag in _split_tags(if_none_match))
+
+
+def parse_if_match(if_match: str, todo_id: UUID) -> list[datetime] | None:
+    """
+    Extracts the todo versions an If-Match header accepts.
+
+    Args:
+        if_match (str): The raw If-Match header.
+        todo_id (UUID): The uuid of the todo item being written.
+
+    Returns:
+        list[datetime] | None: The accepted updated_at values, or None for
+        "*", which accepts any current version. Weak tags and tags for other items
+        are ignored, so the list may be empty. Tags of a compressed body are
+        accepted like the tag they were derived from.
+    """
+    if if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in _split_tags(if_match):
+        if tag.startswith("W/") or len(tag) < 2:
+            continue
+        tag_id, _, micros = _identity_tag(tag).strip('"').partition(".")
+        if tag_id != todo_id.hex or not micros.isdigit():
+            continue
+        versions.append(EPOCH + int(micros) * MICROSECOND)
+    return versions
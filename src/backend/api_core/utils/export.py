@@ -0,0 +1,73 @@
+import csv
+import io
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+import orjson
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serializes the values orjson does not handle itself.
+
+    asyncpg returns uuids as its own subclass of UUID, which orjson only
+    serializes as the exact type.
+    """
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def ndjson_lines(rows: Sequence[Any]) -> bytes:
+    """
+    Serializes a batch of rows as newline-delimited JSON.
+
+    Args:
+        rows (Sequence[Any]): Result rows with a _mapping of column names to values.
+
+    Returns:
+        bytes: One JSON object per row, each terminated by a newline.
+    """
+    return b"".join(
+        orjson.dumps(dict(row._mapping), default=json_default) + b"\n" for row in rows
+    )
+
+
+def json_array(rows: Sequence[Any], fields: Sequence[str]) -> bytes:
+    """
+    Serializes rows as a JSON array of objects with the given fields.
+
+    Args:
+        rows (Sequence[Any]): Result rows whose leading values belong to fields.
+        fields (Sequence[str]): The names of the leading values of each row.
+
+    Returns:
+        bytes: The JSON array, with UTC datetimes written with a "Z" suffix
+        as Pydantic does.
+    """
+    return orjson.dumps(
+        [dict(zip(fields, row)) for row in rows], default=json_default, option=orjson.OPT_UTC_Z
+    )
+
+
+def csv_lines(rows: Sequence[Any], header: Sequence[str] | None = None) -> bytes:
+    """
+    Serializes a batch of rows as CSV.
+
+    Args:
+        rows (Sequence[Any]): Result rows, in column order.
+        header (Sequence[str] | None): Column names to write before the rows, if any.
+
+    Returns:
+        bytes: The UTF-8 encoded CSV lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,33 @@
+from ..schemas.todo import TODO_READ_FIELDS
+from ..exceptions.custom import InvalidFieldsException
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """
+    Parses a sparse fieldset such as "id,title,status".
+
+    Only fields listed in TODO_READ_FIELDS are accepted. Fields are returned
+    in the order they were requested.
+
+    Args:
+        fields (str | None): The fieldset from the query string.
+
+    Returns:
+        tuple[str, ...]: The requested fields, or TODO_READ_FIELDS if none were given.
+
+    Raises:
+        InvalidFieldsException: If a field is unknown or repeated.
+    """
+    if not fields:
+        return TODO_READ_FIELDS
+    names = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name not in TODO_READ_FIELDS:
+            raise InvalidFieldsException(
+                detail=f"Unknown field '{name}'. Allowed fields: {', '.join(TODO_READ_FIELDS)}"
+            )
+        if name in names:
+            raise InvalidFieldsException(detail=f"Field '{name}' appears more than once")
+        names.append(name)
+    return tuple(names)
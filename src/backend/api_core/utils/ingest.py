@@ -0,0 +1,90 @@
+from typing import AsyncIterator
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """
+    Splits a stream of byte chunks into lines without buffering the whole stream.
+
+    Only each new chunk is searched for line endings, and only the unfinished
+    line at its end is kept, so the work is linear in the size of the stream.
+    A line longer than max_line_bytes is not kept at all; it is yielded as
+    None and splitting resumes after its line ending.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw body chunks, e.g. from Request.stream().
+        max_line_bytes (int): The longest line kept, line ending included.
+
+    Yields:
+        tuple[int, bytes | None]: The 1-based line number and the line without
+        its line ending, or None if the line was too long.
+    """
+    pending = bytearray()
+    too_long = False
+    line_number = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            line_number += 1
+            if too_long or len(pending) + end - start >= max_line_bytes:
+                yield line_number, None
+            else:
+                pending += chunk[start:end]
+                yield line_number, bytes(pending).rstrip(b"\r")
+            pending.clear()
+            too_long = False
+            start = end + 1
+        if not too_long and len(pending) + len(chunk) - start >= max_line_bytes:
+            pending.clear()
+            too_long = True
+        elif not too_long:
+            pending += chunk[start:]
+    if too_long:
+        yield line_number + 1, None
+    elif pending:
+        yield line_number + 1, bytes(pending).rstrip(b"\r")
+
+
+async def iter_csv_records(
+    chunks: AsyncIterator[bytes], max_record_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """
+    Groups lines into CSV records, joining lines that fall inside a quoted field.
+
+    A record is complete once it holds an even number of quote characters,
+    since quotes inside quoted fields are always doubled. A record longer
+    than max_record_bytes, e.g. after an unterminated quote, is yielded as
+    None, and grouping starts over on the next line.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw body chunks.
+        max_record_bytes (int): The longest record kept, line endings included.
+
+    Yields:
+        tuple[int, bytes | None]: The line number a record starts on and the
+        raw record, or None if the record was too long.
+    """
+    pending = []
+    size = 0
+    start = 0
+    quotes = 0
+    async for line_number, line in iter_lines(chunks, max_record_bytes):
+        if not pending:
+            start = line_number
+        if line is None or size + len(line) + 1 > max_record_bytes:
+            yield start, None
+            pending = []
+            size = 0
+            quotes = 0
+            continue
+        pending.append(line)
+        size += len(line) + 1
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            yield start, b"\n".join(pending)
+            pending = []
+            size = 0
+            quotes = 0
+    if pending:
+        yield start, b"\n".join(pending)
@@ -0,0 +1,246 @@
+import time
+from bisect import bisect_left
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class Metric:
+    """
+    Base class of the collectors exposed at /metrics.
+
+    Collectors are only touched from the event loop thread, so updates are
+    plain attribute and list writes without locks. Label values are kept as
+    tuples of whatever the caller passes; turning them into text is left to
+    render(), which only runs when the endpoint is scraped.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def render(self) -> list[str]:
+        """Returns the metric in the Prometheus text exposition format."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set, or a single one read from a callback."""
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        collect: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        if self._collect is not None:
+            return self.header() + [f"{self.name} {_format_value(self._collect())}"]
+        lines = self.header()
+        for labels, value in list(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(Metric):
+    """A single value that goes up and down, or is read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation)
+        self.value = 0
+        self._collect = collect
+
+    def inc(self) -> None:
+        self.value += 1
+
+    def dec(self) -> None:
+        self.value -= 1
+
+    def render(self) -> list[str]:
+        value = self._collect() if self._collect is not None else self.value
+        return self.header() + [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram(Metric):
+    """
+    Observation counts per bucket, plus their sum, per label set.
+
+    Each label set owns a preallocated list of non-cumulative bucket counts
+    followed by the sum, so observe() is one bisect and two list writes. The
+    counts are made cumulative when rendered.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.label_names + ("le",), labels + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series_labels = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{series_labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{series_labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The set of collectors rendered by the /metrics endpoint."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Returns every registered metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response was returned.",
+    ("method", "route", "status"),
+))
+
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight",
+    "Requests currently being processed.",
+))
+
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements, including failed ones.",
+    ("operation",),
+))
+
+db_query_errors = registry.register(Counter(
+    "db_query_errors_total",
+    "SQL statements that raised an error.",
+    ("operation",),
+))
+
+
+def _query_operation(context) -> str:
+    if context is None or context.is_text:
+        return "other"
+    if context.isinsert:
+        return "insert"
+    if context.isupdate:
+        return "update"
+    if context.isdelete:
+        return "delete"
+    return "select"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Records the duration of every SQL statement executed through an engine.
+
+    Start times are kept on the connection's info dict, so concurrent
+    statements on different connections never share state. Statements sent
+    through the raw driver, such as COPY, are not seen by these events.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start_time"].pop()
+        db_query_duration.observe((_query_operation(context),), time.perf_counter() - start)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("query_start_time") if conn is not None else None
+        operation = _query_operation(exception_context.execution_context)
+        if starts:
+            db_query_duration.observe((operation,), time.perf_counter() - starts.pop())
+        db_query_errors.inc((operation,))
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from .custom_logger import CustomLogger
+
+logger = CustomLogger(__name__).logger
+
+
+class PeriodicTask:
+    """
+    Runs a coroutine function in the background every interval seconds.
+
+    A failed run is logged and retried at the next interval.
+    """
+
+    def __init__(self, name: str, function: Callable[[], Awaitable[object]], interval: float):
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.function()
+            except Exception as e:
+                logger.warning("%s failed: %s", self.name, e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
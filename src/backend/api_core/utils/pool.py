@@ -0,0 +1,92 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+from ..schemas.pool import PoolStats
+
+
+class _TimedQueue(sqla_queue.AsyncAdaptedQueue):
+    """The pool's queue of idle connections, timing how long each get waits for one."""
+
+    def __init__(self, maxsize: int = 0, use_lifo: bool = False):
+        super().__init__(maxsize, use_lifo)
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    An AsyncAdaptedQueuePool that records how long checkouts wait for a connection.
+
+    Waiting for a free connection is latency that never shows up in query
+    timings, so it is counted here: total and worst wait, and how many
+    checkouts timed out. Only the wait for an idle connection or a free slot
+    counts as waiting; opening a connection, for a new slot or to replace a
+    recycled one, is timed apart. The counters reset when the pool is
+    recreated.
+    """
+
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.connect_seconds_total = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _should_wrap_creator(self, creator):
+        invoke_creator = super()._should_wrap_creator(creator)
+
+        def connect(record):
+            start = time.perf_counter()
+            try:
+                return invoke_creator(record)
+            finally:
+                self.connects += 1
+                self.connect_seconds_total += time.perf_counter() - start
+
+        return connect
+
+    @property
+    def wait_seconds_total(self) -> float:
+        return self._pool.wait_seconds_total
+
+    @property
+    def wait_seconds_max(self) -> float:
+        return self._pool.wait_seconds_max
+
+    def connect(self):
+        self.checkouts += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def stats(self) -> PoolStats:
+        """Returns the current state and the checkout counters of the pool."""
+        return PoolStats(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_seconds_total=self.wait_seconds_total,
+            wait_seconds_max=self.wait_seconds_max,
+            connects=self.connects,
+            connect_seconds_total=self.connect_seconds_total,
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+import math
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .custom_logger import CustomLogger
+from ..schemas.replica import ReplicaStatus
+
+logger = CustomLogger(__name__).logger
+
+# Seconds behind the primary. A standby that has replayed everything it
+# received is current even if the primary has been idle since its last commit;
+# a server that is not a standby at all has no lag.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    """A read replica engine with its last measured replication lag."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        # Unknown until the first check, so reads stay on the primary until then.
+        self.lag_seconds = math.inf
+        self.error: str | None = None
+
+
+class ReplicaRouter:
+    """
+    Picks the replica that serves a read, or None to read from the primary.
+
+    Lag is measured by a background task every check_interval seconds rather
+    than on the request path. A replica whose lag is above max_lag_seconds, or
+    whose last check failed, is skipped until a later check finds it current.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        max_lag_seconds: float,
+        check_interval: float,
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._next = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def read_session_factory(self) -> Callable[[], AsyncSession] | None:
+        """Returns the session factory of a current replica, round robin, or None if there is none."""
+        current = [
+            replica for replica in self.replicas if replica.lag_seconds <= self.max_lag_seconds
+        ]
+        if not current:
+            return None
+        return current[next(self._next) % len(current)].session_factory
+
+    async def check(self) -> None:
+        """Measures the replication lag of every replica."""
+        for replica in self.replicas:
+            try:
+                lag = await asyncio.wait_for(
+                    self._measure_lag(replica), timeout=self.check_interval
+                )
+                replica.lag_seconds = float(lag)
+                replica.error = None
+            except Exception as e:
+                if replica.error is None:
+                    logger.warning(
+                        "Replica %s is unavailable: %s", replica.engine.url.host, e
+                    )
+                replica.lag_seconds = math.inf
+                replica.error = str(e) or type(e).__name__
+
+    @staticmethod
+    async def _measure_lag(replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            return await conn.scalar(REPLICA_LAG_QUERY)
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Starts checking replica lag in the background."""
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the lag checks and closes the replica connection pools."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> list[ReplicaStatus]:
+        """Returns the host, lag and availability of every replica."""
+        return [
+            ReplicaStatus(
+                host=replica.engine.url.host or "",
+                port=replica.engine.url.port,
+                lag_seconds=None if math.isinf(replica.lag_seconds) else replica.lag_seconds,
+                serving_reads=replica.lag_seconds <= self.max_lag_seconds,
+                error=replica.error,
+            )
+            for replica in self.replicas
+        ]
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from ..config import settings
+from .metrics import registry, Counter
+
+T = TypeVar("T")
+
+single_flight_calls = registry.register(Counter(
+    "single_flight_calls_total",
+    "Calls through single-flight coalescing, by who ran them.",
+    ("name", "outcome"),
+))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical reads in this process into one call.
+
+    The first caller for a key, the leader, runs the call; callers that
+    arrive while it is in flight wait for its result instead of running
+    their own. A follower waits at most max_wait seconds, and if the leader
+    is slower or fails, runs the call itself, so coalescing never turns a
+    slow or failed request into more failures.
+
+    Results are shared between requests, so they must not be changed by
+    whoever receives them.
+    """
+
+    def __init__(self, name: str, max_wait: float):
+        """
+        Args:
+            name (str): The label of the counters.
+            max_wait (float): Seconds a follower waits for the leader; 0 disables coalescing.
+        """
+        self.name = name
+        self.max_wait = max_wait
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs function, or shares the result of an identical call in flight.
+
+        Args:
+            key (Hashable): Identifies calls that return the same result.
+            function (Callable): Makes the call.
+
+        Returns:
+            The result of function, from this call or the one in flight.
+        """
+        if self.max_wait <= 0:
+            return await function()
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            # asyncio.wait neither raises the leader's error nor cancels its call.
+            await asyncio.wait((flight,), timeout=self.max_wait)
+            if flight.done() and not flight.cancelled():
+                single_flight_calls.inc((self.name, "coalesced"))
+                return flight.result()
+            single_flight_calls.inc((self.name, "timeout" if not flight.done() else "retried"))
+            return await function()
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        single_flight_calls.inc((self.name, "leader"))
+        try:
+            result = await function()
+        except BaseException:
+            # Followers run the call themselves rather than share the error.
+            flight.cancel()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def forget(self) -> None:
+        """
+        Stops later callers from joining the calls now in flight.
+
+        Called after a write, whose effects a call that started before it may
+        not see. Callers already waiting still receive its result.
+        """
+        self._flights.clear()
+
+
+todo_reads = SingleFlight("todo_reads", max_wait=settings.SINGLE_FLIGHT_MAX_WAIT_SECONDS)
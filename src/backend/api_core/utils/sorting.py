@@ -0,0 +1,52 @@
+from ..schemas.todo import TodoSortKey, TODO_SORT_FIELDS, DEFAULT_TODO_SORT
+from ..exceptions.custom import InvalidSortException
+
+
+def parse_sort(sort: str | None) -> tuple[TodoSortKey, ...]:
+    """
+    Parses a sort expression such as "-priority,due_date".
+
+    A leading "-" sorts the field in descending order. Only fields listed in
+    TODO_SORT_FIELDS are accepted.
+
+    Args:
+        sort (str | None): The sort expression from the query string.
+
+    Returns:
+        tuple[TodoSortKey, ...]: The sort keys, or DEFAULT_TODO_SORT if none were given.
+
+    Raises:
+        InvalidSortException: If a field is unknown or repeated.
+    """
+    if not sort:
+        return DEFAULT_TODO_SORT
+    keys = []
+    for part in sort.split(","):
+        part = part.strip()
+        descending = part.startswith("-")
+        field = part.lstrip("-")
+        if field not in TODO_SORT_FIELDS:
+            raise InvalidSortException(
+                detail=f"Cannot sort by '{field}'. Allowed fields: {', '.join(TODO_SORT_FIELDS)}"
+            )
+        if any(key.field == field for key in keys):
+            raise InvalidSortException(detail=f"Field '{field}' appears more than once")
+        keys.append(TodoSortKey(field, descending))
+    return tuple(keys)
+
+
+def tiebreak_fields(keys: tuple[TodoSortKey, ...]) -> tuple[str, ...]:
+    """
+    Returns the fields that follow the sort keys so that no two rows tie.
+
+    Rows equal on the sort keys are listed by created_at, unless it is a sort
+    key already, then by id. Both follow the direction of the last key, so a
+    single index on the key, created_at and id serves a sort either way.
+    """
+    fields = ("created_at", "id")
+    return tuple(field for field in fields if all(key.field != field for key in keys))
+
+
+def format_sort(keys: tuple[TodoSortKey, ...]) -> str:
+    """Returns the canonical sort expression for a tuple of sort keys."""
+    return ",".join(f"-{key.field}" if key.descending else key.field for key in keys)
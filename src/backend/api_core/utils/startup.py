@@ -0,0 +1,51 @@
+import math
+import time
+
+from .custom_logger import CustomLogger
+from .metrics import registry, Gauge
+
+logger = CustomLogger(__name__).logger
+
+
+class StartupTimer:
+    """
+    Measures how long a worker takes to start, and to serve its first successful request.
+
+    Both are counted from the start of the lifespan, so they include the
+    schema check and the pool warm-up but not importing the app.
+    """
+
+    def __init__(self):
+        self.started_at: float | None = None
+        self.startup_seconds = math.nan
+        self.first_request_seconds = math.nan
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def ready(self) -> None:
+        """Records that startup has finished and the worker accepts requests."""
+        self.startup_seconds = time.perf_counter() - self.started_at
+        logger.info("Server started in %.3fs", self.startup_seconds)
+
+    def request_succeeded(self) -> None:
+        """Records the first successful response; later calls do nothing."""
+        if not math.isnan(self.first_request_seconds) or self.started_at is None:
+            return
+        self.first_request_seconds = time.perf_counter() - self.started_at
+        logger.info("First successful request after %.3fs", self.first_request_seconds)
+
+
+startup_timer = StartupTimer()
+
+registry.register(Gauge(
+    "app_startup_seconds",
+    "Seconds the worker took to start, including the schema check and pool warm-up.",
+    collect=lambda: startup_timer.startup_seconds,
+))
+
+registry.register(Gauge(
+    "app_first_request_seconds",
+    "Seconds from the start of the worker to its first successful response.",
+    collect=lambda: startup_timer.first_request_seconds,
+))
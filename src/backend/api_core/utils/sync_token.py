@@ -0,0 +1,71 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import NamedTuple
+from uuid import UUID
+
+import orjson
+
+from ..exceptions.custom import InvalidSyncTokenException
+
+
+class SyncToken(NamedTuple):
+    """
+    The position a delta sync continues from.
+
+    A pass reads every change from since up to the horizon it started at,
+    one page at a time, and the next pass starts at that horizon.
+    """
+    # change_seq to read changes from, or None to read every todo item.
+    since: int | None
+    # The horizon of the pass in progress; None before its first page.
+    horizon: int | None
+    # The (change_seq, id) of the last change on the previous page of the pass.
+    after: tuple[int, UUID] | None
+    # When the pass started. Tombstones are only kept for a limited time after it.
+    started_at: datetime
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    """
+    Encodes a sync position into an opaque token.
+
+    Args:
+        token (SyncToken): The position to continue from.
+
+    Returns:
+        str: A url-safe token string.
+    """
+    after = [token.after[0], str(token.after[1])] if token.after else None
+    payload = orjson.dumps(
+        {"s": token.since, "h": token.horizon, "a": after, "t": token.started_at.timestamp()}
+    )
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_sync_token(token: str) -> SyncToken:
+    """
+    Decodes an opaque token back into its sync position.
+
+    Args:
+        token (str): A token previously produced by encode_sync_token.
+
+    Returns:
+        SyncToken: The position to continue from.
+
+    Raises:
+        InvalidSyncTokenException: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        since, horizon, after = payload["s"], payload["h"], payload["a"]
+        for value in (since, horizon):
+            if value is not None and not isinstance(value, int):
+                raise TypeError(value)
+        if after is not None:
+            after = (int(after[0]), UUID(after[1]))
+        started_at = datetime.fromtimestamp(payload["t"], timezone.utc)
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+        raise InvalidSyncTokenException()
+    return SyncToken(since, horizon, after, started_at)
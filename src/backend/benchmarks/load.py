@@ -0,0 +1,329 @@
+"""
+Load and latency benchmark for the todo API.
+
+Seeds a reproducible dataset, drives every todo route at a fixed concurrency
+and reports throughput and p50/p95/p99 latency per scenario. Requests go
+through the ASGI app in-process, which leaves the network out, or over HTTP
+to a running server. Results are saved as JSON and can be checked against a
+stored baseline, failing when a scenario got slower by more than a threshold.
+Run from src/backend with the same environment as the server:
+
+    python -m benchmarks.load seed --rows 1000000
+    python -m benchmarks.load run --rows 1000000 --output results.json
+    python -m benchmarks.load run --rows 1000000 --transport http --url http://localhost:8000
+    python -m benchmarks.load compare results.json baseline.json --threshold 0.1
+
+Set LOG_LEVELS='{"api_core.access": "WARNING"}' to leave the access log out
+of in-process runs, and CACHE_BACKEND=none to measure reads without the cache.
+"""
+import argparse
+import asyncio
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import orjson
+
+from .scenarios import API_PREFIX, SCENARIOS, BenchmarkRequest, Dataset, Scenario
+from .seed import SCRATCH_DUE_START, seed
+
+# Results regress when a latency percentile grows, or throughput shrinks, by more than the threshold.
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRIC = "throughput_rps"
+# Run settings that must match for two results to be comparable.
+COMPARABLE_SETTINGS = ("rows", "concurrency", "transport")
+
+
+@asynccontextmanager
+async def open_client(transport: str, url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Opens a client that sends requests in-process to the app, or over HTTP to url."""
+    if transport == "asgi":
+        from api_core.main import app
+
+        # ASGITransport does not run the lifespan, which starts the app's background tasks.
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://localhost", timeout=None
+            ) as client:
+                yield client
+    else:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+            yield client
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Returns the nearest-rank percentile of values sorted in ascending order."""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def build_requests(
+    client: httpx.AsyncClient, scenario: Scenario, dataset: Dataset, rng: random.Random, count: int
+) -> list[BenchmarkRequest]:
+    return [await scenario.build(client, dataset, rng) for _ in range(count)]
+
+
+async def send(client: httpx.AsyncClient, request: BenchmarkRequest) -> httpx.Response:
+    return await client.request(
+        request.method,
+        request.url,
+        params=request.params,
+        json=request.json,
+        content=request.content,
+        headers=request.headers,
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    seed: int,
+) -> dict:
+    """
+    Sends warmup untimed requests, then requests timed ones, from concurrency workers at once.
+
+    Every worker builds all of its requests before the timed phase starts, so
+    throughput and latency only cover the requests of the scenario itself.
+    """
+    rngs = [random.Random(f"{seed}:{scenario.name}:{worker}") for worker in range(concurrency)]
+
+    async def worker_requests(worker: int, total: int) -> list[BenchmarkRequest]:
+        count = total // concurrency + (worker < total % concurrency)
+        return await build_requests(client, scenario, dataset, rngs[worker], count)
+
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def drive(batch: list[BenchmarkRequest], timed: bool) -> None:
+        for request in batch:
+            start = time.perf_counter()
+            response = await send(client, request)
+            if not timed:
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in scenario.expected_status:
+                key = str(response.status_code)
+                errors[key] = errors.get(key, 0) + 1
+
+    warmup_batches = await asyncio.gather(
+        *(worker_requests(worker, warmup) for worker in range(concurrency))
+    )
+    await asyncio.gather(*(drive(batch, timed=False) for batch in warmup_batches))
+
+    batches = await asyncio.gather(
+        *(worker_requests(worker, requests) for worker in range(concurrency))
+    )
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(batch, timed=True) for batch in batches))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": duration,
+        THROUGHPUT_METRIC: len(latencies) / duration if duration else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else math.nan,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else math.nan,
+    }
+
+
+async def check_dataset(client: httpx.AsyncClient, rows: int) -> None:
+    """Removes items left by earlier runs, and fails unless exactly rows items remain."""
+    await delete_created_items(client)
+    response = await client.get(f"{API_PREFIX}/stats", params={"count": "exact"})
+    response.raise_for_status()
+    total = response.json()["total"]
+    if total != rows:
+        raise SystemExit(
+            f"The database has {total} todo items, not {rows}; "
+            f"seed it with `python -m benchmarks.load seed --rows {rows}` first."
+        )
+
+
+async def delete_created_items(client: httpx.AsyncClient) -> None:
+    response = await client.delete(
+        f"{API_PREFIX}/", params={"due_after": (SCRATCH_DUE_START - timedelta(seconds=1)).isoformat()}
+    )
+    response.raise_for_status()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scenarios = [SCENARIOS[name] for name in args.scenarios]
+    dataset = Dataset(args.rows)
+    results = {
+        "settings": {
+            "rows": args.rows,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "transport": args.transport,
+            "seed": args.seed,
+        },
+        "environment": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    async with open_client(args.transport, args.url, args.concurrency) as client:
+        await check_dataset(client, args.rows)
+        try:
+            for scenario in scenarios:
+                result = await run_scenario(
+                    client, scenario, dataset, args.concurrency, args.requests, args.warmup, args.seed
+                )
+                results["scenarios"][scenario.name] = result
+                print_result(scenario.name, result)
+        finally:
+            await delete_created_items(client)
+    return results
+
+
+def print_header() -> None:
+    print(f"{'scenario':<26}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<26}{result[THROUGHPUT_METRIC]:>10.1f}{result['p50_ms']:>10.2f}"
+        f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{sum(result['errors'].values()):>8}"
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares results with a baseline of the same settings.
+
+    Returns:
+        list[str]: One line per scenario and metric that regressed by more than
+        threshold, as a fraction of the baseline; empty if none did.
+    """
+    mismatched = [
+        key for key in COMPARABLE_SETTINGS
+        if results["settings"].get(key) != baseline["settings"].get(key)
+    ]
+    if mismatched:
+        raise SystemExit(
+            "Results and baseline were run with different settings: "
+            + ", ".join(
+                f"{key} {results['settings'].get(key)} != {baseline['settings'].get(key)}"
+                for key in mismatched
+            )
+        )
+
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric in LATENCY_METRICS:
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.2f} > {base[metric]:.2f} (+{threshold:.0%})"
+                )
+        if result[THROUGHPUT_METRIC] < base[THROUGHPUT_METRIC] * (1 - threshold):
+            regressions.append(
+                f"{name}: {THROUGHPUT_METRIC} {result[THROUGHPUT_METRIC]:.1f} "
+                f"< {base[THROUGHPUT_METRIC]:.1f} (-{threshold:.0%})"
+            )
+    return regressions
+
+
+def check(results: dict, baseline_path: Path | None, threshold: float) -> int:
+    """Prints errors and regressions, and returns the exit status."""
+    status = 0
+    failed = [name for name, result in results["scenarios"].items() if result["errors"]]
+    if failed:
+        print(f"Scenarios with unexpected status codes: {', '.join(failed)}")
+        status = 1
+    if baseline_path is not None:
+        regressions = compare(results, orjson.loads(baseline_path.read_bytes()), threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            status = 1
+        else:
+            print(f"No regressions beyond {threshold:.0%} against {baseline_path}")
+    return status
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Replace all todo items with the benchmark dataset")
+    seed_parser.add_argument("--rows", type=int, default=100_000)
+    seed_parser.add_argument("--batch-size", type=int, default=100_000)
+
+    run_parser = commands.add_parser("run", help="Run the scenarios against a seeded database")
+    run_parser.add_argument("--rows", type=int, default=100_000, help="Rows the database was seeded with")
+    run_parser.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    run_parser.add_argument("--url", default="http://localhost:8000", help="Server for --transport http")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--requests", type=int, default=2000, help="Timed requests per scenario")
+    run_parser.add_argument("--warmup", type=int, default=200, help="Untimed requests per scenario")
+    run_parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"Comma separated subset of: {', '.join(SCENARIOS)}",
+    )
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    run_parser.add_argument("--baseline", type=Path)
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    compare_parser = commands.add_parser("compare", help="Check saved results against a baseline")
+    compare_parser.add_argument("results", type=Path)
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        asyncio.run(seed(args.rows, args.batch_size))
+        return 0
+    if args.command == "compare":
+        return check(orjson.loads(args.results.read_bytes()), args.baseline, args.threshold)
+
+    unknown = sorted(set(args.scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    print_header()
+    results = asyncio.run(run(args))
+    args.output.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    print(f"Results written to {args.output}")
+    return check(results, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
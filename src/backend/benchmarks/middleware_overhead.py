@@ -0,0 +1,96 @@
+"""
+Measures the per-request cost of the request logging middleware.
+
+Compares the previous @app.middleware("http") implementation, which runs on
+Starlette's BaseHTTPMiddleware, with the pure ASGI RequestLoggingMiddleware
+on an endpoint that does no work, so the difference is middleware overhead.
+
+Both variants record the same metrics. The access log is left out of the
+comparison by raising its level. Run from src/backend:
+
+    LOG_LEVELS='{"api_core.access": "WARNING"}' python -m benchmarks.middleware_overhead
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from api_core.middleware import RequestLoggingMiddleware
+from api_core.utils.metrics import http_request_duration, http_requests_in_flight, UNMATCHED_ROUTE
+
+
+def base_http_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def custom_logging(request: Request, call_next):
+        start_time = time.perf_counter()
+        http_requests_in_flight.inc()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            http_requests_in_flight.dec()
+            route = request.scope.get("route")
+            http_request_duration.observe(
+                (request.method, route.path if route else UNMATCHED_ROUTE, status_code),
+                time.perf_counter() - start_time,
+            )
+        return response
+
+    add_routes(app)
+    return app
+
+
+def pure_asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+    add_routes(app)
+    return app
+
+
+def no_middleware_app() -> FastAPI:
+    app = FastAPI()
+    add_routes(app)
+    return app
+
+
+def add_routes(app: FastAPI) -> None:
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        for _ in range(min(500, requests)):
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int) -> None:
+    results = [
+        (name, await measure(app, requests))
+        for name, app in (
+            ("no middleware", no_middleware_app()),
+            ("BaseHTTPMiddleware", base_http_app()),
+            ("pure ASGI", pure_asgi_app()),
+        )
+    ]
+    baseline = results[0][1]
+    print(f"{'variant':<22}{'us/request':>12}{'overhead us':>14}")
+    for name, per_request in results:
+        print(f"{name:<22}{per_request * 1e6:>12.1f}{(per_request - baseline) * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
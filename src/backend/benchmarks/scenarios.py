@@ -0,0 +1,272 @@
+"""
+The requests the load benchmark sends, at least one scenario per route in
+api/todo.py apart from the change feed streams.
+
+A scenario builds each of its requests from the dataset and a seeded random
+generator. Building is not timed, so scenarios that need state first, such
+as an item to delete or an ETag to revalidate, fetch it while building.
+Write scenarios only change descriptions of seeded rows, or touch items
+they created themselves in the scratch due date range, so the seeded
+counts by status and priority stay the same from run to run.
+"""
+import itertools
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+import httpx
+import orjson
+
+from .seed import WORDS, STATUSES, SCRATCH_DUE_START, seeded_id, seeded_due_date
+
+API_PREFIX = "/api/v1/todos"
+
+
+@dataclass
+class Dataset:
+    """The seeded dataset a run works against."""
+    rows: int
+    _scratch_minutes: itertools.count = field(default_factory=itertools.count)
+
+    def random_row(self, rng: random.Random) -> int:
+        return rng.randrange(self.rows)
+
+    def random_row_with_due_date(self, rng: random.Random) -> int:
+        while True:
+            i = self.random_row(rng)
+            if seeded_due_date(i) is not None:
+                return i
+
+    def next_scratch_due_date(self) -> datetime:
+        """Returns a due date in the scratch range that no other created item has."""
+        return SCRATCH_DUE_START + timedelta(minutes=next(self._scratch_minutes))
+
+    def new_item(self) -> dict[str, Any]:
+        return {
+            "title": "Benchmark created item",
+            "description": "Created by the load benchmark",
+            "priority": 3,
+            "due_date": self.next_scratch_due_date().isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class BenchmarkRequest:
+    method: str
+    url: str
+    params: dict[str, Any] | None = None
+    json: Any = None
+    content: bytes | None = None
+    headers: dict[str, str] | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[httpx.AsyncClient, Dataset, random.Random], Awaitable[BenchmarkRequest]]
+    expected_status: tuple[int, ...] = (200,)
+
+
+def _due_window(due_date: datetime) -> dict[str, str]:
+    """Filter parameters that match exactly the items due on due_date's minute."""
+    return {
+        "due_after": (due_date - timedelta(seconds=30)).isoformat(),
+        "due_before": (due_date + timedelta(seconds=30)).isoformat(),
+    }
+
+
+async def create_todo(client, dataset, rng):
+    return BenchmarkRequest("POST", f"{API_PREFIX}/", json=dataset.new_item())
+
+
+async def create_todos_bulk(client, dataset, rng):
+    return BenchmarkRequest(
+        "POST", f"{API_PREFIX}/bulk", json=[dataset.new_item() for _ in range(100)]
+    )
+
+
+async def read_todos_page(client, dataset, rng):
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/", params={"skip": rng.randrange(min(dataset.rows, 1000)), "limit": 100}
+    )
+
+
+async def read_todos_filtered(client, dataset, rng):
+    low = rng.randrange(6)
+    return BenchmarkRequest(
+        "GET",
+        f"{API_PREFIX}/",
+        params={
+            "status": rng.choice(STATUSES),
+            "priority_min": low,
+            "priority_max": min(5, low + 1),
+            "sort": "-priority,due_date",
+            "limit": 50,
+        },
+    )
+
+
+async def read_todos_cursor(client, dataset, rng):
+    due_after = seeded_due_date(dataset.random_row_with_due_date(rng))
+    params = {"sort": "due_date", "due_after": due_after.isoformat(), "limit": 100}
+    first_page = await client.get(f"{API_PREFIX}/", params=params)
+    first_page.raise_for_status()
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/", params={**params, "cursor": first_page.headers["X-Next-Cursor"]}
+    )
+
+
+async def read_todos_sparse(client, dataset, rng):
+    return BenchmarkRequest(
+        "GET",
+        f"{API_PREFIX}/",
+        params={
+            "fields": "id,title,status",
+            "priority_min": rng.randrange(6),
+            "count": "approximate",
+            "limit": 100,
+        },
+    )
+
+
+async def read_todos_not_modified(client, dataset, rng):
+    params = {"status": rng.choice(STATUSES), "limit": 20}
+    response = await client.get(f"{API_PREFIX}/", params=params)
+    response.raise_for_status()
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/", params=params, headers={"If-None-Match": response.headers["ETag"]}
+    )
+
+
+async def update_todos_bulk(client, dataset, rng):
+    due_date = seeded_due_date(dataset.random_row_with_due_date(rng))
+    return BenchmarkRequest(
+        "PATCH",
+        f"{API_PREFIX}/",
+        params=_due_window(due_date),
+        json={"description": f"Updated by the load benchmark ({rng.randrange(1000)})"},
+    )
+
+
+async def delete_todos_bulk(client, dataset, rng):
+    item = dataset.new_item()
+    response = await client.post(f"{API_PREFIX}/", json=item)
+    response.raise_for_status()
+    return BenchmarkRequest(
+        "DELETE", f"{API_PREFIX}/", params=_due_window(datetime.fromisoformat(item["due_date"]))
+    )
+
+
+async def export_todos(client, dataset, rng):
+    start = seeded_due_date(dataset.random_row_with_due_date(rng))
+    return BenchmarkRequest(
+        "GET",
+        f"{API_PREFIX}/export",
+        params={
+            "format": rng.choice(("ndjson", "csv")),
+            "due_after": start.isoformat(),
+            "due_before": (start + timedelta(minutes=1000)).isoformat(),
+        },
+    )
+
+
+async def import_todos(client, dataset, rng):
+    body = b"\n".join(orjson.dumps(dataset.new_item()) for _ in range(100))
+    return BenchmarkRequest(
+        "POST",
+        f"{API_PREFIX}/import",
+        params={"format": "ndjson"},
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+
+async def read_todos_by_ids(client, dataset, rng):
+    ids = [str(seeded_id(dataset.random_row(rng))) for _ in range(50)]
+    return BenchmarkRequest("POST", f"{API_PREFIX}/batch-get", json={"ids": ids})
+
+
+async def search_todos(client, dataset, rng):
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/search", params={"q": " ".join(rng.sample(WORDS, 2))}
+    )
+
+
+async def read_todo_stats(client, dataset, rng):
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/stats", params={"count": rng.choice(("exact", "approximate"))}
+    )
+
+
+async def sync_todos(client, dataset, rng):
+    # Continues a full sync from a random point of the change sequence.
+    response = await client.get(
+        f"{API_PREFIX}/sync", params={"limit": 1 + rng.randrange(min(dataset.rows, 1000))}
+    )
+    response.raise_for_status()
+    return BenchmarkRequest(
+        "GET", f"{API_PREFIX}/sync", params={"since": response.json()["next_token"], "limit": 100}
+    )
+
+
+async def read_cache_stats(client, dataset, rng):
+    return BenchmarkRequest("GET", f"{API_PREFIX}/cache/stats")
+
+
+async def read_todo(client, dataset, rng):
+    return BenchmarkRequest("GET", f"{API_PREFIX}/{seeded_id(dataset.random_row(rng))}")
+
+
+async def read_hot_todo(client, dataset, rng):
+    # Every client reads the same item, as after a popular item is shared.
+    return BenchmarkRequest("GET", f"{API_PREFIX}/{seeded_id(0)}")
+
+
+async def read_todo_not_modified(client, dataset, rng):
+    url = f"{API_PREFIX}/{seeded_id(dataset.random_row(rng))}"
+    response = await client.get(url)
+    response.raise_for_status()
+    return BenchmarkRequest("GET", url, headers={"If-None-Match": response.headers["ETag"]})
+
+
+async def update_todo(client, dataset, rng):
+    return BenchmarkRequest(
+        "PUT",
+        f"{API_PREFIX}/{seeded_id(dataset.random_row(rng))}",
+        json={"description": f"Updated by the load benchmark ({rng.randrange(1000)})"},
+    )
+
+
+async def delete_todo(client, dataset, rng):
+    response = await client.post(f"{API_PREFIX}/", json=dataset.new_item())
+    response.raise_for_status()
+    return BenchmarkRequest("DELETE", f"{API_PREFIX}/{response.json()['id']}")
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("create_todo", create_todo, (201,)),
+        Scenario("create_todos_bulk", create_todos_bulk, (201,)),
+        Scenario("read_todos_page", read_todos_page),
+        Scenario("read_todos_filtered", read_todos_filtered),
+        Scenario("read_todos_cursor", read_todos_cursor),
+        Scenario("read_todos_sparse", read_todos_sparse),
+        Scenario("read_todos_not_modified", read_todos_not_modified, (304,)),
+        Scenario("update_todos_bulk", update_todos_bulk),
+        Scenario("delete_todos_bulk", delete_todos_bulk),
+        Scenario("export_todos", export_todos),
+        Scenario("import_todos", import_todos),
+        Scenario("read_todos_by_ids", read_todos_by_ids),
+        Scenario("search_todos", search_todos),
+        Scenario("read_todo_stats", read_todo_stats),
+        Scenario("sync_todos", sync_todos),
+        Scenario("read_cache_stats", read_cache_stats),
+        Scenario("read_todo", read_todo),
+        Scenario("read_hot_todo", read_hot_todo),
+        Scenario("read_todo_not_modified", read_todo_not_modified, (304,)),
+        Scenario("update_todo", update_todo),
+        Scenario("delete_todo", delete_todo, (204,)),
+    )
+}
@@ -0,0 +1,125 @@
+"""
+Seeds the todos table with a reproducible benchmark dataset.
+
+Row i is derived from i alone, so every seeding of the same size produces
+the same table and the load scenarios can address rows without reading
+them first: its id is md5('todo-<i>') as a UUID, and its due date, when it
+has one, falls on its own minute.
+"""
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, insert, text
+
+from api_core.models.todo import Todo
+from api_core.models.todo_stats import TodoOpenDueCount, TodoStatusCount
+from api_core.models.todo_sync import TodoTombstone
+
+# Words that appear in titles and descriptions, for the search scenario.
+WORDS = ("groceries", "report", "meeting", "invoice", "garden", "release", "travel", "budget")
+STATUSES = ("pending", "in_progress", "completed")
+DUE_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+CREATED_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# Items created by the write scenarios are due from here on, far past any
+# seeded row, so they can be deleted again with a single due date filter.
+SCRATCH_DUE_START = datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+SEED_STATEMENT = text(
+    """
+    WITH params AS (
+        SELECT
+            CAST(:words AS text[]) AS words,
+            CAST(:statuses AS text[]) AS statuses,
+            CAST(:due_start AS timestamptz) AS due_start,
+            CAST(:created_start AS timestamptz) AS created_start
+    )
+    INSERT INTO todos (id, title, description, status, priority, due_date, created_at, updated_at)
+    SELECT
+        md5('todo-' || i)::uuid,
+        'Benchmark ' || words[1 + i % 8] || ' ' || i,
+        'Seeded item ' || i || ' about ' || words[1 + (i / 8) % 8],
+        statuses[1 + (i / 7) % 3],
+        i % 6,
+        CASE WHEN i % 4 = 0 THEN NULL ELSE due_start + i * interval '1 minute' END,
+        created_start + i * interval '1 second',
+        created_start + i * interval '1 second'
+    FROM params, generate_series(CAST(:start AS bigint), CAST(:stop AS bigint) - 1) AS i
+    """
+)
+
+
+def seeded_id(i: int) -> UUID:
+    """Returns the id of seeded row i."""
+    return UUID(hashlib.md5(f"todo-{i}".encode()).hexdigest())
+
+
+def seeded_due_date(i: int) -> datetime | None:
+    """Returns the due date of seeded row i; every fourth row has none."""
+    return None if i % 4 == 0 else DUE_START + timedelta(minutes=i)
+
+
+def seeded_row(i: int) -> dict:
+    """Returns seeded row i, the same row SEED_STATEMENT generates on Postgres."""
+    created_at = CREATED_START + timedelta(seconds=i)
+    return {
+        "id": seeded_id(i),
+        "title": f"Benchmark {WORDS[i % 8]} {i}",
+        "description": f"Seeded item {i} about {WORDS[(i // 8) % 8]}",
+        "status": STATUSES[(i // 7) % 3],
+        "priority": i % 6,
+        "due_date": seeded_due_date(i),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+async def seed(rows: int, batch_size: int = 100_000) -> None:
+    """
+    Replaces the contents of the todos table with rows seeded items.
+
+    Rows are inserted in batches of batch_size, each in its own transaction,
+    and the table is vacuumed and analyzed afterwards so that the planner's
+    estimates match the new data. Postgres generates the rows itself; for
+    SQLite they are built here, which has no network hop to pay for.
+    """
+    # Imported here so that comparing results does not need database settings.
+    from api_core.database import async_engine, init_db
+
+    postgres = async_engine.dialect.name == "postgresql"
+    await init_db()
+    async with async_engine.begin() as conn:
+        if postgres:
+            await conn.execute(
+                text("TRUNCATE todos, todo_status_counts, todo_open_due_counts, todo_tombstones")
+            )
+        else:
+            # Deleting todos writes tombstones, so they are deleted last.
+            for table in (Todo, TodoStatusCount, TodoOpenDueCount, TodoTombstone):
+                await conn.execute(delete(table))
+
+    start_time = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        stop = min(start + batch_size, rows)
+        async with async_engine.begin() as conn:
+            if postgres:
+                await conn.execute(
+                    SEED_STATEMENT,
+                    {
+                        "words": list(WORDS),
+                        "statuses": list(STATUSES),
+                        "due_start": DUE_START,
+                        "created_start": CREATED_START,
+                        "start": start,
+                        "stop": stop,
+                    },
+                )
+            else:
+                await conn.execute(insert(Todo), [seeded_row(i) for i in range(start, stop)])
+        print(f"seeded {stop}/{rows} rows ({time.perf_counter() - start_time:.1f}s)")
+
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE todos" if postgres else "ANALYZE"))
+    await async_engine.dispose()
@@ -0,0 +1,86 @@
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+import httpx
+import pytest
+
+# Settings are read when api_core is imported, so the app under test gets a
+# SQLite database of its own, whatever the environment points at.
+_DATA_DIRECTORY = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["ENV"] = "test"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DATA_DIRECTORY}/api.db"
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api_core.database import UnitOfWork, _create_engine
+from api_core.main import app
+from api_core.repos.storage import PostgresTodoStorage, SqliteTodoStorage
+from api_core.repos.todo import TodoRepository
+
+BACKEND_DIRECTORY = pathlib.Path(__file__).resolve().parents[1]
+
+# Repository tests also run against Postgres when this points at a database
+# they may migrate and empty, e.g. postgresql+asyncpg://postgres@localhost/todos_test.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+POSTGRES_TABLES = ("todos", "todo_status_counts", "todo_open_due_counts", "todo_tombstones")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client(anyio_backend):
+    """An HTTP client for the app, started with its lifespan."""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            yield client
+
+
+@pytest.fixture(scope="session")
+def postgres_url() -> str:
+    """The Postgres test database, migrated to the head revision once per session."""
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIRECTORY,
+        env={**os.environ, "DATABASE_URL": POSTGRES_URL},
+        check=True,
+        capture_output=True,
+    )
+    return POSTGRES_URL
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+async def repository(request, anyio_backend, tmp_path):
+    """A TodoRepository over an empty database of each backend."""
+    if request.param == "sqlite":
+        engine = _create_engine(f"sqlite+aiosqlite:///{tmp_path}/todos.db")
+        storage = SqliteTodoStorage()
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    else:
+        engine = _create_engine(request.getfixturevalue("postgres_url"))
+        storage = PostgresTodoStorage()
+        async with engine.begin() as conn:
+            await conn.execute(text(f"TRUNCATE {', '.join(POSTGRES_TABLES)}"))
+
+    unit_of_work = UnitOfWork(
+        session_factory=sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    try:
+        yield TodoRepository(unit_of_work, storage=storage)
+    finally:
+        await unit_of_work.close()
+        await engine.dispose()
@@ -0,0 +1,365 @@
+import base64
+import csv
+import gzip
+import io
+import logging
+import queue
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from api_core.config import settings
+from api_core.database import LAST_WRITE_COOKIE, _create_engine, async_engine, replica_router
+from api_core.main import app
+from api_core.middleware import ReadYourWritesMiddleware
+from api_core.utils.custom_logger import DroppingQueueHandler, SamplingFilter
+from api_core.utils.replicas import Replica
+
+pytestmark = pytest.mark.anyio
+
+TODOS = "/api/v1/todos/"
+
+
+async def test_todo_etag_answers_304(client: httpx.AsyncClient):
+    created = (await client.post(TODOS, json={"title": "Read the paper"})).json()
+
+    response = await client.get(f"{TODOS}{created['id']}")
+    etag = response.headers["ETag"]
+    not_modified = await client.get(f"{TODOS}{created['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+async def test_list_etag_follows_the_page_without_an_aggregate(client: httpx.AsyncClient):
+    created = (await client.post(TODOS, json={"title": "Listed"})).json()
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        response = await client.get(TODOS, params={"limit": 1000})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    etag = response.headers["ETag"]
+    not_modified = await client.get(TODOS, params={"limit": 1000}, headers={"If-None-Match": etag})
+    await client.put(f"{TODOS}{created['id']}", json={"title": "Listed, renamed"})
+    changed = await client.get(TODOS, params={"limit": 1000}, headers={"If-None-Match": etag})
+
+    assert not any("count(" in statement.lower() for statement in statements)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+async def test_stale_if_match_is_rejected(client: httpx.AsyncClient):
+    created = (await client.post(TODOS, json={"title": "Draft"})).json()
+    etag = (await client.get(f"{TODOS}{created['id']}")).headers["ETag"]
+    await client.put(f"{TODOS}{created['id']}", json={"title": "Edited elsewhere"})
+
+    response = await client.put(
+        f"{TODOS}{created['id']}", json={"title": "Mine"}, headers={"If-Match": etag}
+    )
+
+    assert response.status_code == 412
+
+
+async def test_cursor_pages_cover_the_list(client: httpx.AsyncClient):
+    await client.post(f"{TODOS}bulk", json=[{"title": f"Page {index}"} for index in range(7)])
+    everything = (await client.get(TODOS, params={"limit": 1000, "fields": "id"})).json()
+
+    ids, params = [], {"limit": 3, "fields": "id"}
+    while True:
+        response = await client.get(TODOS, params=params)
+        ids.extend(todo["id"] for todo in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert ids == [todo["id"] for todo in everything]
+
+
+@pytest.mark.parametrize("sort, payload", [
+    ("created_at", None),
+    ("created_at", {"s": "created_at", "v": [1]}),
+    ("created_at", {"s": "created_at", "v": [{"a": 1}, "x"]}),
+    ("created_at", {"s": "created_at", "v": [[1], [2]]}),
+    ("priority", {"s": "priority", "v": ["high", "x"]}),
+])
+async def test_invalid_cursor_is_a_client_error(
+    client: httpx.AsyncClient, sort: str, payload: dict | None
+):
+    cursor = base64.urlsafe_b64encode(orjson.dumps(payload)).decode() if payload else "garbage"
+
+    response = await client.get(TODOS, params={"cursor": cursor, "sort": sort})
+
+    assert response.status_code == 400
+
+
+async def test_large_lists_are_compressed(client: httpx.AsyncClient):
+    await client.post(f"{TODOS}bulk", json=[{"title": f"Compressed {index}"} for index in range(50)])
+
+    response = await client.get(TODOS, headers={"Accept-Encoding": "gzip"})
+    identity = await client.get(TODOS, headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert response.json() == identity.json()
+
+
+async def test_compressed_lists_have_their_own_etag(client: httpx.AsyncClient):
+    await client.post(f"{TODOS}bulk", json=[{"title": f"Tagged {index}"} for index in range(50)])
+
+    response = await client.get(TODOS, headers={"Accept-Encoding": "gzip"})
+    identity = await client.get(TODOS, headers={"Accept-Encoding": "identity"})
+    etag = response.headers["ETag"]
+    not_modified = await client.get(
+        TODOS, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+
+    assert etag == f'{identity.headers["ETag"][:-1]}-gzip"'
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+async def test_overlong_import_lines_are_rejected(client: httpx.AsyncClient):
+    body = b'{"title": "Imported"}\n{"title": "' + b"x" * 70000 + b'"}\n{"title": "After"}\n'
+
+    response = await client.post(f"{TODOS}import", content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["rejected"] == [{"line": 2, "errors": [
+        {"type": "line_too_long", "msg": "Line is longer than 65536 bytes"}
+    ]}]
+
+
+async def test_a_list_request_checks_out_one_connection(client: httpx.AsyncClient):
+    await client.post(TODOS, json={"title": "Counted"})
+    checkouts = []
+
+    def on_checkout(*args):
+        checkouts.append(args)
+
+    event.listen(async_engine.sync_engine, "checkout", on_checkout)
+    try:
+        response = await client.get(TODOS, params={"count": "exact", "limit": 1})
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", on_checkout)
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+    assert async_engine.pool.checkedout() == 0
+
+
+async def test_updates_reject_out_of_range_priorities(client: httpx.AsyncClient):
+    created = (await client.post(TODOS, json={"title": "Ranked"})).json()
+
+    single = await client.put(f"{TODOS}{created['id']}", json={"priority": 6})
+    bulk = await client.patch(TODOS, params={"priority_min": 0}, json={"priority": -1})
+
+    assert single.status_code == 422
+    assert bulk.status_code == 422
+    assert (await client.get(f"{TODOS}{created['id']}")).json()["priority"] == 0
+
+
+async def test_bulk_dry_runs_count_without_writing(client: httpx.AsyncClient):
+    window = {"due_after": "2091-01-01T00:00:00Z", "due_before": "2092-01-01T00:00:00Z"}
+    await client.post(f"{TODOS}bulk", json=[
+        {"title": f"Dry run {index}", "due_date": f"2091-06-0{index + 1}T00:00:00Z"}
+        for index in range(3)
+    ])
+
+    updated = await client.patch(
+        TODOS, params={**window, "dry_run": True}, json={"status": "completed"}
+    )
+    deleted = await client.request("DELETE", TODOS, params={**window, "dry_run": True})
+    remaining = (await client.get(TODOS, params={**window, "limit": 1000})).json()
+
+    assert updated.json() == {"affected": 3, "dry_run": True}
+    assert deleted.json() == {"affected": 3, "dry_run": True}
+    assert [todo["status"] for todo in remaining] == ["pending"] * 3
+    assert (await client.request("DELETE", TODOS, params=window)).json() == {
+        "affected": 3, "dry_run": False
+    }
+    assert (await client.get(TODOS, params=window)).json() == []
+
+
+async def test_exports_stream_every_matching_item(client: httpx.AsyncClient):
+    window = {"due_after": "2093-01-01T00:00:00Z", "due_before": "2094-01-01T00:00:00Z"}
+    titles = ["Plain", 'With "quotes", and a comma', "Ünïcode"]
+    await client.post(f"{TODOS}bulk", json=[
+        {"title": title, "due_date": "2093-06-01T00:00:00Z"} for title in titles
+    ])
+
+    ndjson = await client.get(f"{TODOS}export", params={**window, "format": "ndjson"})
+    exported_csv = await client.get(f"{TODOS}export", params={**window, "format": "csv"})
+
+    assert ndjson.headers["Content-Type"] == "application/x-ndjson"
+    exported = [orjson.loads(line) for line in ndjson.text.splitlines()]
+    assert sorted(todo["title"] for todo in exported) == sorted(titles)
+    assert exported_csv.headers["Content-Type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(exported_csv.text)))
+    assert sorted(record["title"] for record in records) == sorted(titles)
+    assert {record["due_date"] for record in records} == {"2093-06-01T00:00:00+00:00"}
+
+
+async def test_approximate_counts_keep_exact_breakdowns(client: httpx.AsyncClient):
+    window = {"due_after": "2095-01-01T00:00:00Z", "due_before": "2096-01-01T00:00:00Z"}
+    await client.post(f"{TODOS}bulk", json=[
+        {"title": f"Counted {index}", "priority": 4, "due_date": "2095-06-01T00:00:00Z"}
+        for index in range(2)
+    ])
+
+    exact = (await client.get(f"{TODOS}stats")).json()
+    approximate = (await client.get(f"{TODOS}stats", params={"count": "approximate"})).json()
+    listed = await client.get(TODOS, params={**window, "count": "approximate", "limit": 1})
+
+    assert exact["count_mode"] == "exact"
+    assert exact["total"] == sum(exact["by_status"].values())
+    assert approximate["count_mode"] == "approximate"
+    assert approximate["by_status"] == exact["by_status"]
+    assert approximate["by_priority"] == exact["by_priority"]
+    # SQLite keeps no planner estimates, so the estimate is a count there.
+    assert approximate["total"] == exact["total"]
+    assert listed.headers["X-Total-Count"] == "2"
+    assert len(listed.json()) == 1
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        name: float(value)
+        for name, value in (line.rsplit(" ", 1) for line in text.splitlines())
+        if not name.startswith("#")
+    }
+
+
+async def test_metrics_count_requests_by_route_template(client: httpx.AsyncClient):
+    created = (await client.post(TODOS, json={"title": "Measured"})).json()
+    before = _samples((await client.get("/metrics")).text)
+
+    await client.get(f"{TODOS}{created['id']}")
+    await client.get("/no/such/route")
+    response = await client.get("/metrics")
+    after = _samples(response.text)
+
+    def increase(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    read = 'method="GET",route="/api/v1/todos/{todo_id}",status="200"'
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert increase(f"http_request_duration_seconds_count{{{read}}}") == 1
+    assert increase(f'http_request_duration_seconds_bucket{{{read},le="+Inf"}}') == 1
+    assert increase(
+        'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}'
+    ) == 1
+    assert increase('db_query_duration_seconds_count{operation="select"}') >= 1
+    assert after["http_requests_in_flight"] == 1
+
+
+async def test_full_log_queue_drops_records_and_counts_them(client: httpx.AsyncClient):
+    log_queue = queue.Queue(maxsize=1)
+    logger = logging.getLogger("tests.dropping")
+    logger.propagate = False
+    handler = DroppingQueueHandler(log_queue)
+    logger.addHandler(handler)
+    before = _samples((await client.get("/metrics")).text).get("log_records_dropped_total", 0)
+    try:
+        for index in range(3):
+            logger.warning("Burst %d", index, extra={"lazy": lambda: "resolved"})
+    finally:
+        logger.removeHandler(handler)
+    after = _samples((await client.get("/metrics")).text)["log_records_dropped_total"]
+
+    kept = log_queue.get_nowait()
+    assert (kept.msg, kept.args, kept.lazy) == ("Burst 0", None, "resolved")
+    assert log_queue.empty()
+    assert after - before == 2
+
+
+def test_sampling_keeps_a_fraction_of_records(monkeypatch):
+    record = logging.makeLogRecord({"msg": "Sampled"})
+    draws = iter([0.1, 0.3, 0.5, 0.9])
+    monkeypatch.setattr("random.random", lambda: next(draws))
+
+    assert [SamplingFilter(0.4).filter(record) for _ in range(4)] == [True, True, False, False]
+    assert SamplingFilter(1.0).filter(record)
+
+
+async def test_reads_use_a_replica_unless_the_client_just_wrote(
+    client: httpx.AsyncClient, tmp_path, monkeypatch
+):
+    # A replica that never receives the primary's writes.
+    engine = _create_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    replica = Replica(engine)
+    replica.lag_seconds = 0
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+    transport = httpx.ASGITransport(
+        app=ReadYourWritesMiddleware(app, window=settings.READ_YOUR_WRITES_SECONDS)
+    )
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as writer:
+            created = (await writer.post(TODOS, json={"title": "Not replicated"})).json()
+            cookie = writer.cookies.get(LAST_WRITE_COOKIE)
+            own_read = await writer.get(f"{TODOS}{created['id']}")
+            writer.cookies.clear()
+            other_read = await writer.get(f"{TODOS}{created['id']}")
+            listed = await writer.get(TODOS, params={"limit": 1000})
+    finally:
+        await engine.dispose()
+
+    assert cookie is not None
+    assert own_read.status_code == 200
+    assert other_read.status_code == 404
+    assert listed.json() == []
+    assert LAST_WRITE_COOKIE not in listed.headers.get("Set-Cookie", "")
+
+
+async def _sync(
+    client: httpx.AsyncClient, since: str | None, limit: int
+) -> tuple[list, list, str, int]:
+    """Follows has_more to the end of a sync pass; returns items, deleted ids, token and pages."""
+    items, deleted, pages = [], [], 0
+    while True:
+        params = {"limit": limit} if since is None else {"limit": limit, "since": since}
+        page = (await client.get(f"{TODOS}sync", params=params)).json()
+        items += page["items"]
+        deleted += page["deleted"]
+        since = page["next_token"]
+        pages += 1
+        if not page["has_more"]:
+            return items, deleted, since, pages
+
+
+async def test_sync_pages_cover_every_change_once(client: httpx.AsyncClient):
+    await client.post(f"{TODOS}bulk", json=[{"title": f"Synced {index}"} for index in range(3)])
+    everything = (await client.get(TODOS, params={"limit": 1000, "fields": "id"})).json()
+
+    items, deleted, token, _ = await _sync(client, None, 2)
+
+    assert sorted(todo["id"] for todo in items) == sorted(todo["id"] for todo in everything)
+    assert len(items) == len({todo["id"] for todo in items})
+
+    created_ids = (await client.post(f"{TODOS}bulk", json=[
+        {"title": f"Changed {index}"} for index in range(3)
+    ])).json()["created_ids"]
+    await client.put(f"{TODOS}{created_ids[0]}", json={"title": "Changed again"})
+    await client.delete(f"{TODOS}{created_ids[1]}")
+
+    items, deleted, token, pages = await _sync(client, token, 1)
+
+    assert pages >= 2
+    assert sorted(todo["id"] for todo in items) == sorted([created_ids[0], created_ids[2]])
+    assert {todo["title"] for todo in items} == {"Changed again", "Changed 2"}
+    assert deleted == [created_ids[1]]
+    assert (await _sync(client, token, 1))[:2] == ([], [])
@@ -0,0 +1,73 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api_core.database import UnitOfWork, _create_engine
+from api_core.repos.cached_todo import CachedTodoRepository
+from api_core.schemas.todo import TodoCreate, TodoFilter, TodoUpdate
+from api_core.utils.cache import InMemoryCacheBackend
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session_factories(anyio_backend, tmp_path):
+    """Session factories of a primary and of a replica that lags behind it."""
+    engines = [
+        _create_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db")
+        for name in ("primary", "replica")
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        yield [
+            sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in engines
+        ]
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+
+async def test_replica_reads_are_not_served_to_primary_reads(session_factories):
+    primary, replica = session_factories
+    cache = InMemoryCacheBackend(max_entries=100, ttl_seconds=60)
+    writer = CachedTodoRepository(UnitOfWork(session_factory=primary), cache)
+    todo = await writer.create_todo(TodoCreate(title="Not replicated yet"))
+    await writer.unit_of_work.close()
+
+    replica_read = CachedTodoRepository(
+        UnitOfWork(session_factory=primary, read_session_factory=replica), cache
+    )
+    primary_read = CachedTodoRepository(UnitOfWork(session_factory=primary), cache)
+    try:
+        assert await replica_read.read_todos() == []
+        assert [row.id for row in await primary_read.read_todos()] == [todo.id]
+        assert await primary_read.read_todo_version(todo.id) is not None
+    finally:
+        await replica_read.unit_of_work.close()
+        await primary_read.unit_of_work.close()
+
+
+async def test_writes_that_change_nothing_keep_the_cache(session_factories):
+    primary, _ = session_factories
+    cache = InMemoryCacheBackend(max_entries=100, ttl_seconds=60)
+    repository = CachedTodoRepository(UnitOfWork(session_factory=primary), cache)
+    try:
+        await repository.create_todo(TodoCreate(title="Kept"))
+        generation = await cache.get_generation()
+
+        assert await repository.update_todo(uuid4(), TodoUpdate(title="Missing")) is None
+        assert not await repository.delete_todo(uuid4())
+        assert await repository.update_todos(TodoFilter(priority_min=5), TodoUpdate(priority=0)) == 0
+        assert await repository.delete_todos(TodoFilter(priority_min=5)) == 0
+        assert await cache.get_generation() == generation
+
+        assert await repository.delete_todos(TodoFilter()) == 1
+        assert await cache.get_generation() != generation
+    finally:
+        await repository.unit_of_work.close()
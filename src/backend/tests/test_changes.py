@@ -0,0 +1,19 @@
+import orjson
+
+from api_core.utils.changes import ChangeMessage, sse_frame, websocket_frame
+
+MESSAGE = ChangeMessage("change", 'a"b', '{"operation":"created","count":1}')
+
+
+def test_websocket_frame_embeds_the_event_data():
+    assert orjson.loads(websocket_frame(MESSAGE)) == {
+        "event": "change",
+        "id": 'a"b',
+        "data": {"operation": "created", "count": 1},
+    }
+
+
+def test_sse_frame():
+    assert sse_frame(MESSAGE) == (
+        b'id: a"b\nevent: change\ndata: {"operation":"created","count":1}\n\n'
+    )
@@ -0,0 +1,50 @@
+import gzip
+import zlib
+
+import pytest
+
+from api_core.utils.compression import compress, negotiate_encoding, stream_compressor
+
+BOTH = ("zstd", "gzip")
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+    ("deflate, br", None),
+    ("*", "zstd"),
+    ("*;q=0.5, zstd;q=0", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=bogus, zstd", "zstd"),
+    ("", None),
+])
+def test_negotiate_encoding(header: str, expected: str | None):
+    assert negotiate_encoding(header, BOTH) == expected
+
+
+def test_negotiate_encoding_only_picks_available_codings():
+    assert negotiate_encoding("zstd, gzip;q=0.1", ("gzip",)) == "gzip"
+
+
+def test_gzip_round_trip():
+    data = b"todo " * 1000
+
+    assert gzip.decompress(compress("gzip", data, 6)) == data
+
+    compressor = stream_compressor("gzip", 6)
+    first = compressor.compress(data[:2000])
+    # Each chunk is flushed, so the client can decode it before the next arrives.
+    assert zlib.decompressobj(31).decompress(first) == data[:2000]
+    body = first + compressor.compress(data[2000:]) + compressor.finish()
+    assert gzip.decompress(body) == data
+
+
+def test_zstd_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    data = b"todo " * 1000
+
+    assert zstandard.ZstdDecompressor().decompress(compress("zstd", data, 3)) == data
+
+    compressor = stream_compressor("zstd", 3)
+    body = compressor.compress(data) + compressor.finish()
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(body) == data
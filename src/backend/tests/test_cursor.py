@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import base64
+
+import orjson
+import pytest
+
+from api_core.exceptions.custom import InvalidCursorException
+from api_core.repos.todo import _after_clauses
+from api_core.schemas.todo import TodoSortKey
+from api_core.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    todo_id = uuid4()
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    cursor = encode_cursor("-priority,created_at", [3, created_at, todo_id])
+
+    assert decode_cursor(cursor, "-priority,created_at") == [
+        3, created_at.isoformat(), str(todo_id)
+    ]
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor("created_at", ["2024-05-01T12:30:00+00:00", str(uuid4())])
+
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "-created_at")
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "bnVsbA", "eyJzIjoxfQ"])
+def test_malformed_cursor_is_rejected(cursor: str):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "created_at")
+
+
+@pytest.mark.parametrize("values", [[{"a": 1}, "x"], [[1], [2]]])
+def test_cursor_values_must_be_scalars(values: list):
+    cursor = base64.urlsafe_b64encode(orjson.dumps({"s": "created_at", "v": values})).decode()
+
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "created_at")
+
+
+def test_after_clause_is_a_row_comparison_for_not_null_keys():
+    clauses = _after_clauses(
+        (TodoSortKey("created_at"),), ["2024-05-01T12:30:00+00:00", str(uuid4())]
+    )
+
+    assert [str(clause) for clause in clauses] == [
+        "(todos.created_at, todos.id) > (:param_1, :param_2)"
+    ]
+
+
+def test_after_clauses_break_ties_on_created_at_then_id():
+    clauses = _after_clauses(
+        (TodoSortKey("priority", descending=True),),
+        [3, "2024-05-01T12:30:00+00:00", str(uuid4())],
+    )
+
+    assert [str(clause) for clause in clauses] == [
+        "(todos.priority, todos.created_at, todos.id) < (:param_1, :param_2, :param_3)"
+    ]
+
+
+def test_after_clause_places_nulls_last():
+    clauses = _after_clauses(
+        (TodoSortKey("due_date"),), [None, "2024-05-01T12:30:00+00:00", str(uuid4())]
+    )
+
+    assert [str(clause) for clause in clauses] == [
+        "todos.due_date IS NULL AND (todos.created_at, todos.id) > (:param_1, :param_2)"
+    ]
+
+
+def test_after_clauses_read_nulls_as_a_range_of_their_own():
+    clauses = _after_clauses(
+        (TodoSortKey("due_date", descending=True),),
+        ["2024-05-01T12:30:00+00:00", "2024-04-01T08:00:00+00:00", str(uuid4())],
+    )
+
+    assert [str(clause) for clause in clauses] == [
+        "(todos.due_date, todos.created_at, todos.id) < (:param_1, :param_2, :param_3)",
+        "todos.due_date IS NULL",
+    ]
+
+
+def test_after_clause_lets_nulls_follow_values_in_mixed_sorts():
+    clauses = _after_clauses(
+        (TodoSortKey("due_date", descending=True), TodoSortKey("title")),
+        ["2024-05-01T12:30:00+00:00", "Milk", "2024-04-01T08:00:00+00:00", str(uuid4())],
+    )
+
+    assert len(clauses) == 1
+    assert "todos.due_date < :due_date_1 OR todos.due_date IS NULL" in str(clauses[0])
+
+
+@pytest.mark.parametrize("sort, values", [
+    ("created_at", ["2024-05-01T12:30:00+00:00"]),
+    ("created_at", ["yesterday", str(uuid4())]),
+    ("created_at", [1714566600, str(uuid4())]),
+    ("created_at", ["2024-05-01T12:30:00+00:00", "not-a-uuid"]),
+    ("created_at", ["2024-05-01T12:30:00+00:00", 5]),
+    ("priority", ["high", "2024-05-01T12:30:00+00:00", str(uuid4())]),
+    ("priority", [True, "2024-05-01T12:30:00+00:00", str(uuid4())]),
+    ("title", [3, "2024-05-01T12:30:00+00:00", str(uuid4())]),
+])
+def test_after_clause_rejects_values_that_do_not_fit_the_sort(sort: str, values: list):
+    with pytest.raises(InvalidCursorException):
+        _after_clauses((TodoSortKey(sort),), values)
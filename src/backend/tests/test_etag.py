@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from api_core.utils.etag import (
+    encoded_etag,
+    etag_matches,
+    list_etag,
+    names_encoded_etag,
+    parse_if_match,
+    todo_etag,
+)
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_todo_etag_round_trips_through_if_match():
+    todo_id = uuid4()
+
+    assert parse_if_match(todo_etag(todo_id, UPDATED_AT), todo_id) == [UPDATED_AT]
+
+
+def test_if_match_ignores_weak_and_foreign_tags():
+    todo_id = uuid4()
+    header = ", ".join([
+        f"W/{todo_etag(todo_id, UPDATED_AT)}",
+        todo_etag(uuid4(), UPDATED_AT),
+        '"garbage"',
+    ])
+
+    assert parse_if_match(header, todo_id) == []
+    assert parse_if_match(" * ", todo_id) is None
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = todo_etag(uuid4(), UPDATED_AT)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_compressed_bodies_have_their_own_etag():
+    todo_id = uuid4()
+    etag = todo_etag(todo_id, UPDATED_AT)
+    gzipped = encoded_etag(etag, "gzip")
+
+    assert gzipped == f'{etag[:-1]}-gzip"'
+    assert encoded_etag(f"W/{etag}", "zstd") == f'W/{etag[:-1]}-zstd"'
+    assert etag_matches(f'"other", {gzipped}', etag)
+    assert parse_if_match(gzipped, todo_id) == [UPDATED_AT]
+    assert names_encoded_etag(gzipped, etag, "gzip")
+    assert not names_encoded_etag(etag, etag, "gzip")
+    assert not names_encoded_etag(gzipped, etag, "zstd")
+
+
+def test_list_etag_changes_with_every_input():
+    todo_id = uuid4()
+    page = [(todo_id, UPDATED_AT)]
+    etag = list_etag(page, "limit=10")
+
+    assert etag == list_etag([(todo_id, UPDATED_AT)], "limit=10")
+    assert etag != list_etag([(todo_id, UPDATED_AT + timedelta(microseconds=1))], "limit=10")
+    assert etag != list_etag([(uuid4(), UPDATED_AT)], "limit=10")
+    assert etag != list_etag([], "limit=10")
+    assert etag != list_etag(page, "limit=20")
+    assert etag != list_etag(page, "limit=10", next_cursor="abc")
+    assert etag != list_etag(page, "limit=10", total=1)
@@ -0,0 +1,72 @@
+import pytest
+
+from api_core.utils.ingest import iter_csv_records, iter_lines
+
+pytestmark = pytest.mark.anyio
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+async def test_lines_are_split_across_chunks():
+    lines = await _collect(iter_lines(_chunks(b"first\r\nsec", b"ond\n", b"\nlast"), 100))
+
+    assert lines == [(1, b"first"), (2, b"second"), (3, b""), (4, b"last")]
+
+
+async def test_trailing_newline_adds_no_line():
+    lines = await _collect(iter_lines(_chunks(b"one\n", b"two\n"), 100))
+
+    assert lines == [(1, b"one"), (2, b"two")]
+
+
+async def test_long_lines_are_dropped_and_splitting_resumes():
+    chunks = _chunks(b"short\n" + b"x" * 6, b"x" * 6, b"x\nok\n", b"y" * 20)
+
+    lines = await _collect(iter_lines(chunks, 10))
+
+    assert lines == [(1, b"short"), (2, None), (3, b"ok"), (4, None)]
+
+
+async def test_line_limit_includes_the_line_ending():
+    lines = await _collect(iter_lines(_chunks(b"123456789\n1234567890\n"), 10))
+
+    assert lines == [(1, b"123456789"), (2, None)]
+
+
+async def test_many_small_chunks_are_split_in_linear_time():
+    body = b"".join(b'{"title": "todo %d"}\n' % index for index in range(20000))
+
+    lines = await _collect(iter_lines(_chunks(*(body[i:i + 7] for i in range(0, len(body), 7))), 100))
+
+    assert len(lines) == 20000
+    assert lines[-1] == (20000, b'{"title": "todo 19999"}')
+
+
+async def test_quoted_newlines_stay_in_their_record():
+    body = b'title,description\n"Call","line one\nline two"\n"Say ""hi""",x\n'
+
+    records = await _collect(iter_csv_records(_chunks(body[:20], body[20:]), 100))
+
+    assert records == [
+        (1, b"title,description"),
+        (2, b'"Call","line one\nline two"'),
+        (4, b'"Say ""hi""",x'),
+    ]
+
+
+async def test_unterminated_quote_is_dropped_at_the_record_limit():
+    body = b'title\n"never closed\n' + b"more text\n" * 5 + b"ok\n"
+
+    records = await _collect(iter_csv_records(_chunks(body), 40))
+
+    # Lines 2-5 pass the limit; the line that does is dropped with the record.
+    assert records == [
+        (1, b"title"), (2, None), (6, b"more text"), (7, b"more text"), (8, b"ok")
+    ]
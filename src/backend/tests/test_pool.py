@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from api_core.utils.pool import InstrumentedAsyncQueuePool
+
+pytestmark = pytest.mark.anyio
+
+DELAY = 0.05
+
+
+async def test_opening_a_connection_is_not_counted_as_waiting(anyio_backend, tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    event.listen(engine.sync_engine, "do_connect", lambda *args: time.sleep(DELAY))
+
+    async def hold():
+        async with engine.connect():
+            await asyncio.sleep(DELAY)
+
+    try:
+        await hold()
+        opened = engine.pool.stats()
+        await asyncio.gather(hold(), hold())
+        stats = engine.pool.stats()
+    finally:
+        await engine.dispose()
+
+    assert (opened.connects, opened.checkouts) == (1, 1)
+    assert opened.connect_seconds_total >= DELAY
+    assert opened.wait_seconds_total < DELAY
+    assert (stats.connects, stats.checkouts, stats.timeouts) == (1, 3, 0)
+    assert stats.wait_seconds_max >= DELAY * 0.9
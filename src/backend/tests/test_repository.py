@@ -0,0 +1,251 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+import asyncpg
+import orjson
+import pytest
+from sqlalchemy import text
+
+from api_core.models.todo import TodoStatus
+from api_core.repos.storage import SqliteTodoStorage
+from api_core.repos.todo import TodoRepository
+from api_core.schemas.todo import TodoCreate, TodoFilter, TodoSortKey, TodoUpdate
+from api_core.utils.changes import CHANGE_CHANNEL, change_feed
+from api_core.utils.cursor import decode_cursor, encode_cursor
+from api_core.utils.sorting import format_sort, parse_sort, tiebreak_fields
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime.now(timezone.utc)
+
+
+def _creates() -> list[TodoCreate]:
+    return [
+        TodoCreate(title=f"Todo {index}", priority=index % 3, due_date=due_date)
+        for index, due_date in enumerate([
+            NOW + timedelta(days=2),
+            None,
+            NOW + timedelta(days=1),
+            None,
+            NOW + timedelta(days=2),
+            NOW - timedelta(days=3),
+            None,
+        ])
+    ]
+
+
+async def _next_request(repository: TodoRepository) -> None:
+    # A unit of work lasts one request; later reads must not see the objects it loaded.
+    await repository.unit_of_work.close()
+
+
+@asynccontextmanager
+async def _published(repository: TodoRepository) -> AsyncIterator[list[dict]]:
+    """Collects the change events published while the block runs."""
+    payloads = []
+    if isinstance(repository.storage, SqliteTodoStorage):
+        subscription = change_feed.subscribe()
+        try:
+            yield payloads
+        finally:
+            change_feed.unsubscribe(subscription)
+        while (message := await subscription.get(timeout=0.01)) is not None:
+            payloads.append(message.data)
+    else:
+        url = repository.db_session.bind.url.set(drivername="postgresql")
+        connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+        try:
+            await connection.add_listener(CHANGE_CHANNEL, lambda *args: payloads.append(args[-1]))
+            yield payloads
+            await connection.execute("SELECT 1")
+            await asyncio.sleep(0.1)
+        finally:
+            await connection.close()
+    payloads[:] = [orjson.loads(payload) for payload in payloads]
+
+
+async def test_create_and_read_todo(repository: TodoRepository):
+    todo = await repository.create_todo(TodoCreate(title="Buy milk", priority=2))
+
+    read = await repository.read_todo(todo.id)
+
+    assert read.title == "Buy milk"
+    assert read.priority == 2
+    assert read.status == TodoStatus.PENDING
+    assert await repository.read_todo_version(todo.id) == read.updated_at
+
+
+async def test_create_todos_returns_ids_in_order(repository: TodoRepository):
+    todo_ids = await repository.create_todos(_creates(), chunk_size=3)
+
+    todos = await repository.read_todos_by_ids(todo_ids)
+
+    assert len(todo_ids) == 7
+    assert {todo.id: todo.title for todo in todos} == {
+        todo_id: f"Todo {index}" for index, todo_id in enumerate(todo_ids)
+    }
+
+
+async def test_copy_todos(repository: TodoRepository):
+    assert await repository.copy_todos(_creates()) == 7
+    assert await repository.count_todos(TodoFilter()) == 7
+
+
+
+async def test_copy_commits_after_reads_in_the_same_request(repository: TodoRepository):
+    assert await repository.count_todos(TodoFilter()) == 0
+
+    assert await repository.copy_todos(_creates()) == 7
+    await _next_request(repository)
+
+    assert await repository.count_todos(TodoFilter()) == 7
+
+@pytest.mark.parametrize("sort", ["created_at", "-priority", "due_date", "-due_date,title"])
+@pytest.mark.parametrize("todo_filter", [None, TodoFilter(priority_max=1)])
+async def test_keyset_pages_match_offset_order(
+    repository: TodoRepository, sort: str, todo_filter: TodoFilter | None
+):
+    await repository.create_todos(_creates())
+    keys = parse_sort(sort)
+    everything = await repository.read_todos(limit=100, todo_filter=todo_filter, sort=keys)
+
+    pages, after = [], None
+    while True:
+        page = await repository.read_todos(
+            limit=2, todo_filter=todo_filter, sort=keys, after=after
+        )
+        if not page:
+            break
+        pages.extend(page)
+        last = page[-1]
+        fields = [key.field for key in keys] + list(tiebreak_fields(keys))
+        values = [getattr(last, field) for field in fields]
+        after = decode_cursor(encode_cursor(format_sort(keys), values), format_sort(keys))
+
+    assert [row.id for row in pages] == [row.id for row in everything]
+
+
+async def test_update_todo_checks_expected_versions(repository: TodoRepository):
+    todo = await repository.create_todo(TodoCreate(title="Draft"))
+    stale = todo.updated_at - timedelta(seconds=1)
+    await _next_request(repository)
+
+    assert await repository.update_todo(todo.id, TodoUpdate(title="Lost"), [stale]) is None
+    updated = await repository.update_todo(
+        todo.id, TodoUpdate(title="Final"), [todo.updated_at]
+    )
+
+    assert updated.title == "Final"
+    assert not await repository.delete_todo(todo.id, [stale])
+    assert await repository.delete_todo(todo.id, [updated.updated_at])
+    await _next_request(repository)
+    assert await repository.read_todo(todo.id) is None
+
+
+async def test_bulk_writes_keep_stats_in_step(repository: TodoRepository):
+    await repository.create_todos(_creates())
+    high = TodoFilter(priority_min=2)
+
+    assert await repository.update_todos(high, TodoUpdate(status=TodoStatus.COMPLETED)) == 2
+    assert await repository.delete_todos(TodoFilter(priority_max=0)) == 3
+
+    for todo_filter in (TodoFilter(), high, TodoFilter(status=TodoStatus.COMPLETED)):
+        assert (
+            await repository.count_todos_from_stats(todo_filter)
+            == await repository.count_todos(todo_filter)
+        )
+    assert await repository.estimate_todos() >= 0
+
+
+
+async def test_title_edits_leave_stats_rows_alone(repository: TodoRepository):
+    if isinstance(repository.storage, SqliteTodoStorage):
+        pytest.skip("row versions are only visible on Postgres")
+    await repository.create_todos(_creates())
+    versions = text("SELECT xmin::text FROM todo_status_counts UNION ALL SELECT xmin::text FROM todo_open_due_counts")
+    before = (await repository.db_session.exec(versions)).all()
+
+    assert await repository.update_todos(TodoFilter(), TodoUpdate(title="Renamed")) == 7
+
+    assert (await repository.db_session.exec(versions)).all() == before
+
+async def test_read_todo_stats_counts_overdue(repository: TodoRepository):
+    await repository.create_todos(_creates())
+
+    rows, overdue = await repository.read_todo_stats()
+
+    assert sum(count for _, _, count in rows) == 7
+    assert overdue == 1
+
+
+async def test_search_todos_ranks_title_matches_first(repository: TodoRepository):
+    await repository.create_todos([
+        TodoCreate(title="Call the plumber", description="About the garden tap"),
+        TodoCreate(title="Water the garden"),
+        TodoCreate(title="Pay rent"),
+    ])
+
+    hits = await repository.search_todos("garden")
+
+    assert [todo.title for todo, *_ in hits] == ["Water the garden", "Call the plumber"]
+
+
+async def test_read_changes_reports_writes_and_tombstones(repository: TodoRepository):
+    kept = await repository.create_todo(TodoCreate(title="Kept"))
+    removed = await repository.create_todo(TodoCreate(title="Removed"))
+    horizon, changes = await repository.read_changes(None, None, 100)
+
+    assert {todo_id for _, todo_id, _ in changes} == {kept.id, removed.id}
+
+    await _next_request(repository)
+    await repository.delete_todo(removed.id)
+    await repository.update_todo(kept.id, TodoUpdate(title="Kept, renamed"))
+    await _next_request(repository)
+    _, changes = await repository.read_changes(horizon, None, 100)
+
+    assert {(todo_id, todo and todo.title) for _, todo_id, todo in changes} == {
+        (kept.id, "Kept, renamed"),
+        (removed.id, None),
+    }
+
+    first = changes[0]
+    _, rest = await repository.read_changes(horizon, (first[0], first[1]), 100)
+    assert [change[1] for change in rest] == [change[1] for change in changes[1:]]
+
+    assert await repository.delete_tombstones(NOW + timedelta(days=1)) == 1
+    _, changes = await repository.read_changes(horizon, None, 100)
+    assert [todo_id for _, todo_id, _ in changes] == [kept.id]
+
+
+async def test_default_sort_has_an_id_tiebreaker(repository: TodoRepository):
+    todo_ids = await repository.create_todos([TodoCreate(title="Same") for _ in range(5)])
+
+    rows = await repository.read_todos(sort=(TodoSortKey("title"),), columns=("id",))
+
+    assert [row.id for row in rows] == sorted(todo_ids)
+
+
+async def test_writes_publish_their_changes_when_they_commit(repository: TodoRepository):
+    async with _published(repository) as events:
+        todo = await repository.create_todo(TodoCreate(title="Published"))
+        stale = todo.updated_at - timedelta(seconds=1)
+        await _next_request(repository)
+        await repository.update_todo(todo.id, TodoUpdate(title="Lost"), [stale])
+        await repository.delete_todos(TodoFilter(priority_min=5))
+        await repository.update_todos(TodoFilter(priority_max=0), TodoUpdate(priority=1))
+        await repository.delete_todo(todo.id)
+
+    assert [(event["operation"], event.get("ids"), event["count"]) for event in events] == [
+        ("created", [str(todo.id)], 1),
+        ("updated", None, 1),
+        ("deleted", [str(todo.id)], 1),
+    ]
+
+
+async def test_copy_publishes_one_change_per_batch(repository: TodoRepository):
+    async with _published(repository) as events:
+        await repository.copy_todos(_creates())
+
+    assert [(event["operation"], event["count"]) for event in events] == [("created", 7)]
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api_core.database import UnitOfWork, _create_engine
+from api_core.repos.todo import TodoRepository
+from api_core.schemas.todo import TodoCreate, TodoRead
+from api_core.services.todo import TodoService
+from api_core.utils.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_result():
+    flight = SingleFlight("test", max_wait=1.0)
+    calls = 0
+
+    async def read():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", read) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+
+
+async def test_different_keys_do_not_coalesce():
+    flight = SingleFlight("test", max_wait=1.0)
+
+    async def read(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    assert await asyncio.gather(
+        flight.do("a", lambda: read("a")), flight.do("b", lambda: read("b"))
+    ) == ["a", "b"]
+
+
+async def test_followers_retry_when_the_leader_fails():
+    flight = SingleFlight("test", max_wait=1.0)
+    calls = 0
+
+    async def read():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("leader failed")
+        return "ok"
+
+    results = await asyncio.gather(
+        flight.do("key", read), flight.do("key", read), return_exceptions=True
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == "ok"
+
+
+async def test_followers_stop_waiting_after_max_wait():
+    flight = SingleFlight("test", max_wait=0.01)
+    slow = asyncio.Event()
+
+    async def read_slowly():
+        await slow.wait()
+        return "leader"
+
+    async def read_quickly():
+        return "follower"
+
+    leader = asyncio.create_task(flight.do("key", read_slowly))
+    await asyncio.sleep(0)
+
+    assert await flight.do("key", read_quickly) == "follower"
+    slow.set()
+    assert await leader == "leader"
+
+
+async def test_calls_after_forget_do_not_join():
+    flight = SingleFlight("test", max_wait=1.0)
+    release = asyncio.Event()
+
+    async def read_before_write():
+        await release.wait()
+        return "before"
+
+    async def read_after_write():
+        return "after"
+
+    leader = asyncio.create_task(flight.do("key", read_before_write))
+    await asyncio.sleep(0)
+    flight.forget()
+
+    assert await flight.do("key", read_after_write) == "after"
+    release.set()
+    assert await leader == "before"
+
+
+async def test_coalesced_todo_reads_share_a_snapshot(anyio_backend, tmp_path):
+    engine = _create_engine(f"sqlite+aiosqlite:///{tmp_path}/todos.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    flight = SingleFlight("test", max_wait=1.0)
+    services = [
+        TodoService(TodoRepository(UnitOfWork(session_factory=session_factory)), flight)
+        for _ in range(2)
+    ]
+    try:
+        todo = await services[0].create_todo(TodoCreate(title="Shared"))
+        await services[0].release()
+
+        results = await asyncio.gather(*(service.read_todo(todo.id) for service in services))
+    finally:
+        for service in services:
+            await service.todo_repository.unit_of_work.close()
+        await engine.dispose()
+
+    assert all(type(result) is TodoRead for result in results)
+    assert results[0].title == results[1].title == "Shared"
@@ -0,0 +1,32 @@
+import base64
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from api_core.exceptions.custom import InvalidSyncTokenException
+from api_core.utils.sync_token import SyncToken, decode_sync_token, encode_sync_token
+
+STARTED_AT = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("token", [
+    SyncToken(None, None, None, STARTED_AT),
+    SyncToken(10, 42, (17, uuid4()), STARTED_AT),
+])
+def test_sync_token_round_trip(token: SyncToken):
+    assert decode_sync_token(encode_sync_token(token)) == token
+
+
+@pytest.mark.parametrize("payload", [
+    b"not json",
+    b'{"s": null}',
+    b'{"s": "1", "h": null, "a": null, "t": 0}',
+    b'{"s": 1, "h": 2, "a": [3], "t": 0}',
+    b'{"s": 1, "h": 2, "a": [3, "not-a-uuid"], "t": 0}',
+])
+def test_malformed_sync_token_is_rejected(payload: bytes):
+    token = base64.urlsafe_b64encode(payload).decode("ascii")
+
+    with pytest.raises(InvalidSyncTokenException):
+        decode_sync_token(token)